@@ -0,0 +1,237 @@
+"""
+Benchmarks for RailLock's validation hot paths.
+
+Runs each case a few times, prints a table and writes the results as JSON.
+Given a baseline JSON file from an earlier run, every case is compared
+against it and cases slower than the threshold are flagged as regressions.
+Timings depend on the machine, so the baseline is not committed: create one
+locally with ``make bench-baseline``. A missing baseline is an error (exit 2).
+
+Usage:
+    python benchmarks/bench.py [--sizes 10,1000,100000] [--output results.json]
+                               [--baseline baseline.json] [--threshold 0.25]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from functools import partial
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from raillock.client import RailLockClient  # noqa: E402
+from raillock.config import RailLockConfig  # noqa: E402
+from raillock.config_utils import (  # noqa: E402
+    compare_config_with_server,
+    config_dict_to_yaml_string,
+    save_config_to_file,
+)
+from raillock.utils import (  # noqa: E402
+    calculate_tool_checksum,
+    calculate_tool_checksums,
+    clear_checksum_cache,
+)
+
+DEFAULT_SIZES = (10, 1000, 100000)
+YAML_SIZES = (1000, 10000)
+DEFAULT_THRESHOLD = 0.25
+MIN_TIME = 0.2
+MAX_REPEATS = 20
+DESCRIPTIONS = {
+    "short": "Echo the input text back to the caller.",
+    "long": (
+        "Search the knowledge base and return the matching documents. "
+        "Results are ranked by relevance and include a short summary. "
+    )
+    * 16,
+}
+
+Tool = namedtuple("Tool", ["name", "description"])
+
+
+def make_tools(count, description):
+    return [Tool(f"tool_{i}", f"{description} #{i}") for i in range(count)]
+
+
+def make_config_dict(tools):
+    """Allow half of the tools, mark a tenth as malicious and a tenth as denied."""
+    config = {"allowed_tools": {}, "malicious_tools": {}, "denied_tools": {}}
+    for i, tool in enumerate(tools):
+        entry = {
+            "description": tool.description,
+            "checksum": calculate_tool_checksum(tool.name, tool.description),
+        }
+        if i % 10 == 0:
+            config["malicious_tools"][tool.name] = entry
+        elif i % 10 == 1:
+            config["denied_tools"][tool.name] = entry
+        elif i % 2 == 0:
+            config["allowed_tools"][tool.name] = entry
+    return config
+
+
+def measure(func, min_time=MIN_TIME, max_repeats=MAX_REPEATS):
+    """Call func until min_time has passed (at least once) and return timings."""
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < max_repeats:
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+        if time.perf_counter() - started >= min_time:
+            break
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "repeats": len(timings),
+    }
+
+
+def validation_cases(sizes):
+    for size in sizes:
+        for kind, description in DESCRIPTIONS.items():
+            tools = make_tools(size, description)
+            config_dict = make_config_dict(tools)
+            config = RailLockConfig(
+                config_dict["allowed_tools"],
+                config_dict["malicious_tools"],
+                config_dict["denied_tools"],
+            )
+            uncached = RailLockClient(config, filter_cache_size=0)
+            cached = RailLockClient(config)
+            cached.filter_tools(tools)
+            pairs = [(t.name, t.description) for t in tools]
+            checksums = calculate_tool_checksums(pairs)
+            server_tools = {
+                t.name: {"description": t.description, "checksum": c}
+                for t, c in zip(tools, checksums)
+            }
+
+            def filter_cold(client=uncached, tools=tools):
+                clear_checksum_cache()
+                client.filter_tools(tools)
+
+            def checksum_each(pairs=pairs):
+                for name, desc in pairs:
+                    calculate_tool_checksum(name, desc)
+
+            suffix = f"{size}/{kind}"
+            yield f"filter_tools/{suffix}", filter_cold
+            yield f"filter_tools_cached/{suffix}", partial(cached.filter_tools, tools)
+            yield f"calculate_tool_checksum/{suffix}", checksum_each
+            yield f"calculate_tool_checksums/{suffix}", partial(
+                calculate_tool_checksums, pairs
+            )
+            yield f"compare_config_with_server/{suffix}", partial(
+                compare_config_with_server, config_dict, server_tools
+            )
+
+
+def yaml_cases(sizes, workdir):
+    for size in sizes:
+        config_dict = make_config_dict(make_tools(size, DESCRIPTIONS["long"]))
+        path = os.path.join(workdir, f"config_{size}.yaml")
+        save_config_to_file(config_dict, path)
+        yield f"from_file/{size}", partial(RailLockConfig.from_file, path)
+        cache_dir = os.path.join(workdir, "cache")
+        RailLockConfig.from_file(path, cache_dir=cache_dir)
+        yield f"from_file_cached/{size}", partial(
+            RailLockConfig.from_file, path, cache_dir=cache_dir
+        )
+        yield f"config_dict_to_yaml_string/{size}", partial(
+            config_dict_to_yaml_string, config_dict
+        )
+
+
+def run(sizes=DEFAULT_SIZES, yaml_sizes=YAML_SIZES, min_time=MIN_TIME, only=None):
+    """Run every benchmark case and return the results document."""
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for cases in (validation_cases(sizes), yaml_cases(yaml_sizes, workdir)):
+            for name, func in cases:
+                if only and only not in name:
+                    continue
+                results[name] = measure(func, min_time)
+                print(f"{name:55} {results[name]['median'] * 1000:12.3f} ms")
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return (name, baseline, current, ratio) for cases slower than threshold."""
+    regressions = []
+    base_results = baseline.get("results", {})
+    for name, result in current.get("results", {}).items():
+        base = base_results.get(name)
+        if not base or not base.get("median"):
+            continue
+        ratio = result["median"] / base["median"]
+        if ratio > 1 + threshold:
+            regressions.append((name, base["median"], result["median"], ratio))
+    return regressions
+
+
+def _parse_sizes(value):
+    return tuple(int(size) for size in value.split(",") if size)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark RailLock hot paths")
+    parser.add_argument(
+        "--sizes", type=_parse_sizes, default=DEFAULT_SIZES, help="Tool counts"
+    )
+    parser.add_argument(
+        "--yaml-sizes",
+        type=_parse_sizes,
+        default=YAML_SIZES,
+        help="Tool counts for the YAML load/emit cases",
+    )
+    parser.add_argument("--min-time", type=float, default=MIN_TIME)
+    parser.add_argument("--only", help="Only run cases whose name contains this")
+    parser.add_argument("--output", help="Write results JSON to this file")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    # Check before spending minutes on a run that could not be compared
+    if args.baseline and not os.path.exists(args.baseline):
+        print(
+            f"No baseline at {args.baseline}; create one on this machine with "
+            "`make bench-baseline` (or run without --baseline)",
+            file=sys.stderr,
+        )
+        return 2
+
+    current = run(args.sizes, args.yaml_sizes, args.min_time, args.only)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        for name, before, after, ratio in regressions:
+            print(
+                f"REGRESSION {name}: {before * 1000:.3f} ms -> "
+                f"{after * 1000:.3f} ms ({ratio:.2f}x)"
+            )
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+#! /usr/bin/env python3
+
+"""
+Synthetic MCP Load-Generator Server
+
+Serves N generated tools over stdio or SSE so RailLock's client, compare and
+webserver paths can be exercised against large catalogs without a network.
+
+Examples:
+    python synthetic_server.py --tools 5000 --description-size 2048
+    python synthetic_server.py --tools 100000 --page-size 1000 --unicode
+    python synthetic_server.py --transport sse --port 8000 --latency-ms 50
+
+    raillock review --server "stdio:python examples/load-generator/synthetic_server.py --tools 1000" --yes
+"""
+
+import argparse
+import asyncio
+import os
+import random
+
+# Keep FastMCP quiet: stdio transport owns stdout
+os.environ.setdefault("FASTMCP_LOG_LEVEL", "WARNING")
+
+from mcp import types
+from mcp.server.fastmcp import FastMCP
+
+ASCII_WORDS = (
+    "fetch",
+    "search",
+    "index",
+    "record",
+    "summary",
+    "account",
+    "invoice",
+    "report",
+    "document",
+    "result",
+    "query",
+    "update",
+)
+UNICODE_WORDS = (
+    "données",
+    "Überprüfung",
+    "поиск",
+    "検索",
+    "데이터",
+    "بحث",
+    "חיפוש",
+    "खोज",
+    "🚀",
+    "✅",
+    "e\u0301tat",  # combining accent
+    "zero\u200bwidth",  # zero-width space
+    "\u202eevil",  # right-to-left override
+)
+
+
+def make_description(index: int, size: int, use_unicode: bool, rng) -> str:
+    """Build a description of roughly size characters for tool index."""
+    words = ASCII_WORDS + UNICODE_WORDS if use_unicode else ASCII_WORDS
+    parts = [f"Synthetic tool {index}."]
+    length = len(parts[0])
+    while length < size:
+        word = rng.choice(words)
+        parts.append(word)
+        length += len(word) + 1
+    return " ".join(parts)[: max(size, len(parts[0]))]
+
+
+def make_tools(count: int, description_size: int, use_unicode: bool, seed: int):
+    """Return (name, description) pairs for count generated tools."""
+    rng = random.Random(seed)
+    return [
+        (
+            f"synthetic_tool_{i}",
+            make_description(i, description_size, use_unicode, rng),
+        )
+        for i in range(count)
+    ]
+
+
+def page_tools(tools: list, cursor, page_size: int):
+    """Return (page, next_cursor) for an opaque offset cursor."""
+    if not page_size:
+        return tools, None
+    try:
+        start = int(cursor) if cursor else 0
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    end = start + page_size
+    return tools[start:end], (str(end) if end < len(tools) else None)
+
+
+def _accept_cursor_params():
+    # MCP 1.5.0 parses tools/list params without a cursor field and drops it, so
+    # keep unknown params around for the paginated handler to read.
+    types.RequestParams.model_config["extra"] = "allow"
+    for model in (types.RequestParams, types.ListToolsRequest, types.ClientRequest):
+        model.model_rebuild(force=True)
+
+
+def _request_cursor(request):
+    cursor = getattr(request, "cursor", None)
+    params = getattr(request, "params", None)
+    if cursor is None and params is not None:
+        cursor = getattr(params, "cursor", None)
+        if cursor is None and params.model_extra:
+            cursor = params.model_extra.get("cursor")
+    return cursor
+
+
+INPUT_SCHEMA = {
+    "type": "object",
+    "properties": {"text": {"type": "string"}},
+}
+
+
+def build_server(
+    tools: int = 100,
+    description_size: int = 256,
+    use_unicode: bool = False,
+    page_size: int = 0,
+    latency_ms: float = 0.0,
+    seed: int = 0,
+    **settings,
+) -> FastMCP:
+    """Create a FastMCP server exposing generated tools.
+
+    The generated tools are served by custom tools/list and tools/call handlers
+    rather than registered one by one, so catalogs of 100k tools start quickly.
+    """
+    server = FastMCP("Synthetic Load Server", **settings)
+    latency = latency_ms / 1000.0
+    catalog = [
+        types.Tool(name=name, description=description, inputSchema=INPUT_SCHEMA)
+        for name, description in make_tools(tools, description_size, use_unicode, seed)
+    ]
+    names = {tool.name for tool in catalog}
+
+    async def list_tools(request):
+        if latency:
+            await asyncio.sleep(latency)
+        page, next_cursor = page_tools(catalog, _request_cursor(request), page_size)
+        return types.ServerResult(
+            types.ListToolsResult(tools=page, nextCursor=next_cursor)
+        )
+
+    async def call_tool(request):
+        if latency:
+            await asyncio.sleep(latency)
+        name = request.params.name
+        if name not in names:
+            text, is_error = f"Unknown tool: {name}", True
+        else:
+            text, is_error = (
+                str((request.params.arguments or {}).get("text", "")),
+                False,
+            )
+        return types.ServerResult(
+            types.CallToolResult(
+                content=[types.TextContent(type="text", text=text)], isError=is_error
+            )
+        )
+
+    handlers = server._mcp_server.request_handlers
+    handlers[types.ListToolsRequest] = list_tools
+    handlers[types.CallToolRequest] = call_tool
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic MCP load-generator server")
+    parser.add_argument("--tools", type=int, default=100, help="Number of tools")
+    parser.add_argument(
+        "--description-size",
+        type=int,
+        default=256,
+        help="Approximate description length in characters",
+    )
+    parser.add_argument(
+        "--unicode", action="store_true", help="Mix unicode into descriptions"
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=0,
+        help="Tools per tools/list page (0 returns everything in one page)",
+    )
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=0.0,
+        help="Artificial delay added to tools/list and every tool call",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--transport", choices=["stdio", "sse"], default="stdio")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    _accept_cursor_params()
+    server = build_server(
+        tools=args.tools,
+        description_size=args.description_size,
+        use_unicode=args.unicode,
+        page_size=args.page_size,
+        latency_ms=args.latency_ms,
+        seed=args.seed,
+        host=args.host,
+        port=args.port,
+        log_level="WARNING",
+    )
+    server.run(transport=args.transport)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,19 +12,26 @@ __author__ = "Curtis Collicutt"
 __license__ = "MIT"
 
 from .client import RailLockClient
+from .compact import CompactConfig
 from .config import RailLockConfig
-from .exceptions import RailLockError
-from .utils import debug_print
+from .exceptions import RailLockError, ToolBlockedError
+from .multi_config import MultiServerConfig
+from .utils import debug_print, is_debug_enabled, set_debug
 
 # Make raillock.commands a package for CLI subcommands
 
-__all__ = ["RailLockClient", "RailLockConfig", "RailLockError"]
-
-import os
+__all__ = [
+    "CompactConfig",
+    "MultiServerConfig",
+    "RailLockClient",
+    "RailLockConfig",
+    "RailLockError",
+    "ToolBlockedError",
+]
 
 
 def is_debug():
-    return os.environ.get("RAILLOCK_DEBUG", "false").lower() == "true"
+    return is_debug_enabled()
 
 
 # Print import path if debug is enabled
@@ -0,0 +1,220 @@
+"""
+ChecksumBlocklist - Memory-mapped database of known-malicious tool checksums.
+
+The file is a small header, an optional Bloom filter and then the SHA-256
+digests sorted as fixed-width 32-byte records. Lookups memory-map the file
+and bisect the records, so a process can check against hundreds of
+thousands of checksums without parsing the file or copying it onto the heap;
+the operating system shares the pages between processes. When present, the
+Bloom filter answers most misses from a handful of bits before any bisection.
+
+Build a file from a feed of hex checksums with build_blocklist() or
+``raillock build-blocklist``.
+"""
+
+import bisect
+import math
+import mmap
+import os
+import struct
+from typing import Iterable, Optional, Tuple, Union
+
+MAGIC = b"RLBLOCK\x00"
+VERSION = 1
+DIGEST_SIZE = 32
+# magic, version, digest size, record count, Bloom filter bits, Bloom hashes
+_HEADER = struct.Struct("<8sIIQQI4x")
+DEFAULT_BLOOM_BITS_PER_ENTRY = 10
+
+
+def _digest(checksum: Union[str, bytes]) -> bytes:
+    if isinstance(checksum, bytes):
+        digest = checksum
+    else:
+        try:
+            digest = bytes.fromhex(checksum)
+        except ValueError:
+            raise ValueError(f"Not a hex SHA-256 checksum: {checksum!r}")
+    if len(digest) != DIGEST_SIZE:
+        raise ValueError(f"Not a SHA-256 checksum: {checksum!r}")
+    return digest
+
+
+def _bloom_positions(digest: bytes, bits: int, hashes: int):
+    # The digests are already uniformly distributed, so their bytes serve as the
+    # two base hashes of Kirsch-Mitzenmacher double hashing.
+    h1 = int.from_bytes(digest[:8], "little")
+    h2 = int.from_bytes(digest[8:16], "little") | 1
+    return [(h1 + i * h2) % bits for i in range(hashes)]
+
+
+class _Records:
+    """Sequence view of the sorted digests for bisect."""
+
+    __slots__ = ("_buffer", "_offset", "_count")
+
+    def __init__(self, buffer, offset: int, count: int):
+        self._buffer = buffer
+        self._offset = offset
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> bytes:
+        start = self._offset + index * DIGEST_SIZE
+        return self._buffer[start : start + DIGEST_SIZE]
+
+
+class ChecksumBlocklist:
+    """Read-only, memory-mapped set of known-malicious tool checksums."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            size = stat.st_size
+            if size < _HEADER.size:
+                raise ValueError(f"Not a RailLock checksum blocklist: {path}")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, digest_size, count, bloom_bits, bloom_hashes = (
+                _HEADER.unpack_from(self._mmap, 0)
+            )
+            if magic != MAGIC:
+                raise ValueError(f"Not a RailLock checksum blocklist: {path}")
+            if version != VERSION or digest_size != DIGEST_SIZE:
+                raise ValueError(
+                    f"Unsupported checksum blocklist version {version} in {path}"
+                )
+            bloom_size = bloom_bits // 8
+            records_offset = _HEADER.size + bloom_size
+            if size != records_offset + count * DIGEST_SIZE:
+                raise ValueError(f"Truncated or corrupt checksum blocklist: {path}")
+        except BaseException:
+            self._mmap.close()
+            raise
+        self._bloom_offset = _HEADER.size
+        self._bloom_bits = bloom_bits
+        self._bloom_hashes = bloom_hashes
+        self._records = _Records(self._mmap, records_offset, count)
+        # Names this exact file; build_blocklist() replaces rather than rewrites
+        self.identity = (
+            os.path.abspath(path),
+            stat.st_dev,
+            stat.st_ino,
+            stat.st_mtime_ns,
+            size,
+        )
+
+    @classmethod
+    def open(cls, path: str) -> "ChecksumBlocklist":
+        return cls(path)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def has_bloom_filter(self) -> bool:
+        return self._bloom_bits > 0
+
+    def _bloom_may_contain(self, digest: bytes) -> bool:
+        buffer = self._mmap
+        offset = self._bloom_offset
+        for position in _bloom_positions(digest, self._bloom_bits, self._bloom_hashes):
+            if not buffer[offset + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+
+    def __contains__(self, checksum) -> bool:
+        """True if checksum (hex string or 32 raw bytes) is on the blocklist."""
+        try:
+            digest = _digest(checksum)
+        except (TypeError, ValueError):
+            return False
+        if self._bloom_bits and not self._bloom_may_contain(digest):
+            return False
+        records = self._records
+        index = bisect.bisect_left(records, digest)
+        return index < len(records) and records[index] == digest
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self) -> "ChecksumBlocklist":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def read_checksum_feed(lines: Iterable[str]) -> Iterable[str]:
+    """Yield the checksums of a text feed: one per line, '#' starts a comment."""
+    for line in lines:
+        checksum = line.split("#", 1)[0].strip()
+        if checksum:
+            yield checksum
+
+
+def _create_temp_file(directory: str) -> Tuple[int, str]:
+    """Create a new file in directory with the usual 0666 & ~umask mode.
+
+    Unlike mkstemp(), which always uses 0600, the kernel applies the process
+    umask, so the file gets the mode any other newly created file would.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        tmp_path = os.path.join(directory, f".blocklist-{os.urandom(6).hex()}.tmp")
+        try:
+            return os.open(tmp_path, flags, 0o666), tmp_path
+        except FileExistsError:
+            continue
+
+
+def build_blocklist(
+    checksums: Iterable[Union[str, bytes]],
+    path: str,
+    bloom_bits_per_entry: Optional[int] = DEFAULT_BLOOM_BITS_PER_ENTRY,
+) -> int:
+    """Write checksums to path as a blocklist file and return the record count.
+
+    Duplicates are dropped. bloom_bits_per_entry sizes the Bloom filter
+    (10 bits gives about a 1% false positive rate); 0 or None omits it.
+    The file is replaced atomically, so running agents never see a partial file.
+    """
+    digests = sorted({_digest(checksum) for checksum in checksums})
+    count = len(digests)
+    bloom_bits = 0
+    bloom_hashes = 0
+    bloom = b""
+    if bloom_bits_per_entry and count:
+        bloom_bits = max(64, -(-count * bloom_bits_per_entry // 8) * 8)
+        bloom_hashes = max(1, round(bloom_bits / count * math.log(2)))
+        filter_bits = bytearray(bloom_bits // 8)
+        for digest in digests:
+            for position in _bloom_positions(digest, bloom_bits, bloom_hashes):
+                filter_bits[position >> 3] |= 1 << (position & 7)
+        bloom = bytes(filter_bits)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = _create_temp_file(directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(
+                _HEADER.pack(
+                    MAGIC, VERSION, DIGEST_SIZE, count, bloom_bits, bloom_hashes
+                )
+            )
+            f.write(bloom)
+            f.write(b"".join(digests))
+        # A rebuild keeps the mode chosen for the file it replaces
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return count
@@ -1,9 +1,32 @@
 import argparse
+import importlib
 import sys
 import traceback
-from raillock.cli.commands.review import run_review
-from raillock.cli.commands.compare import run_compare
-from raillock.cli.commands.webserver import run_webserver
+from raillock.blocklist import DEFAULT_BLOOM_BITS_PER_ENTRY
+from raillock.profiling import (
+    PROFILE_ENV_VAR,
+    default_profile_path,
+    profile_path_from_env,
+    run_profiled,
+)
+
+# Subcommand modules are imported only once their command is chosen, so that
+# `raillock --help` and fast commands skip uvicorn, starlette, tabulate and mcp.
+COMMANDS = {
+    "review": ("raillock.cli.commands.review", "run_review"),
+    "compare": ("raillock.cli.commands.compare", "run_compare"),
+    "webserver": ("raillock.cli.commands.webserver", "run_webserver"),
+    "build-blocklist": ("raillock.cli.commands.blocklist", "run_build_blocklist"),
+}
+
+
+def load_command(name):
+    """Import and return the run function of subcommand name, or None."""
+    target = COMMANDS.get(name)
+    if target is None:
+        return None
+    module_name, attr = target
+    return getattr(importlib.import_module(module_name), attr)
 
 
 def main():
@@ -12,6 +35,16 @@ def main():
         description="""RailLock CLI\n\nExamples:\n  raillock review --server http://localhost:8000\n  raillock review --server http://localhost:8000/sse --sse\n  raillock review --server stdio:python examples/most-basic/echo_server.py\n  raillock review --server stdio:python examples/most-basic/echo_server.py --yes\n  raillock compare --server http://localhost:8000/sse --config raillock_config.yaml\n  raillock webserver --server http://localhost:8000/sse --sse --host 0.0.0.0 --port 8080\n\nUse --yes to auto-accept all tools and generate a config file (works for SSE and stdio).\nUse webserver to start a web interface for reviewing tools.\nFor more, see the docs/cli.md\n""",
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=f"Profile the command with cProfile and print per-phase timings (or set {PROFILE_ENV_VAR}=1)",
+    )
+    parser.add_argument(
+        "--profile-output",
+        metavar="PATH",
+        help="Where to write the pstats file (default: raillock-<command>.pstats)",
+    )
     subparsers = parser.add_subparsers(dest="command", help="Command to execute")
 
     # Review command
@@ -54,7 +87,9 @@ examples:
         help="Server URL (e.g. http://localhost:8000, --sse for SSE) or stdio command (e.g. stdio:my_server_executable)",
     )
     compare_parser.add_argument(
-        "--config", required=True, help="Configuration file path"
+        "--config",
+        required=True,
+        help="Configuration file, multi-server config file or directory of per-server config files",
     )
     compare_parser.add_argument("--sse", action="store_true", help="Use SSE transport")
     compare_parser.add_argument(
@@ -84,22 +119,47 @@ examples:
         "--port", type=int, default=8080, help="Web server port (default: 8080)"
     )
 
+    # Build blocklist command
+    blocklist_parser = subparsers.add_parser(
+        "build-blocklist",
+        help="Build a memory-mapped checksum blocklist from a feed of known-malicious checksums",
+    )
+    blocklist_parser.add_argument(
+        "--input",
+        required=True,
+        help="Text file with one hex checksum per line ('-' for stdin, '#' starts a comment)",
+    )
+    blocklist_parser.add_argument(
+        "--output", required=True, help="Blocklist file to write"
+    )
+    blocklist_parser.add_argument(
+        "--bloom-bits",
+        type=int,
+        default=DEFAULT_BLOOM_BITS_PER_ENTRY,
+        help=f"Bloom filter bits per checksum, 0 for none (default: {DEFAULT_BLOOM_BITS_PER_ENTRY})",
+    )
+
     args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         sys.exit(1)
 
-    if args.command == "review":
-        run_review(args)
-    elif args.command == "compare":
-        run_compare(args)
-    elif args.command == "webserver":
-        run_webserver(args)
-    else:
+    command = load_command(args.command)
+    if command is None:
         parser.print_help()
         sys.exit(1)
 
+    profile_path = args.profile_output
+    if profile_path is None and args.profile:
+        profile_path = default_profile_path(args.command)
+    if profile_path is None:
+        profile_path = profile_path_from_env(args.command)
+    if profile_path:
+        run_profiled(command, args, profile_path)
+    else:
+        command(args)
+
 
 if __name__ == "__main__":
     main()
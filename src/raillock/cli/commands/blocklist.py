@@ -0,0 +1,21 @@
+import sys
+
+from raillock.blocklist import build_blocklist, read_checksum_feed
+
+
+def run_build_blocklist(args):
+    """Build a binary checksum blocklist from a text feed of hex checksums."""
+    try:
+        if args.input == "-":
+            count = build_blocklist(
+                read_checksum_feed(sys.stdin), args.output, args.bloom_bits
+            )
+        else:
+            with open(args.input, "r") as f:
+                count = build_blocklist(
+                    read_checksum_feed(f), args.output, args.bloom_bits
+                )
+    except (OSError, ValueError) as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Wrote {count} checksums to {args.output}")
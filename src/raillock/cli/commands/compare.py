@@ -4,10 +4,11 @@ import hashlib
 import asyncio
 from tabulate import tabulate
 from raillock.client import RailLockClient
-from raillock.config import RailLockConfig
 from raillock.exceptions import RailLockError
 from raillock.mcp_utils import get_tools_via_sse
-from raillock.utils import calculate_tool_checksum
+from raillock.multi_config import load_server_config
+from raillock.profiling import phase
+from raillock.utils import calculate_tool_checksums
 from raillock.config_utils import (
     compare_config_with_server,
     handle_config_load_error,
@@ -16,10 +17,18 @@ from raillock.config_utils import (
 import yaml
 
 
+def describe_type(item):
+    """Return a row's type, naming the glob pattern that decided it."""
+    if item.get("pattern"):
+        return f"{item['type']} ({item['pattern']})"
+    return item["type"]
+
+
 def run_compare(args):
     # Load configuration
     try:
-        config = RailLockConfig.from_file(args.config)
+        with phase("config_load"):
+            config = load_server_config(args.config, args.server)
     except Exception as e:
         handle_config_load_error(e, args.config)
     client = RailLockClient(config)
@@ -29,14 +38,12 @@ def run_compare(args):
             async def compare_sse():
                 try:
                     tools, _ = await get_tools_via_sse(args.server)
+                    checksums = calculate_tool_checksums(
+                        [(t.name, t.description) for t in tools], args.server
+                    )
                     server_tools = {
-                        t.name: {
-                            "description": t.description,
-                            "checksum": calculate_tool_checksum(
-                                t.name, t.description, args.server
-                            ),
-                        }
-                        for t in tools
+                        t.name: {"description": t.description, "checksum": checksum}
+                        for t, checksum in zip(tools, checksums)
                     }
 
                     # Use shared comparison function
@@ -45,9 +52,10 @@ def run_compare(args):
                         "malicious_tools": config.malicious_tools,
                         "denied_tools": config.denied_tools,
                     }
-                    comparison_data, _ = compare_config_with_server(
-                        config_data, server_tools
-                    )
+                    with phase("comparison"):
+                        comparison_data, _ = compare_config_with_server(
+                            config_data, server_tools
+                        )
 
                     GREEN = "\033[92m"
                     RED = "\033[91m"
@@ -64,7 +72,7 @@ def run_compare(args):
                                 check(item["on_server"]),
                                 check(item["allowed"]),
                                 check(item["checksum_match"]),
-                                item["type"],
+                                describe_type(item),
                                 item["description"],
                             ]
                         )
@@ -77,7 +85,8 @@ def run_compare(args):
                         "Type",
                         "Description",
                     ]
-                    print(tabulate(rows, headers, tablefmt="fancy_grid"))
+                    with phase("output"):
+                        print(tabulate(rows, headers, tablefmt="fancy_grid"))
                 except Exception as e:
                     print(f"Error: {str(e)}", file=sys.stderr)
                     sys.exit(1)
@@ -93,7 +102,10 @@ def run_compare(args):
                 "malicious_tools": config.malicious_tools,
                 "denied_tools": config.denied_tools,
             }
-            comparison_data, _ = compare_config_with_server(config_data, server_tools)
+            with phase("comparison"):
+                comparison_data, _ = compare_config_with_server(
+                    config_data, server_tools
+                )
 
             GREEN = "\033[92m"
             RED = "\033[91m"
@@ -110,7 +122,7 @@ def run_compare(args):
                         check(item["on_server"]),
                         check(item["allowed"]),
                         check(item["checksum_match"]),
-                        item["type"],
+                        describe_type(item),
                         item["description"],
                     ]
                 )
@@ -123,7 +135,8 @@ def run_compare(args):
                 "Type",
                 "Description",
             ]
-            print(tabulate(rows, headers, tablefmt="fancy_grid"))
+            with phase("output"):
+                print(tabulate(rows, headers, tablefmt="fancy_grid"))
     except Exception as e:
         handle_raillock_error(e)
     finally:
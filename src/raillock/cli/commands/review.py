@@ -8,7 +8,8 @@ from raillock.client import RailLockClient
 from raillock.config import RailLockConfig
 from raillock.exceptions import RailLockError
 from raillock.mcp_utils import get_tools_via_sse
-from raillock.utils import calculate_tool_checksum
+from raillock.profiling import phase
+from raillock.utils import calculate_tool_checksums
 from raillock.config_utils import (
     build_config_dict,
     save_config_to_file,
@@ -74,7 +75,8 @@ def run_review(args):
         if getattr(args, "config", None):
             try:
                 print(f"[DEBUG] Loading config from {args.config}")
-                config = RailLockConfig.from_file(args.config)
+                with phase("config_load"):
+                    config = RailLockConfig.from_file(args.config)
             except Exception as e:
                 handle_config_load_error(e, args.config)
         else:
@@ -94,7 +96,12 @@ def run_review(args):
             print("\nThis will display all available tools and their info.\n")
         print("---\n")
         print(f"Testing server availability...")
-        client.test_server(args.server, timeout=getattr(args, "timeout", 30))
+        with phase("test_server"):
+            client.test_server(
+                args.server,
+                timeout=getattr(args, "timeout", 30),
+                prefetch=not getattr(args, "sse", False),
+            )
         print(
             f"Server is up. Connecting to server: {args.server} (sse={getattr(args, 'sse', False)})"
         )
@@ -111,7 +118,8 @@ def run_review(args):
                     or "raillock_config.yaml"
                 )
 
-            save_config_to_file(config_dict, out_path)
+            with phase("output"):
+                save_config_to_file(config_dict, out_path)
             print(f"RailLock config saved to {out_path}")
 
         if getattr(args, "sse", False):
@@ -131,12 +139,11 @@ def run_review(args):
                             "malicious_tools": {},
                             "denied_tools": {},
                         }
-                        for tool in tools:
-                            name = getattr(tool, "name", None)
-                            desc = getattr(tool, "description", "")
-                            checksum = calculate_tool_checksum(
-                                name, desc, config_dict["server"]["name"]
-                            )
+                        named_tools = [extract_tool_info(tool) for tool in tools]
+                        checksums = calculate_tool_checksums(
+                            named_tools, config_dict["server"]["name"]
+                        )
+                        for (name, desc), checksum in zip(named_tools, checksums):
                             config_dict["allowed_tools"][name] = {
                                 "description": desc,
                                 "server": config_dict["server"]["name"],
@@ -5,13 +5,18 @@ from starlette.responses import JSONResponse
 from raillock.client import RailLockClient
 from raillock.config import RailLockConfig
 from raillock.mcp_utils import get_tools_via_sse
-from raillock.utils import calculate_tool_checksum
+from raillock.utils import calculate_tool_checksums
 from raillock.config_utils import (
     build_config_dict,
     save_config_to_file,
     config_dict_to_yaml_string,
     compare_config_with_server,
 )
+from .metrics import track_upstream
+
+
+def _transport(server_url):
+    return "stdio" if server_url.startswith("stdio:") else "http"
 
 
 async def get_tools_api(request):
@@ -21,7 +26,10 @@ async def get_tools_api(request):
     try:
         if state.use_sse:
             # Use MCP protocol for SSE
-            tools, real_server_name = await get_tools_via_sse(state.server_url)
+            with track_upstream(state, "sse"):
+                tools, real_server_name = await get_tools_via_sse(
+                    state.server_url, session_pool=getattr(state, "session_pool", None)
+                )
             state.server_name = real_server_name or state.server_url
             state.server_type = "sse"
 
@@ -36,8 +44,11 @@ async def get_tools_api(request):
             # Use stdio or HTTP
             if state.client is None:
                 config = RailLockConfig()
-                state.client = RailLockClient(config)
-                await state.client.connect_async(state.server_url)
+                state.client = RailLockClient(
+                    config, session_pool=getattr(state, "session_pool", None)
+                )
+                with track_upstream(state, _transport(state.server_url)):
+                    await state.client.connect_async(state.server_url)
 
             state.server_name = state.server_url
             state.server_type = (
@@ -134,22 +145,26 @@ async def compare_config_api(request):
         # Get server tools
         if state.use_sse:
             # Use MCP protocol for SSE
-            tools, _ = await get_tools_via_sse(state.server_url)
+            with track_upstream(state, "sse"):
+                tools, _ = await get_tools_via_sse(
+                    state.server_url, session_pool=getattr(state, "session_pool", None)
+                )
+            checksums = calculate_tool_checksums(
+                [(t.name, t.description) for t in tools], state.server_name
+            )
             server_tools = {
-                t.name: {
-                    "description": t.description,
-                    "checksum": calculate_tool_checksum(
-                        t.name, t.description, state.server_name
-                    ),
-                }
-                for t in tools
+                t.name: {"description": t.description, "checksum": checksum}
+                for t, checksum in zip(tools, checksums)
             }
         else:
             # Use stdio or HTTP
             if state.client is None:
                 config = RailLockConfig()
-                state.client = RailLockClient(config)
-                await state.client.connect_async(state.server_url)
+                state.client = RailLockClient(
+                    config, session_pool=getattr(state, "session_pool", None)
+                )
+                with track_upstream(state, _transport(state.server_url)):
+                    await state.client.connect_async(state.server_url)
             server_tools = state.client._available_tools
 
         # Use shared comparison function
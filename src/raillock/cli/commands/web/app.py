@@ -1,4 +1,5 @@
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 from starlette.applications import Starlette
 from starlette.routing import Route, Mount
@@ -7,6 +8,8 @@ from starlette.responses import HTMLResponse
 from starlette.middleware import Middleware
 from starlette.middleware.cors import CORSMiddleware
 
+from raillock.http_client import aclose_async_http_client
+from raillock.session_pool import SessionPool
 from .api import (
     get_tools_api,
     preview_config_api,
@@ -14,7 +17,7 @@ from .api import (
     compare_config_api,
     save_manual_config_api,
 )
-
+from .metrics import MetricsMiddleware, WebMetrics, metrics_api
 
 # Get the directory where this file is located
 BASE_DIR = Path(__file__).parent
@@ -29,6 +32,8 @@ class WebServerState:
         self.client = None
         self.server_url = None
         self.use_sse = False
+        self.session_pool = None
+        self.metrics = None
 
 
 async def home(request):
@@ -39,6 +44,17 @@ async def home(request):
     return HTMLResponse(content)
 
 
+@asynccontextmanager
+async def lifespan(app):
+    """Keep MCP sessions pooled while serving and close them on shutdown."""
+    app.state.session_pool = SessionPool()
+    try:
+        yield
+    finally:
+        await app.state.session_pool.aclose()
+        await aclose_async_http_client()
+
+
 def create_app():
     """Create and configure the Starlette application."""
 
@@ -50,6 +66,7 @@ def create_app():
         Route("/api/save-config", save_config_api, methods=["POST"]),
         Route("/api/compare-config", compare_config_api, methods=["POST"]),
         Route("/api/save-manual-config", save_manual_config_api, methods=["POST"]),
+        Route("/metrics", metrics_api),
         Mount(
             "/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static"
         ),
@@ -57,18 +74,24 @@ def create_app():
 
     # Middleware
     middleware = [
+        Middleware(MetricsMiddleware),
         Middleware(
             CORSMiddleware,
             allow_origins=["*"],
             allow_methods=["*"],
             allow_headers=["*"],
-        )
+        ),
     ]
 
     # Create application
-    app = Starlette(routes=routes, middleware=middleware)
+    app = Starlette(
+        routes=routes,
+        middleware=middleware,
+        lifespan=lifespan,
+    )
 
     # Initialize state
     app.state = WebServerState()
+    app.state.metrics = WebMetrics()
 
     return app
@@ -0,0 +1,243 @@
+"""
+Prometheus text-format metrics for the RailLock web server.
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+from starlette.responses import PlainTextResponse
+from starlette.routing import Match
+
+from raillock.metrics import LatencyHistogram
+from raillock.utils import checksum_cache_info
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _le(bound: float) -> str:
+    return "+Inf" if math.isinf(bound) else repr(bound)
+
+
+class WebMetrics:
+    """Request, upstream fetch and error metrics for one web server app."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.request_latency = {}
+        self.request_errors = {}
+        self.upstream_latency = {}
+        self.upstream_errors = {}
+
+    def _histogram(self, table, key) -> LatencyHistogram:
+        histogram = table.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = table.setdefault(key, LatencyHistogram())
+        return histogram
+
+    def _increment(self, table, key) -> None:
+        with self._lock:
+            table[key] = table.get(key, 0) + 1
+
+    def observe_request(self, route, method, status, seconds) -> None:
+        self._histogram(self.request_latency, (route, method)).observe(seconds)
+        if status >= 500:
+            self._increment(self.request_errors, (route, method))
+
+    @contextmanager
+    def time_upstream(self, transport):
+        """Time an upstream MCP fetch and count it as an error if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self._increment(self.upstream_errors, transport)
+            raise
+        finally:
+            self._histogram(self.upstream_latency, transport).observe(
+                time.perf_counter() - start
+            )
+
+    def render(self, state=None) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        lines = []
+        self._render_histograms(
+            lines,
+            "raillock_http_request_duration_seconds",
+            "Web API request latency by route.",
+            {
+                (("route", route), ("method", method)): histogram
+                for (route, method), histogram in self.request_latency.items()
+            },
+        )
+        self._render_counters(
+            lines,
+            "raillock_http_request_errors_total",
+            "Web API requests that returned a 5xx status.",
+            {
+                (("route", route), ("method", method)): count
+                for (route, method), count in self.request_errors.items()
+            },
+        )
+        self._render_histograms(
+            lines,
+            "raillock_upstream_fetch_duration_seconds",
+            "Latency of fetching tools from the MCP server.",
+            {
+                (("transport", transport),): histogram
+                for transport, histogram in self.upstream_latency.items()
+            },
+        )
+        self._render_counters(
+            lines,
+            "raillock_upstream_fetch_errors_total",
+            "Failed fetches of tools from the MCP server.",
+            {
+                (("transport", transport),): count
+                for transport, count in self.upstream_errors.items()
+            },
+        )
+
+        cache = checksum_cache_info()
+        lookups = cache["hits"] + cache["misses"]
+        self._render_single(
+            lines,
+            "raillock_checksum_cache_hits_total",
+            "counter",
+            "Tool checksum cache hits.",
+            cache["hits"],
+        )
+        self._render_single(
+            lines,
+            "raillock_checksum_cache_misses_total",
+            "counter",
+            "Tool checksum cache misses.",
+            cache["misses"],
+        )
+        self._render_single(
+            lines,
+            "raillock_checksum_cache_hit_ratio",
+            "gauge",
+            "Share of checksum lookups served from the cache.",
+            cache["hits"] / lookups if lookups else 0.0,
+        )
+        self._render_single(
+            lines,
+            "raillock_checksum_cache_entries",
+            "gauge",
+            "Entries held in the tool checksum cache.",
+            cache["size"],
+        )
+        if state is not None:
+            self._render_single(
+                lines,
+                "raillock_tools",
+                "gauge",
+                "Tools discovered on the MCP server by the last fetch.",
+                len(getattr(state, "tools", None) or ()),
+            )
+            pool = getattr(state, "session_pool", None)
+            self._render_single(
+                lines,
+                "raillock_pooled_sessions",
+                "gauge",
+                "Open MCP sessions held in the session pool.",
+                len(pool) if pool is not None else 0,
+            )
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _render_single(lines, name, kind, help_text, value) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"{name} {value}")
+
+    @staticmethod
+    def _render_counters(lines, name, help_text, series) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for labels, value in sorted(series.items()):
+            lines.append(f"{name}{_labels(**dict(labels))} {value}")
+
+    @staticmethod
+    def _render_histograms(lines, name, help_text, series) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for labels, histogram in sorted(series.items()):
+            labels = dict(labels)
+            snapshot = histogram.snapshot()
+            for bound, count in snapshot["buckets"].items():
+                lines.append(f"{name}_bucket{_labels(**labels, le=_le(bound))} {count}")
+            lines.append(f"{name}_sum{_labels(**labels)} {snapshot['sum']}")
+            lines.append(f"{name}_count{_labels(**labels)} {snapshot['count']}")
+
+
+def track_upstream(state, transport):
+    """Return a context manager timing an upstream fetch, if metrics are enabled."""
+    metrics = getattr(state, "metrics", None)
+    if not isinstance(metrics, WebMetrics):
+        return nullcontext()
+    return metrics.time_upstream(transport)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency and 5xx errors per route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        metrics = getattr(scope["app"].state, "metrics", None)
+        if not isinstance(metrics, WebMetrics):
+            await self.app(scope, receive, send)
+            return
+
+        route = _route_label(scope)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.observe_request(
+                route, scope["method"], status, time.perf_counter() - start
+            )
+
+
+def _route_label(scope) -> str:
+    # Label by route template so per-path label values stay bounded
+    for route in scope["app"].routes:
+        match, _ = route.matches(scope)
+        if match != Match.NONE:
+            return route.path
+    return "unmatched"
+
+
+async def metrics_api(request):
+    """Serve metrics in the Prometheus text exposition format."""
+    state = request.app.state
+    metrics = getattr(state, "metrics", None)
+    if not isinstance(metrics, WebMetrics):
+        return PlainTextResponse("", media_type=CONTENT_TYPE)
+    return PlainTextResponse(metrics.render(state), media_type=CONTENT_TYPE)
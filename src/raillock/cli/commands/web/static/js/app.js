@@ -888,7 +888,7 @@ function displayComparisonResults(result) {
         }
         
         tr.innerHTML = `
-            <td><strong>${escapeHtml(row.tool)}</strong></td>
+            <td><strong>${escapeHtml(row.tool)}</strong>${row.pattern ? ` <small>(${escapeHtml(row.pattern)})</small>` : ''}</td>
             <td><span class="status-icon ${row.on_server ? 'check' : 'cross'}">${row.on_server ? '✔' : '✘'}</span></td>
             <td><span class="status-icon ${row.allowed ? 'check' : 'cross'}">${row.allowed ? '✔' : '✘'}</span></td>
             <td><span class="status-icon ${checksumClass}">${checksumIcon}</span></td>
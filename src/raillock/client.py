@@ -5,37 +5,265 @@ RailLockClient - Core client class for MCP server communication and tool validat
 import hashlib
 import json
 import subprocess
-from typing import Dict, Optional
+import threading
+import time
+from collections import namedtuple
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
 from urllib.parse import urlparse
 import asyncio
-import os
-
-import requests
-from requests.exceptions import RequestException
 
+# requests, httpx and the MCP SDK are imported where they are used, so that
+# `import raillock` and the CLI start without paying for them up front.
 from .config import RailLockConfig
 from .exceptions import RailLockError
-from .utils import calculate_tool_checksum
+from .policy import CompiledPolicy, tools_fingerprint
+from .profiling import phase, record_phase
+from .utils import cached_tool_checksum, calculate_tool_checksums
 from raillock.utils import debug_print
 
+if TYPE_CHECKING:
+    import requests
+
+    from .blocklist import ChecksumBlocklist
+    from .config_watcher import ConfigWatcher
+    from .decision_cache import DecisionCache
+    from .session_pool import BackgroundLoop, SessionPool
+
+DEFAULT_FILTER_CACHE_SIZE = 16
+DEFAULT_CONNECT_CONCURRENCY = 8
+# A test_server(prefetch=True) response older than this is fetched again
+PREFETCH_MAX_AGE = 5.0
+
+ToolInfo = namedtuple("ToolInfo", ["name", "description", "checksum"])
+
+
+def _compile_policy(
+    config, server_name: Optional[str], blocklist=None
+) -> CompiledPolicy:
+    # A MultiServerConfig hands out the config of a single server
+    config_for = getattr(config, "config_for", None)
+    if config_for is not None:
+        config = config_for(server_name)
+    return CompiledPolicy(config, server_name, blocklist)
+
+
+def _config_loader(config, cache_dir: Optional[str] = None):
+    """Return a loader that reads a config path back as the same type as config."""
+    from .compact import CompactConfig
+    from .multi_config import MultiServerConfig
+
+    if isinstance(config, MultiServerConfig):
+        return lambda path: MultiServerConfig.load(
+            path, cache_dir=cache_dir, compact=config.compact
+        )
+    if isinstance(config, CompactConfig):
+        return lambda path: CompactConfig.from_file(path, cache_dir=cache_dir)
+    return lambda path: RailLockConfig.from_file(path, cache_dir=cache_dir)
+
+
+def get_async_http_client():
+    """Return the shared pooled httpx.AsyncClient, importing httpx on first use."""
+    from .http_client import get_async_http_client
+
+    return get_async_http_client()
+
+
+class ConnectManyResult:
+    """Outcome of RailLockClient.connect_many.
+
+    tools maps each server that answered in time to its list of ToolInfo, which
+    can be passed to filter_tools(tools, server_name=url). errors maps every other
+    server to the RailLockError describing why it has no result.
+    """
+
+    def __init__(self):
+        self.tools: Dict[str, List[ToolInfo]] = {}
+        self.errors: Dict[str, RailLockError] = {}
+
+    @property
+    def complete(self) -> bool:
+        """True if every server returned its tools."""
+        return not self.errors
+
 
 class RailLockClient:
     """Client for connecting to MCP servers and validating tool access."""
 
-    def __init__(self, config: RailLockConfig):
-        """Initialize the client with a configuration."""
+    _session_pool: Optional["SessionPool"] = None
+    _owns_session_pool = False
+    _http_session: Optional["requests.Session"] = None
+    _owns_http_session = False
+    _prefetched: Optional[tuple] = None
+    _config_watcher: Optional["ConfigWatcher"] = None
+    _blocklist: Optional["ChecksumBlocklist"] = None
+    _decision_cache: Optional["DecisionCache"] = None
+    _pool_loop: Optional["BackgroundLoop"] = None
+
+    def __init__(
+        self,
+        config: RailLockConfig,
+        filter_cache_size: int = DEFAULT_FILTER_CACHE_SIZE,
+        session_pool: Optional["SessionPool"] = None,
+        http_session: Optional["requests.Session"] = None,
+        blocklist: Optional["ChecksumBlocklist"] = None,
+        decision_cache: Optional["DecisionCache"] = None,
+    ):
+        """Initialize the client with a configuration.
+
+        If a SessionPool is given, stdio connections reuse its sessions instead of
+        spawning a new server process on every connect. Using the client as an
+        async context manager creates a pool that is closed on exit. The
+        synchronous connect(), refresh() and connect_many() drive the pool from a
+        background event loop thread, so its sessions survive between calls;
+        close() shuts them down.
+
+        HTTP health checks and manifest fetches share http_session, a pooled
+        keep-alive requests.Session. One is created with create_http_session()
+        defaults when not given; pass your own to tune pool size and retries.
+
+        A ChecksumBlocklist refuses any tool whose checksum it lists, even one
+        the config allows.
+
+        A DecisionCache keeps the decisions for each tool list on disk, so
+        processes that start later with the same policy and list the same tools
+        reuse them instead of validating again.
+        """
+        self._blocklist = blocklist
+        self._decision_cache = decision_cache
+        self._filter_cache: Dict[tuple, tuple] = {}
+        # Held while the filter cache is written, since several threads may
+        # filter at once; reads need no lock
+        self._filter_lock = threading.Lock()
+        self._filter_cache_size = filter_cache_size
         self.config = config
         self._available_tools: Dict[str, dict] = {}
-        self._process: Optional[subprocess.Popen] = None
+        self._session_pool = session_pool
+        self._owns_session_pool = False
+        self._http_session = http_session
         self._server_name: Optional[str] = None
 
+    async def __aenter__(self) -> "RailLockClient":
+        if self._session_pool is None:
+            from .session_pool import SessionPool
+
+            self._session_pool = SessionPool()
+            self._owns_session_pool = True
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    @property
+    def config(self) -> RailLockConfig:
+        return self._state[0]
+
+    @config.setter
+    def config(self, config: RailLockConfig) -> None:
+        """Replace the configuration and drop the compiled policies."""
+        # The config and the policies compiled from it are swapped as one tuple,
+        # so a reader never pairs a new config with an old policy or vice versa.
+        self._state = (config, {})
+
+    @property
+    def blocklist(self) -> Optional["ChecksumBlocklist"]:
+        return self._blocklist
+
+    @blocklist.setter
+    def blocklist(self, blocklist: Optional["ChecksumBlocklist"]) -> None:
+        """Replace the checksum blocklist and drop the compiled policies."""
+        self._blocklist = blocklist
+        self.invalidate_policy()
+
+    def swap_config(self, config: RailLockConfig) -> None:
+        """Compile config for the servers in use, then switch to it atomically.
+
+        Unlike assigning client.config, policies are compiled before the swap,
+        so calls racing with a reload never wait on compilation. Calls already
+        inside filter_tools finish with the policy they started with.
+        """
+        policies = {
+            server_name: _compile_policy(config, server_name, self._blocklist)
+            for server_name in list(self._state[1])
+        }
+        self._state = (config, policies)
+
+    def watch_config(self, path: str, **kwargs) -> "ConfigWatcher":
+        """Reload the config from path whenever the file changes.
+
+        Returns the started ConfigWatcher; keyword arguments are passed to it.
+        Unless a loader is given, each version is loaded as the type of the
+        current config: a MultiServerConfig (from a document or a directory), a
+        CompactConfig or a RailLockConfig. Each valid new version is applied
+        with swap_config(), and the watcher is stopped by close().
+        """
+        from .config_watcher import ConfigWatcher
+
+        if self._config_watcher is not None:
+            self._config_watcher.stop()
+        if "loader" not in kwargs:
+            kwargs["loader"] = _config_loader(self._state[0], kwargs.get("cache_dir"))
+        self._config_watcher = ConfigWatcher(path, self.swap_config, **kwargs)
+        return self._config_watcher.start()
+
+    @property
+    def policy(self) -> CompiledPolicy:
+        """The compiled policy for the current config and server name.
+
+        The policy is compiled on first use and recompiled when the config is
+        replaced or the client connects to a different server. Call
+        invalidate_policy() after mutating the config's tool dicts in place.
+        """
+        return self.policy_for(self._server_name)
+
+    def policy_for(self, server_name: Optional[str]) -> CompiledPolicy:
+        """The compiled policy with server-name defaults resolved to server_name.
+
+        With a MultiServerConfig only server_name's own rules are loaded and
+        compiled.
+        """
+        config, policies = self._state
+        policy = policies.get(server_name)
+        if policy is None:
+            policy = _compile_policy(config, server_name, self._blocklist)
+            policies[server_name] = policy
+        return policy
+
+    def invalidate_policy(self) -> None:
+        """Force the policies to be recompiled on next use."""
+        self._state = (self._state[0], {})
+
+    @property
+    def http_session(self) -> "requests.Session":
+        """The pooled requests.Session used for synchronous HTTP calls."""
+        if self._http_session is None:
+            from .http_client import create_http_session
+
+            self._http_session = create_http_session()
+            self._owns_http_session = True
+        return self._http_session
+
+    def _take_prefetched(self, server_url: str):
+        """Return a fresh test_server(prefetch=True) response for server_url.
+
+        The prefetched response is dropped by any connect, used or not.
+        """
+        prefetched = self._prefetched
+        self._prefetched = None
+        if prefetched is None:
+            return None
+        url, response, fetched_at = prefetched
+        if url != server_url or time.monotonic() - fetched_at > PREFETCH_MAX_AGE:
+            return None
+        return response
+
     def connect(self, server_url: str) -> None:
         """Connect to an MCP server and fetch available tools."""
         self._server_name = server_url
+        prefetched = self._take_prefetched(server_url)
         try:
             if server_url.startswith("stdio:"):
                 # Use async stdio_client and ClientSession from MCP SDK
-                asyncio.run(self.connect_stdio_async(server_url))
+                self._run(self.connect_stdio_async(server_url))
             else:
                 # Handle HTTP/SSE transport
                 parsed_url = urlparse(server_url)
@@ -44,13 +272,19 @@ class RailLockClient:
                         f"Invalid server URL scheme: {parsed_url.scheme}. "
                         "Use stdio: for subprocess, or http(s):// for network servers."
                     )
-                response = requests.get(server_url, timeout=10)
-                response.raise_for_status()
-                tools_data = response.json()
-                self._available_tools = self._parse_tools(tools_data)
+                from requests.exceptions import RequestException
+
+                try:
+                    with phase("connect"):
+                        response = prefetched
+                        if response is None:
+                            response = self.http_session.get(server_url, timeout=10)
+                    response.raise_for_status()
+                    tools_data = response.json()
+                except RequestException as e:
+                    raise RailLockError(f"Failed to connect to server: {str(e)}")
+                self._available_tools = self._parse_tools(tools_data, server_url)
 
-        except RequestException as e:
-            raise RailLockError(f"Failed to connect to server: {str(e)}")
         except json.JSONDecodeError:
             raise RailLockError("Invalid response format from server")
         except subprocess.SubprocessError as e:
@@ -59,24 +293,35 @@ class RailLockClient:
     async def connect_async(self, server_url: str) -> None:
         """Async version of connect for use in async contexts."""
         self._server_name = server_url
+        self._prefetched = None
+        self._available_tools = await self._fetch_tools_async(server_url)
+
+    async def _fetch_tools_async(self, server_url: str, sse: bool = False) -> dict:
+        """Fetch and parse the tools of one server without changing client state."""
+        if server_url.startswith("stdio:"):
+            return await self._fetch_stdio_tools_async(server_url)
+
+        import httpx
+
         try:
-            if server_url.startswith("stdio:"):
-                await self.connect_stdio_async(server_url)
-            else:
-                # For HTTP/SSE, we still use synchronous requests
-                # Could be improved to use aiohttp in the future
-                parsed_url = urlparse(server_url)
-                if parsed_url.scheme not in ["http", "https"]:
-                    raise RailLockError(
-                        f"Invalid server URL scheme: {parsed_url.scheme}. "
-                        "Use stdio: for subprocess, or http(s):// for network servers."
-                    )
-                response = requests.get(server_url, timeout=10)
-                response.raise_for_status()
-                tools_data = response.json()
-                self._available_tools = self._parse_tools(tools_data)
+            parsed_url = urlparse(server_url)
+            if parsed_url.scheme not in ["http", "https"]:
+                raise RailLockError(
+                    f"Invalid server URL scheme: {parsed_url.scheme}. "
+                    "Use stdio: for subprocess, or http(s):// for network servers."
+                )
+            if sse:
+                from .mcp_utils import get_tools_via_sse
 
-        except RequestException as e:
+                tools, _ = await get_tools_via_sse(server_url, self._session_pool)
+                return self._parse_tool_objects(tools, server_url)
+            # Use the shared pooled AsyncClient so the event loop is never blocked
+            with phase("connect"):
+                response = await get_async_http_client().get(server_url, timeout=10)
+            response.raise_for_status()
+            return self._parse_tools(response.json(), server_url)
+
+        except httpx.HTTPError as e:
             raise RailLockError(f"Failed to connect to server: {str(e)}")
         except json.JSONDecodeError:
             raise RailLockError("Invalid response format from server")
@@ -85,30 +330,37 @@ class RailLockClient:
 
     async def connect_stdio_async(self, server_url: str) -> None:
         self._server_name = server_url
+        self._available_tools = await self._fetch_stdio_tools_async(server_url)
+
+    async def _fetch_stdio_tools_async(self, server_url: str) -> dict:
+        from .mcp_utils import list_all_tools
 
         try:
+            if self._session_pool is not None:
+                session = await self._session_pool.get(server_url)
+                try:
+                    with phase("list_tools"):
+                        tools = await list_all_tools(session)
+                except Exception:
+                    await self._session_pool.discard(server_url)
+                    raise
+                return self._parse_tool_objects(tools, server_url)
+
             from mcp.client.stdio import stdio_client
             from mcp import ClientSession
-            from mcp import StdioServerParameters
+            from .session_pool import stdio_server_parameters
 
-            cmd = server_url[6:].split()
-            # Pass the current environment to the subprocess
-            server_params = StdioServerParameters(
-                command=cmd[0], args=cmd[1:], env=os.environ.copy()
-            )
+            server_params = stdio_server_parameters(server_url)
 
+            started = time.perf_counter()
             async with stdio_client(server_params) as (read_stream, write_stream):
+                record_phase("spawn", started)
                 async with ClientSession(read_stream, write_stream) as session:
-                    await session.initialize()
-                    response = await session.list_tools()
-
-                    # Convert list of tool objects to {name: {description: ...}}
-                    tools_dict = {
-                        tool.name: {"description": getattr(tool, "description", "")}
-                        for tool in response.tools
-                        if hasattr(tool, "name")
-                    }
-                    self._available_tools = self._parse_tools(tools_dict)
+                    with phase("initialize"):
+                        await session.initialize()
+                    with phase("list_tools"):
+                        tools = await list_all_tools(session)
+                    return self._parse_tool_objects(tools, server_url)
 
         except asyncio.TimeoutError as e:
             raise RailLockError("Connection to stdio server timed out")
@@ -117,74 +369,224 @@ class RailLockClient:
                 f"Failed to communicate with stdio process (async): {str(e)}"
             )
 
+    def refresh(self) -> None:
+        """Fetch the tool list again from the server last connected to."""
+        if self._server_name is None:
+            raise RailLockError("Client is not connected to a server")
+        self.connect(self._server_name)
+
+    async def refresh_async(self) -> None:
+        """Fetch the tool list again from the server last connected to."""
+        if self._server_name is None:
+            raise RailLockError("Client is not connected to a server")
+        await self.connect_async(self._server_name)
+
+    def connect_many(
+        self,
+        server_urls: Iterable[str],
+        concurrency: int = DEFAULT_CONNECT_CONCURRENCY,
+        timeout: Optional[float] = 30.0,
+        sse: bool = False,
+    ) -> ConnectManyResult:
+        """Fetch the tools of several servers concurrently. See connect_many_async."""
+        return self._run(
+            self.connect_many_async(
+                server_urls, concurrency=concurrency, timeout=timeout, sse=sse
+            )
+        )
+
+    def _run(self, coro):
+        """Run coro to completion from synchronous code.
+
+        Without a session pool each call gets a fresh event loop. With one, every
+        call runs on the same background loop, which keeps the pooled sessions
+        open after the call returns.
+        """
+        if self._session_pool is None:
+            return asyncio.run(coro)
+        if self._pool_loop is None:
+            from .session_pool import BackgroundLoop
+
+            self._pool_loop = BackgroundLoop()
+        return self._pool_loop.run(coro)
+
+    async def connect_many_async(
+        self,
+        server_urls: Iterable[str],
+        concurrency: int = DEFAULT_CONNECT_CONCURRENCY,
+        timeout: Optional[float] = 30.0,
+        sse: bool = False,
+    ) -> ConnectManyResult:
+        """Fetch the tools of several stdio, HTTP or SSE servers concurrently.
+
+        At most concurrency servers are contacted at once, and timeout is a global
+        deadline in seconds for the whole batch. Servers that fail or miss the
+        deadline are reported in the result's errors instead of failing the call.
+        Set sse=True to use the SSE transport for http(s) URLs.
+
+        With a session pool the same limits hold: stdio and SSE sessions for
+        different servers are opened in parallel and kept in the pool, and the
+        open of a server that misses the deadline is cancelled.
+        """
+        result = ConnectManyResult()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(server_url):
+            async with semaphore:
+                tools = await self._fetch_tools_async(server_url, sse=sse)
+            result.tools[server_url] = [
+                ToolInfo(name, info["description"], info["checksum"])
+                for name, info in tools.items()
+            ]
+
+        tasks = {
+            asyncio.ensure_future(fetch(server_url)): server_url
+            for server_url in dict.fromkeys(server_urls)
+        }
+        if not tasks:
+            return result
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+            result.errors[tasks[task]] = RailLockError(
+                f"Timed out after {timeout} seconds"
+            )
+        if pending:
+            await asyncio.wait(pending)
+        for task in done:
+            error = task.exception()
+            if error is not None:
+                if not isinstance(error, RailLockError):
+                    error = RailLockError(f"Failed to connect to server: {error}")
+                result.errors[tasks[task]] = error
+        return result
+
+    def _parse_tool_objects(self, tools, server_name: Optional[str]) -> Dict[str, dict]:
+        # Convert list of tool objects to {name: {description: ...}}
+        tools_dict = {
+            tool.name: {"description": getattr(tool, "description", "")}
+            for tool in tools
+            if hasattr(tool, "name")
+        }
+        return self._parse_tools(tools_dict, server_name)
+
     def close(self) -> None:
-        """Close the connection to the server."""
-        if self._process:
-            self._process.terminate()
-            self._process = None
+        """Close the connection to the server.
 
-    def _parse_tools(self, tools_data: dict) -> Dict[str, dict]:
-        """Parse and validate the tools data from the server."""
-        if not isinstance(tools_data, dict):
-            raise RailLockError("Invalid tools data format")
+        Sessions in a pool owned by this client are asked to shut down; use
+        aclose() from async code to wait for them. A pool used through the
+        synchronous API is closed along with its background loop.
+        """
+        if self._config_watcher is not None:
+            self._config_watcher.stop()
+            self._config_watcher = None
+        if self._pool_loop is not None:
+            # The pool's sessions live on this loop and cannot outlive it
+            self._pool_loop.run(self._session_pool.aclose())
+            self._pool_loop.close()
+            self._pool_loop = None
+        elif self._owns_session_pool and self._session_pool is not None:
+            self._session_pool.close_nowait()
+        if self._owns_http_session and self._http_session is not None:
+            self._http_session.close()
+            self._http_session = None
 
-        parsed_tools = {}
-        for tool_name, tool_info in tools_data.items():
-            if not isinstance(tool_info, dict):
-                continue
+    async def aclose(self) -> None:
+        """Close the client and wait for any owned pooled sessions to shut down."""
+        if self._owns_session_pool and self._session_pool is not None:
+            await self._session_pool.aclose()
+        self.close()
 
-            if "description" not in tool_info:
-                continue
+    def _parse_tools(
+        self, tools_data: dict, server_name: Optional[str] = None
+    ) -> Dict[str, dict]:
+        """Parse and validate the tools data from the server.
 
-            parsed_tools[tool_name] = {
-                "description": tool_info["description"],
-                "checksum": self._calculate_checksum(
-                    tool_name, tool_info["description"]
-                ),
-            }
+        Checksums use server_name, or the connected server's name if not given.
+        """
+        if server_name is None:
+            server_name = self._server_name
+        if not isinstance(tools_data, dict):
+            raise RailLockError("Invalid tools data format")
 
-        return parsed_tools
+        valid_tools = [
+            (tool_name, tool_info["description"])
+            for tool_name, tool_info in tools_data.items()
+            if isinstance(tool_info, dict) and "description" in tool_info
+        ]
+        checksums = calculate_tool_checksums(valid_tools, server_name, cache=True)
+
+        return {
+            tool_name: {"description": description, "checksum": checksum}
+            for (tool_name, description), checksum in zip(valid_tools, checksums)
+        }
 
     def _is_tool_allowed(self, tool_name: str, tool_data: dict) -> bool:
-        if tool_name not in self.config.allowed_tools:
-            return False
-        allowed_val = self.config.allowed_tools[tool_name]
-        if isinstance(allowed_val, dict):
-            expected_checksum = allowed_val["checksum"]
-            server_name = allowed_val.get("server", self._server_name)
-        else:
-            expected_checksum = allowed_val
-            server_name = self._server_name
-        actual_checksum = calculate_tool_checksum(
-            tool_name, tool_data["description"], server_name
-        )
-        return actual_checksum == expected_checksum
+        return self.policy.is_allowed(tool_name, tool_data["description"])
 
     def _calculate_checksum(self, tool_name: str, description: str) -> str:
         """Calculate the checksum for a tool."""
-        return calculate_tool_checksum(tool_name, description, self._server_name)
-
-    def filter_tools(self, tools):
-        allowed = set(self.config.allowed_tools)
-        malicious = set(self.config.malicious_tools)
-        denied = set(self.config.denied_tools)
-        filtered = []
-        for tool in tools:
-            name = getattr(tool, "name", None)
-            desc = getattr(tool, "description", "")
-            checksum = getattr(tool, "checksum", "")
-            is_allowed = name in allowed
-            is_malicious = name in malicious
-            is_denied = name in denied
-            checksum_ok = self._is_tool_allowed(
-                name, {"description": desc, "checksum": checksum}
-            )
-            if is_allowed and not is_malicious and not is_denied and checksum_ok:
-                filtered.append(tool)
-        return filtered
+        return cached_tool_checksum(tool_name, description, self._server_name)
+
+    def filter_tools(
+        self,
+        tools,
+        server_name: Optional[str] = None,
+        policy: Optional[CompiledPolicy] = None,
+    ):
+        """Return the tools allowed by the policy, in order.
+
+        server_name selects the server whose policy applies, defaulting to the
+        connected server; use it to filter the per-server lists of connect_many.
+        A caller that records decisions can pass the policy it read from
+        policy_for(), so that a concurrent swap_config() cannot change the
+        policy between filtering and recording.
+
+        Decisions are cached against a fingerprint of the tool names and
+        descriptions, so a repeated identical manifest skips validation. Cached
+        decisions are ignored once the compiled policy changes. A manifest not
+        seen by this client is looked up as a whole, by its digest, in the
+        decision cache when one was given.
+        """
+        if policy is not None:
+            server_name = policy.server_name
+        else:
+            if server_name is None:
+                server_name = self._server_name
+            policy = self.policy_for(server_name)
+        tools = list(tools)
+        if not self._filter_cache_size:
+            return [tools[index] for index in self._allowed_indices(policy, tools)]
+        key = (server_name, tools_fingerprint(tools))
+        cached = self._filter_cache.get(key)
+        if cached is not None and cached[0] is policy:
+            indices = cached[1]
+        else:
+            indices = self._allowed_indices(policy, tools)
+            with self._filter_lock:
+                filter_cache = self._filter_cache
+                if key not in filter_cache:
+                    if len(filter_cache) >= self._filter_cache_size:
+                        filter_cache.pop(next(iter(filter_cache)), None)
+                filter_cache[key] = (policy, indices)
+        return [tools[index] for index in indices]
+
+    def _allowed_indices(self, policy: CompiledPolicy, tools: list) -> tuple:
+        if self._decision_cache is None:
+            return policy.allowed_indices(tools)
+        return self._decision_cache.allowed_indices(policy, tools)
+
+    def test_server(
+        self, server_url: str, timeout: int = 5, prefetch: bool = False
+    ) -> bool:
+        """Test if the server is up and running before connecting.
 
-    def test_server(self, server_url: str, timeout: int = 5) -> bool:
-        """Test if the server is up and running before connecting."""
+        With prefetch=True an HTTP server is checked with a GET instead of a HEAD,
+        and the response is kept so that an immediately following connect() to
+        the same URL does not need a second round-trip. The response is only
+        reused for PREFETCH_MAX_AGE seconds, and the next connect drops it. Do not prefetch SSE
+        endpoints, whose GET response never ends.
+        """
         if server_url.startswith("stdio:"):
             import shutil
 
@@ -193,24 +595,29 @@ class RailLockClient:
                 raise RailLockError(f"STDIO server executable not found: {cmd}")
             return True
         else:
-            from urllib.parse import urlparse
-            import requests
-
             parsed_url = urlparse(server_url)
             if parsed_url.scheme not in ["http", "https"]:
                 raise RailLockError(f"Invalid server URL scheme: {parsed_url.scheme}")
+            from requests.exceptions import RequestException
+
+            http = self.http_session
             try:
-                # Try HEAD first, fallback to GET if not supported
-                try:
-                    resp = requests.head(server_url, timeout=timeout)
-                    if resp.status_code == 405:
-                        resp = requests.get(server_url, timeout=timeout)
-                except requests.RequestException:
-                    resp = requests.get(server_url, timeout=timeout)
+                if prefetch:
+                    resp = http.get(server_url, timeout=timeout)
+                else:
+                    # Try HEAD first, fallback to GET if not supported
+                    try:
+                        resp = http.head(server_url, timeout=timeout)
+                        if resp.status_code == 405:
+                            resp = http.get(server_url, timeout=timeout)
+                    except RequestException:
+                        resp = http.get(server_url, timeout=timeout)
                 if resp.status_code >= 400:
                     raise RailLockError(
                         f"Server responded with error code: {resp.status_code}"
                     )
+                if prefetch:
+                    self._prefetched = (server_url, resp, time.monotonic())
                 return True
-            except requests.RequestException as e:
+            except RequestException as e:
                 raise RailLockError(f"Failed to reach server: {e}")
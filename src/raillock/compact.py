@@ -0,0 +1,178 @@
+"""
+CompactConfig - Memory-lean runtime form of a RailLockConfig.
+
+Enforcement only needs each tool's name, checksum and server binding, so a
+CompactConfig keeps one slotted ToolRule per tool with the checksum stored as
+its 32 raw digest bytes, and interns names and server names so repeated
+strings are shared. Descriptions are dropped and read back from the source
+file when a review or compare view asks for them.
+"""
+
+import sys
+from typing import Callable, Dict, Optional, Union
+
+from .config import RailLockConfig
+
+SECTIONS = ("allowed_tools", "malicious_tools", "denied_tools")
+_DIGEST_HEX_LENGTH = 64
+
+
+def encode_checksum(checksum) -> Optional[Union[bytes, str]]:
+    """Return a SHA-256 hex checksum as raw bytes; other values are interned as is.
+
+    Wildcards ("*") and checksums that are not SHA-256 hex digests keep their
+    string form, so any config value survives a round trip.
+    """
+    if checksum is None or isinstance(checksum, bytes):
+        return checksum
+    checksum = str(checksum)
+    if len(checksum) == _DIGEST_HEX_LENGTH:
+        try:
+            digest = bytes.fromhex(checksum)
+        except ValueError:
+            pass
+        else:
+            # Upper-case hex would not match hexdigest() output, keep it verbatim
+            if digest.hex() == checksum:
+                return digest
+    return sys.intern(checksum)
+
+
+def decode_checksum(checksum) -> Optional[str]:
+    """Return the hex string form of a checksum from encode_checksum."""
+    if isinstance(checksum, bytes):
+        return checksum.hex()
+    return checksum
+
+
+def checksum_matches(expected, actual: str) -> bool:
+    """Compare an expected checksum (raw digest or string) to a hex checksum."""
+    if expected.__class__ is bytes:
+        return bytes.fromhex(actual) == expected
+    return expected == actual
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class ToolRule:
+    """Checksum and server binding of one tool in a CompactConfig."""
+
+    __slots__ = ("checksum", "server")
+
+    def __init__(self, checksum=None, server: Optional[str] = None):
+        self.checksum = encode_checksum(checksum)
+        self.server = _intern(server)
+
+    @classmethod
+    def from_entry(cls, entry) -> "ToolRule":
+        """Build a rule from a config value: a mapping or a bare checksum."""
+        if isinstance(entry, dict):
+            return cls(entry.get("checksum"), entry.get("server"))
+        return cls(entry)
+
+    @property
+    def hex_checksum(self) -> Optional[str]:
+        return decode_checksum(self.checksum)
+
+    def __eq__(self, other):
+        if not isinstance(other, ToolRule):
+            return NotImplemented
+        return (self.checksum, self.server) == (other.checksum, other.server)
+
+    def __repr__(self):
+        return f"ToolRule(checksum={self.hex_checksum!r}, server={self.server!r})"
+
+
+class CompactConfig:
+    """RailLockConfig replacement that holds only what enforcement needs.
+
+    allowed_tools, malicious_tools and denied_tools map interned tool names to
+    ToolRule records. It can be passed anywhere a RailLockClient takes a config.
+    Descriptions are not kept; descriptions() and to_config() read them from
+    the file the config was loaded from.
+    """
+
+    __slots__ = ("allowed_tools", "malicious_tools", "denied_tools", "_loader")
+
+    def __init__(
+        self,
+        allowed_tools: Optional[Dict[str, ToolRule]] = None,
+        malicious_tools: Optional[Dict[str, ToolRule]] = None,
+        denied_tools: Optional[Dict[str, ToolRule]] = None,
+        loader: Optional[Callable[[], RailLockConfig]] = None,
+    ):
+        self.allowed_tools = allowed_tools or {}
+        self.malicious_tools = malicious_tools or {}
+        self.denied_tools = denied_tools or {}
+        self._loader = loader
+
+    @classmethod
+    def from_config(
+        cls,
+        config: RailLockConfig,
+        loader: Optional[Callable[[], RailLockConfig]] = None,
+    ) -> "CompactConfig":
+        """Compact config; loader, if given, reloads the full config on demand."""
+        sections = [
+            {
+                sys.intern(name): ToolRule.from_entry(entry)
+                for name, entry in getattr(config, section).items()
+            }
+            for section in SECTIONS
+        ]
+        return cls(*sections, loader=loader)
+
+    @classmethod
+    def from_file(
+        cls, config_path: str, cache_dir: Optional[str] = None
+    ) -> "CompactConfig":
+        """Load and validate a YAML config file, keeping only the compact form."""
+
+        def loader():
+            return RailLockConfig.from_file(config_path, cache_dir=cache_dir)
+
+        return cls.from_config(loader(), loader=loader)
+
+    def __len__(self) -> int:
+        return sum(len(getattr(self, section)) for section in SECTIONS)
+
+    @property
+    def has_descriptions(self) -> bool:
+        """True if descriptions can be loaded on demand."""
+        return self._loader is not None
+
+    def to_config(self) -> RailLockConfig:
+        """Return the full RailLockConfig, with descriptions, for review and compare.
+
+        The source file is read again, so edits made since this config was
+        loaded are included. Without a source, the entries are rebuilt from
+        the compact records and have no description.
+        """
+        if self._loader is not None:
+            return self._loader()
+        sections = []
+        for section in SECTIONS:
+            entries = {}
+            for name, rule in getattr(self, section).items():
+                entry = {}
+                if rule.checksum is not None:
+                    entry["checksum"] = rule.hex_checksum
+                if rule.server is not None:
+                    entry["server"] = rule.server
+                entries[name] = entry
+            sections.append(entries)
+        return RailLockConfig(*sections)
+
+    def descriptions(self, section: str = "allowed_tools") -> Dict[str, str]:
+        """Load the descriptions of one section's tools, keyed by tool name."""
+        if section not in SECTIONS:
+            raise ValueError(f"Unknown config section: {section}")
+        if self._loader is None:
+            return {}
+        return {
+            name: entry.get("description", "")
+            for name, entry in getattr(self.to_config(), section).items()
+            if isinstance(entry, dict)
+        }
@@ -2,10 +2,12 @@
 RailLockConfig - Configuration management for tool validation.
 """
 
-import yaml
+import hashlib
 from pathlib import Path
 from typing import Dict, Optional
-from raillock.utils import debug_print
+from raillock.config_cache import ConfigCache, cache_dir_from_env, yaml_safe_load
+from raillock.patterns import is_pattern
+from raillock.utils import debug_log, debug_print, is_debug_enabled
 
 
 class RailLockConfig:
@@ -18,27 +20,52 @@ class RailLockConfig:
         self.denied_tools = denied_tools or {}
 
     @classmethod
-    def from_file(cls, config_path: str) -> "RailLockConfig":
-        """Load configuration from a YAML file."""
-        debug_print(f"Loading RailLockConfig from: {config_path}")
+    def from_file(
+        cls, config_path: str, cache_dir: Optional[str] = None
+    ) -> "RailLockConfig":
+        """Load configuration from a YAML file.
+
+        If cache_dir is given (or RAILLOCK_CONFIG_CACHE is set), the validated
+        configuration is cached there and later loads of the unchanged file
+        skip YAML parsing and validation.
+        """
+        debug_log("Loading RailLockConfig from: %s", config_path)
         path = Path(config_path)
         if not path.exists():
             raise FileNotFoundError(f"Configuration file not found: {config_path}")
 
-        try:
-            with open(path, "r") as f:
-                config_data = yaml.safe_load(f)
-        except yaml.YAMLError:
-            raise ValueError(f"Invalid YAML in configuration file: {config_path}")
+        if cache_dir is None:
+            cache_dir = cache_dir_from_env()
+        stat = path.stat()
+        data = path.read_bytes()
+        config_data = None
+        if cache_dir:
+            cache = ConfigCache(cache_dir)
+            cache_path = str(path.resolve())
+            digest = hashlib.sha256(data).hexdigest()
+            config_data = cache.get(cache_path, stat, digest)
+            if config_data is not None:
+                debug_log("Loaded %s from the config cache", config_path)
+
+        if config_data is None:
+            import yaml
+
+            try:
+                config_data = yaml_safe_load(data)
+            except yaml.YAMLError:
+                raise ValueError(f"Invalid YAML in configuration file: {config_path}")
 
-        validate_config_dict(config_data)
+            validate_config_dict(config_data)
+            if cache_dir:
+                cache.put(cache_path, stat, digest, config_data)
 
         allowed_tools = config_data.get("allowed_tools", {})
         malicious_tools = config_data.get("malicious_tools", {})
         denied_tools = config_data.get("denied_tools", {})
-        debug_print(f"Allowed tools: {list(allowed_tools.keys())}")
-        debug_print(f"Malicious tools: {list(malicious_tools.keys())}")
-        debug_print(f"Denied tools: {list(denied_tools.keys())}")
+        if is_debug_enabled():
+            debug_print(f"Allowed tools: {list(allowed_tools.keys())}")
+            debug_print(f"Malicious tools: {list(malicious_tools.keys())}")
+            debug_print(f"Denied tools: {list(denied_tools.keys())}")
         return cls(allowed_tools, malicious_tools, denied_tools)
 
 
@@ -61,7 +88,13 @@ def validate_config_dict(config_data):
                 raise ValueError(
                     f"Tool '{tool_name}' in section '{section}' must be a mapping/object"
                 )
-            if section != "denied_tools":
+            if is_pattern(tool_name):
+                # Patterns match many tools, so only allowed ones need a checksum ("*")
+                if section == "allowed_tools" and "checksum" not in tool_entry:
+                    raise ValueError(
+                        f"Tool pattern '{tool_name}' in section '{section}' must have 'checksum'"
+                    )
+            elif section != "denied_tools":
                 if "description" not in tool_entry or "checksum" not in tool_entry:
                     raise ValueError(
                         f"Tool '{tool_name}' in section '{section}' must have 'description' and 'checksum'"
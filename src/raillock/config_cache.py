@@ -0,0 +1,118 @@
+"""
+On-disk cache of validated RailLock configurations.
+
+Parsing and validating a large YAML policy dominates the start-up of
+short-lived processes. Once a file has been loaded, its validated sections are
+written as JSON to a cache directory; later loads of the same file read that
+instead, as long as the file's path, mtime, size and content hash still match.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Optional
+
+from raillock.utils import debug_log
+
+CACHE_ENV_VAR = "RAILLOCK_CONFIG_CACHE"
+# Bump when validation or the cached layout changes so old entries are ignored
+CACHE_FORMAT = 1
+SECTIONS = ("allowed_tools", "malicious_tools", "denied_tools")
+
+
+def yaml_safe_load(data):
+    """Parse YAML with the libyaml-backed loader when PyYAML was built with it."""
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(data, Loader=loader)
+
+
+def default_cache_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "raillock", "configs")
+
+
+def cache_dir_from_env() -> Optional[str]:
+    """Return the cache directory requested through RAILLOCK_CONFIG_CACHE, if any."""
+    value = os.environ.get(CACHE_ENV_VAR, "").strip()
+    if value.lower() in ("", "0", "false", "no", "off"):
+        return None
+    if value.lower() in ("1", "true", "yes", "on"):
+        return default_cache_dir()
+    return value
+
+
+class ConfigCache:
+    """Validated configuration sections stored as one JSON file per config path."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _entry_path(self, path: str) -> str:
+        name = hashlib.sha256(path.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{name}.json")
+
+    @staticmethod
+    def _key(path: str, stat: os.stat_result, digest: str) -> dict:
+        return {
+            "format": CACHE_FORMAT,
+            "path": path,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": digest,
+        }
+
+    def get(self, path: str, stat: os.stat_result, digest: str) -> Optional[dict]:
+        """Return the cached sections for this version of path, or None."""
+        try:
+            with open(self._entry_path(path), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("key") != self._key(
+            path, stat, digest
+        ):
+            return None
+        sections = entry.get("config")
+        if not isinstance(sections, dict) or any(
+            not isinstance(sections.get(section), dict) for section in SECTIONS
+        ):
+            return None
+        return sections
+
+    def put(
+        self, path: str, stat: os.stat_result, digest: str, config_data: dict
+    ) -> bool:
+        """Store the validated sections of path; return False if they were not cached."""
+        entry = {
+            "key": self._key(path, stat, digest),
+            "config": {section: config_data[section] for section in SECTIONS},
+        }
+        try:
+            payload = json.dumps(entry, ensure_ascii=False, allow_nan=False)
+        except (TypeError, ValueError):
+            # Values JSON cannot represent (dates, non-string keys) would not
+            # come back unchanged, so such configs are always parsed from YAML.
+            debug_log("Config %s cannot be cached as JSON", path)
+            return False
+        if json.loads(payload)["config"] != entry["config"]:
+            debug_log("Config %s does not round-trip through JSON", path)
+            return False
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(payload)
+                os.replace(tmp_path, self._entry_path(path))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            debug_log("Could not write config cache for %s: %s", path, e)
+            return False
+        return True
@@ -21,7 +21,7 @@ def build_config_dict(
     Returns:
         Configuration dictionary ready for YAML serialization
     """
-    from raillock.utils import calculate_tool_checksum
+    from raillock.utils import calculate_tool_checksums
 
     config_dict = {
         "config_version": 1,
@@ -34,25 +34,28 @@ def build_config_dict(
         "denied_tools": {},
     }
 
+    chosen = []
     for tool in tools:
         # Handle both dict and object formats
         name, desc = extract_tool_info(tool)
-
-        choice = choices.get(name)
-        if choice:
-            checksum = calculate_tool_checksum(name, desc, server_name)
-            tool_entry = {
-                "description": desc,
-                "server": server_name,
-                "checksum": checksum,
-            }
-
-            if choice == "allow":
-                config_dict["allowed_tools"][name] = tool_entry
-            elif choice == "malicious":
-                config_dict["malicious_tools"][name] = tool_entry
-            elif choice == "deny":
-                config_dict["denied_tools"][name] = tool_entry
+        if choices.get(name):
+            chosen.append((name, desc))
+
+    checksums = calculate_tool_checksums(chosen, server_name)
+    for (name, desc), checksum in zip(chosen, checksums):
+        choice = choices[name]
+        tool_entry = {
+            "description": desc,
+            "server": server_name,
+            "checksum": checksum,
+        }
+
+        if choice == "allow":
+            config_dict["allowed_tools"][name] = tool_entry
+        elif choice == "malicious":
+            config_dict["malicious_tools"][name] = tool_entry
+        elif choice == "deny":
+            config_dict["denied_tools"][name] = tool_entry
 
     # Dedent all descriptions before writing
     for section in ("allowed_tools", "malicious_tools", "denied_tools"):
@@ -110,6 +113,11 @@ def config_dict_to_yaml_string(config_dict: Dict[str, Any]) -> str:
 def compare_config_with_server(config_data: dict, server_tools: dict) -> tuple:
     """Compare a configuration with server tools and return comparison data and summary.
 
+    Tools are matched to rules the same way filter_tools enforces them: exact
+    names before glob patterns, denied and malicious rules before allowed ones,
+    and a ``"*"`` checksum accepting any description. Each row's ``pattern``
+    is the glob pattern that decided the tool, or None for an exact name.
+
     Args:
         config_data: Parsed configuration dictionary
         server_tools: Dictionary of server tools with checksums
@@ -117,67 +125,58 @@ def compare_config_with_server(config_data: dict, server_tools: dict) -> tuple:
     Returns:
         Tuple of (comparison_data, summary)
     """
+    from raillock.compact import checksum_matches
+    from raillock.config import RailLockConfig
+    from raillock.patterns import ANY_CHECKSUM, is_pattern
+    from raillock.policy import CompiledPolicy
+
     # Extract config sections
     allowed_tools = config_data.get("allowed_tools", {})
     malicious_tools = config_data.get("malicious_tools", {})
     denied_tools = config_data.get("denied_tools", {})
-
-    # Get all unique tool names
-    all_tool_names = (
-        set(server_tools.keys())
-        | set(allowed_tools.keys())
-        | set(malicious_tools.keys())
-        | set(denied_tools.keys())
+    policy = CompiledPolicy(
+        RailLockConfig(allowed_tools, malicious_tools, denied_tools)
     )
 
+    # Get all unique tool names; pattern rules are reported on the tools they match
+    all_tool_names = set(server_tools.keys()) | {
+        name
+        for section in (allowed_tools, malicious_tools, denied_tools)
+        for name in section
+        if not is_pattern(name)
+    }
+
     # Perform comparison
     comparison_data = []
 
     for tool in sorted(all_tool_names):
         on_server = tool in server_tools
-        allowed = tool in allowed_tools
+        allowed_rule = policy.allowed_rule(tool)
+        blocked_rule = policy.blocked_rule(tool)
+        allowed = allowed_rule is not None
 
-        # Check for malicious and denied by name+checksum
         is_malicious = False
         is_denied = False
         name_in_section = False
         checksum_match = False
 
-        if tool in malicious_tools and on_server:
+        # A denied or malicious rule blocks the tool by name, whatever its
+        # description; an exact entry's checksum only fills the checksum column
+        if on_server and blocked_rule is not None:
             name_in_section = True
-            mal_entry = malicious_tools[tool]
-            if isinstance(mal_entry, dict) and "checksum" in mal_entry:
-                if server_tools[tool]["checksum"] == mal_entry["checksum"]:
-                    is_malicious = True
-                    checksum_match = True
-                else:
-                    checksum_match = False
-
-        if tool in denied_tools and on_server:
+            is_malicious = blocked_rule in malicious_tools
+            is_denied = not is_malicious
+            section = malicious_tools if is_malicious else denied_tools
+            entry = section.get(tool)
+            if isinstance(entry, dict) and "checksum" in entry:
+                checksum_match = server_tools[tool]["checksum"] == entry["checksum"]
+
+        if allowed and on_server:
             name_in_section = True
-            den_entry = denied_tools[tool]
-            if isinstance(den_entry, dict) and "checksum" in den_entry:
-                if server_tools[tool]["checksum"] == den_entry["checksum"]:
-                    is_denied = True
-                    checksum_match = True
-                else:
-                    checksum_match = False
-
-        if allowed:
-            allowed_val = allowed_tools[tool]
-            allowed_checksum = None
-            if isinstance(allowed_val, dict):
-                if "checksum" in allowed_val:
-                    allowed_checksum = allowed_val["checksum"]
-            elif isinstance(allowed_val, str):
-                allowed_checksum = allowed_val
-
-            if on_server and allowed_checksum is not None:
-                if server_tools[tool]["checksum"] == allowed_checksum:
-                    checksum_match = True
-                else:
-                    checksum_match = False
-                name_in_section = True
+            allowed_checksum, _ = policy.allowed_entry(tool)
+            checksum_match = allowed_checksum == ANY_CHECKSUM or checksum_matches(
+                allowed_checksum, server_tools[tool]["checksum"]
+            )
 
         # Determine tool type
         tool_type = (
@@ -198,11 +197,14 @@ def compare_config_with_server(config_data: dict, server_tools: dict) -> tuple:
             )
         )
 
+        rule = allowed_rule if allowed else blocked_rule
+        pattern = rule if rule is not None and rule != tool else None
+
         # Get description
         desc = ""
         if on_server:
             desc = server_tools[tool]["description"]
-        elif allowed and isinstance(allowed_tools[tool], dict):
+        elif tool in allowed_tools and isinstance(allowed_tools[tool], dict):
             desc = allowed_tools[tool].get("description", "")
 
         comparison_data.append(
@@ -212,6 +214,7 @@ def compare_config_with_server(config_data: dict, server_tools: dict) -> tuple:
                 "allowed": allowed,
                 "checksum_match": checksum_match,
                 "type": tool_type,
+                "pattern": pattern,
                 "description": desc,
             }
         )
@@ -0,0 +1,233 @@
+"""
+ConfigWatcher - Reload a RailLock config file when it changes on disk.
+
+A background thread waits for changes to the file, using inotify on Linux and
+polling the file's mtime elsewhere. A directory of per-server config files is
+watched as a whole: adding, removing or editing any config file in it reloads.
+Each change is parsed and validated off the caller's threads, and only a config
+that loaded cleanly is handed on, so a half-written or invalid edit never
+replaces a working policy.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import sys
+import threading
+from typing import Callable, Optional
+
+from .config import RailLockConfig
+from .multi_config import CONFIG_SUFFIXES
+from .utils import debug_log
+
+DEFAULT_POLL_INTERVAL = 1.0
+# How long to wait after an inotify event for the rest of an edit to land
+SETTLE_DELAY = 0.05
+
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+# Watching the directory catches editors that save by renaming a temp file
+_IN_DIR_EVENTS = (
+    0x00000002  # IN_MODIFY
+    | 0x00000004  # IN_ATTRIB
+    | 0x00000008  # IN_CLOSE_WRITE
+    | 0x00000040  # IN_MOVED_FROM
+    | 0x00000080  # IN_MOVED_TO
+    | 0x00000100  # IN_CREATE
+    | 0x00000200  # IN_DELETE
+)
+
+
+def _file_signature(path: str) -> Optional[tuple]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _directory_signature(path: str) -> Optional[tuple]:
+    try:
+        entries = sorted(os.listdir(path))
+    except OSError:
+        return None
+    return tuple(
+        (entry, _file_signature(os.path.join(path, entry)))
+        for entry in entries
+        if entry.endswith(CONFIG_SUFFIXES)
+    )
+
+
+class _Inotify:
+    """Minimal inotify watch on one directory through libc."""
+
+    def __init__(self, directory: str):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), _IN_DIR_EVENTS) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f"inotify_add_watch failed for {directory}")
+        # Written to by wake() so that stop() does not wait out a select()
+        self._wake_read, self._wake_write = os.pipe()
+
+    def wait(self, timeout: float) -> bool:
+        """Return True if any event arrived within timeout, draining the queue."""
+        ready, _, _ = select.select([self.fd, self._wake_read], [], [], timeout)
+        if self.fd not in ready:
+            return False
+        while True:
+            try:
+                if not os.read(self.fd, 65536):
+                    break
+            except OSError as e:
+                if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    break
+                raise
+        return True
+
+    def wake(self) -> None:
+        os.write(self._wake_write, b"x")
+
+    def close(self) -> None:
+        for fd in (self.fd, self._wake_read, self._wake_write):
+            os.close(fd)
+
+
+def _open_inotify(directory: str) -> Optional[_Inotify]:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return _Inotify(directory)
+    except (OSError, AttributeError) as e:
+        debug_log("inotify unavailable, polling instead: %s", e)
+        return None
+
+
+def _report_error(path: str, error: Exception) -> None:
+    print(
+        f"[RailLock] Keeping the current policy; failed to reload {path}: {error}",
+        file=sys.stderr,
+    )
+
+
+class ConfigWatcher:
+    """Watch a config file and call on_change with each new, valid config.
+
+    Each version is loaded with loader(path), by default RailLockConfig.from_file
+    with cache_dir; pass MultiServerConfig.load or CompactConfig.from_file to
+    reload the type in use. path may be a directory of per-server config files.
+    on_change runs on the watcher thread. Errors from loading the file are passed
+    to on_error (by default printed to stderr) and the previous config stays in
+    effect. use_inotify=False forces mtime polling every interval seconds; with
+    inotify the file is still re-checked every interval in case events are lost.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        on_change: Callable[[object], None],
+        interval: float = DEFAULT_POLL_INTERVAL,
+        cache_dir: Optional[str] = None,
+        use_inotify: bool = True,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        loader: Optional[Callable[[str], object]] = None,
+    ):
+        self.path = os.path.abspath(path)
+        self.on_change = on_change
+        self.interval = interval
+        self.cache_dir = cache_dir
+        self.loader = loader
+        self.is_directory = os.path.isdir(self.path)
+        self.use_inotify = use_inotify
+        self.on_error = on_error
+        self.reloads = 0
+        self.last_error: Optional[Exception] = None
+        self.using_inotify = False
+        self._signature = self._current_signature()
+        self._stop = threading.Event()
+        self._stop_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._inotify: Optional[_Inotify] = None
+
+    def start(self) -> "ConfigWatcher":
+        if self._thread is None:
+            if self.use_inotify:
+                directory = self.path
+                if not self.is_directory:
+                    directory = os.path.dirname(directory)
+                self._inotify = _open_inotify(directory)
+            self.using_inotify = self._inotify is not None
+            self._thread = threading.Thread(
+                target=self._run,
+                name=f"raillock-config-watcher:{os.path.basename(self.path)}",
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        with self._stop_lock:
+            self._stop.set()
+            inotify = self._inotify
+            if inotify is not None:
+                inotify.wake()
+            thread = self._thread
+            if thread is not None and thread is not threading.current_thread():
+                thread.join(timeout)
+                if thread.is_alive():
+                    return
+            # The thread never touches the descriptors again once stopped
+            if inotify is not None:
+                self._inotify = None
+                inotify.close()
+
+    def __enter__(self) -> "ConfigWatcher":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def check(self) -> bool:
+        """Reload the file now if it changed; return True if on_change was called."""
+        signature = self._current_signature()
+        if signature is None or signature == self._signature:
+            return False
+        self._signature = signature
+        try:
+            if self.loader is not None:
+                config = self.loader(self.path)
+            else:
+                config = RailLockConfig.from_file(self.path, cache_dir=self.cache_dir)
+            self.on_change(config)
+        except Exception as e:
+            self.last_error = e
+            if self.on_error is not None:
+                self.on_error(e)
+            else:
+                _report_error(self.path, e)
+            return False
+        self.last_error = None
+        self.reloads += 1
+        debug_log("Reloaded config from %s", self.path)
+        return True
+
+    def _current_signature(self) -> Optional[tuple]:
+        if self.is_directory:
+            return _directory_signature(self.path)
+        return _file_signature(self.path)
+
+    def _run(self) -> None:
+        inotify = self._inotify
+        while not self._stop.is_set():
+            if inotify is not None:
+                # Also stat on timeout, in case the filesystem drops events
+                if inotify.wait(self.interval) and self._stop.wait(SETTLE_DELAY):
+                    break
+            elif self._stop.wait(self.interval):
+                break
+            self.check()
@@ -0,0 +1,231 @@
+"""
+DecisionCache - On-disk cache of tool decisions shared across processes.
+
+A fresh agent process hashes and validates every tool of every server it
+connects to, although the process before it made the same decisions a moment
+ago. The decision cache records the outcome for a whole tool list in a SQLite
+database in WAL mode: one row per (policy digest, server, manifest digest),
+holding the positions of the allowed tools. A process that lists the same tools
+again finds them with a single primary-key lookup. WAL lets any number of
+processes read while one writes; writes that cannot get the lock in time are
+skipped, since a missing entry only means the decisions are made again.
+
+The policy digest covers every rule of the compiled policy, so editing the
+config or replacing the blocklist starts a fresh set of entries and never
+reuses a stale decision. Once the database holds more than max_entries tool
+lists, the oldest are evicted.
+"""
+
+import hashlib
+import os
+import sqlite3
+import struct
+import threading
+import time
+from typing import Iterable, Optional
+
+from .utils import debug_log
+
+DEFAULT_MAX_ENTRIES = 10_000
+# Eviction trims the database to this fraction of max_entries, so that it does
+# not run again on every write once the cache is full
+EVICTION_TARGET = 0.9
+# The entry count is tracked per connection and read from the database again
+# after this many writes, to account for rows written by other processes
+RECOUNT_INTERVAL = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS manifests (
+    policy BLOB NOT NULL,
+    server TEXT NOT NULL,
+    manifest BLOB NOT NULL,
+    allowed BLOB NOT NULL,
+    created INTEGER NOT NULL,
+    PRIMARY KEY (policy, server, manifest)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS manifests_created ON manifests (created);
+"""
+
+_LENGTH = struct.Struct("<Q")
+
+
+def manifest_digest(tools) -> Optional[bytes]:
+    """Digest of a tool list by names and descriptions, in order.
+
+    Hashes the same fields as policy.tools_fingerprint(), streamed so that no
+    key is built. Returns None if a name or description is not a string.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    update = h.update
+    pack = _LENGTH.pack
+    for tool in tools:
+        name = getattr(tool, "name", None)
+        description = getattr(tool, "description", "")
+        if name.__class__ is not str or description.__class__ is not str:
+            return None
+        # Length prefixes keep ("ab", "c") and ("a", "bc") apart
+        name = name.encode("utf-8")
+        description = description.encode("utf-8")
+        update(pack(len(name)))
+        update(name)
+        update(pack(len(description)))
+        update(description)
+    return h.digest()
+
+
+def _pack_indices(indices: Iterable[int]) -> bytes:
+    indices = tuple(indices)
+    return struct.pack(f"<{len(indices)}I", *indices)
+
+
+def _unpack_indices(data: bytes) -> tuple:
+    return struct.unpack(f"<{len(data) // 4}I", data)
+
+
+class DecisionCache:
+    """Persistent (policy, server, tool list) -> allowed positions cache.
+
+    One instance can be shared by several clients and threads. Opening the
+    database raises sqlite3.Error if it cannot be created; after that, database
+    errors are logged and the decisions are made without the cache.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        timeout: float = 1.0,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # Estimated number of rows; None until first read from the database
+        self._count: Optional[int] = None
+        self._writes = 0
+        self._connection = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        try:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(_SCHEMA)
+        except BaseException:
+            self._connection.close()
+            raise
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM manifests"
+            ).fetchone()[0]
+
+    def lookup(
+        self, policy_digest: bytes, server: str, manifest: bytes
+    ) -> Optional[tuple]:
+        """Return the cached allowed positions for a tool list, or None."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT allowed FROM manifests"
+                " WHERE policy = ? AND server = ? AND manifest = ?",
+                (policy_digest, server, manifest),
+            ).fetchone()
+        return None if row is None else _unpack_indices(row[0])
+
+    def store(
+        self,
+        policy_digest: bytes,
+        server: str,
+        manifest: bytes,
+        indices: Iterable[int],
+    ) -> None:
+        """Record the allowed positions for a tool list."""
+        row = (policy_digest, server, manifest, _pack_indices(indices), time.time_ns())
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO manifests VALUES (?, ?, ?, ?, ?)", row
+                )
+                self._evict()
+            except BaseException:
+                self._count = None
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def _evict(self) -> None:
+        # Counting every row on each write would cost more than the write, so
+        # the count is carried forward and only re-read when it may be stale or
+        # says the cache is full. A replaced row overcounts, which is harmless.
+        self._writes += 1
+        count = self._count
+        if count is None or self._writes >= RECOUNT_INTERVAL:
+            count = None
+        else:
+            count += 1
+        if count is None or count > self.max_entries:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM manifests"
+            ).fetchone()
+            self._writes = 0
+        if count > self.max_entries:
+            keep = max(1, int(self.max_entries * EVICTION_TARGET))
+            self._connection.execute(
+                "DELETE FROM manifests WHERE created < ("
+                "SELECT created FROM manifests ORDER BY created DESC LIMIT 1 OFFSET ?)",
+                (keep - 1,),
+            )
+            debug_log("Evicted decisions from %s down to %d entries", self.path, keep)
+            count = keep
+        self._count = count
+
+    def allowed_indices(self, policy, tools) -> tuple:
+        """Return policy.allowed_indices(tools), reusing the cached decisions.
+
+        A tool list seen before under the same policy and server costs one
+        digest of the list and one lookup; otherwise the tools are validated
+        against the policy and the outcome is written back.
+        """
+        policy_digest = policy.digest
+        if policy_digest is None:
+            return policy.allowed_indices(tools)
+        manifest = manifest_digest(tools)
+        if manifest is None:
+            return policy.allowed_indices(tools)
+        server = policy.server_name or ""
+        try:
+            indices = self.lookup(policy_digest, server, manifest)
+        except sqlite3.Error as e:
+            debug_log("Decision cache lookup failed: %s", e)
+            indices = None
+        if indices is not None:
+            self.hits += 1
+            return indices
+
+        self.misses += 1
+        indices = policy.allowed_indices(tools)
+        try:
+            self.store(policy_digest, server, manifest, indices)
+        except sqlite3.Error as e:
+            debug_log("Decision cache write skipped: %s", e)
+        return indices
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM manifests")
+            self._count = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> "DecisionCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -7,3 +7,11 @@ class RailLockError(Exception):
     """Base exception class for raillock errors."""
 
     pass
+
+
+class ToolBlockedError(RailLockError):
+    """Raised when a call is made to a tool that RailLock has not allowed."""
+
+    def __init__(self, tool_name):
+        self.tool_name = tool_name
+        super().__init__(f"Tool '{tool_name}' is not allowed by RailLock")
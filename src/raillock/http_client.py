@@ -0,0 +1,97 @@
+"""
+Shared, connection-pooled HTTP clients used by RailLock's async code paths.
+"""
+
+import asyncio
+import weakref
+from typing import Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_POOL_SIZE = 10
+DEFAULT_RETRIES = 2
+
+# httpx connection pools are bound to the event loop that created them, so keep
+# one shared client per running loop.
+_async_clients = weakref.WeakKeyDictionary()
+_async_limits = httpx.Limits(
+    max_connections=DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections=DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY,
+)
+
+
+def configure_async_http_client(
+    max_connections: Optional[int] = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: Optional[int] = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+) -> None:
+    """Set the pool limits used for shared async clients created after this call."""
+    global _async_limits
+    _async_limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient for the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(limits=_async_limits)
+        _async_clients[loop] = client
+    return client
+
+
+async def aclose_async_http_client() -> None:
+    """Close the shared AsyncClient for the running event loop, if any."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def create_http_session(
+    pool_size: int = DEFAULT_POOL_SIZE,
+    retries: int = DEFAULT_RETRIES,
+    keep_alive: bool = True,
+    read_retries: int = 0,
+) -> requests.Session:
+    """Create a requests.Session with a sized connection pool and retries.
+
+    Only failures to connect are retried by default. A request that was sent
+    and then stalled is not, so a read stall costs the caller's timeout once.
+    A connection attempt that times out is retried, so the worst case for a
+    host that never answers is (retries + 1) times the timeout per request.
+    test_server() may send a HEAD and then a GET, which doubles that bound.
+
+    Args:
+        pool_size: Maximum number of pooled connections per host
+        retries: Number of retries for failed connection attempts
+        keep_alive: Reuse connections between requests (disable to close after each)
+        read_retries: Number of retries for idempotent requests whose response
+            stalled or broke off; each one can add a full read timeout
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(
+            total=retries + read_retries,
+            connect=retries,
+            read=read_retries,
+            status=0,
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
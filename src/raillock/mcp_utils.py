@@ -3,6 +3,7 @@ Utilities for integrating RailLock with MCP ClientSession.
 
 - RailLockSessionWrapper: Use as a drop-in replacement for session to always apply RailLock filtering and custom logic to tool lists.
 - monkeypatch_raillock_tools: Monkeypatches ClientSession.list_tools to always apply RailLock filtering and custom logic globally for that session instance.
+- iter_filtered_tool_pages: Async generator that follows tools/list pagination and filters each page as it arrives.
 
 Choose the approach that best fits your use case:
 - Use RailLockSessionWrapper for explicit, per-instance control.
@@ -10,43 +11,333 @@ Choose the approach that best fits your use case:
 """
 
 import asyncio
-from mcp import ClientSession
+import time
+from typing import Literal, Optional
+from mcp import ClientSession, types
 from mcp.client.sse import sse_client
 import logging
-from raillock.exceptions import RailLockError
+from raillock.exceptions import RailLockError, ToolBlockedError
 from urllib.parse import urlparse
-from raillock.utils import debug_print
+from raillock.metrics import SessionMetrics
+from raillock.profiling import phase, record_phase
+from raillock.utils import (
+    cached_tool_checksum,
+    debug_log,
+    debug_print,
+    is_debug_enabled,
+)
 
 
-def monkeypatch_raillock_tools(session, rail_client):
+class _CursorParams(types.RequestParams):
+    cursor: Optional[str] = None
+
+
+class _ListToolsPageRequest(
+    types.Request[Optional[_CursorParams], Literal["tools/list"]]
+):
+    method: Literal["tools/list"] = "tools/list"
+    params: Optional[_CursorParams] = None
+
+
+async def list_tools_page(session, cursor=None, list_tools=None):
+    """
+    Fetch a single page of tools/list from the server.
+    Args:
+        session: An MCP ClientSession instance.
+        cursor: The nextCursor of the previous page, or None for the first page.
+        list_tools: Callable used for the first page (defaults to session.list_tools).
+    Returns:
+        ListToolsResult: The raw, unfiltered page.
+    """
+    if cursor is None:
+        return await (list_tools or session.list_tools)()
+    request = _ListToolsPageRequest(params=_CursorParams(cursor=cursor))
+    return await session.send_request(request, types.ListToolsResult)
+
+
+async def _follow_cursors(fetch_page):
+    cursor = None
+    seen = set()
+    while True:
+        page = await fetch_page(cursor)
+        yield page
+        cursor = getattr(page, "nextCursor", None)
+        if not cursor:
+            return
+        if cursor in seen:
+            raise RailLockError(f"Server repeated pagination cursor: {cursor}")
+        seen.add(cursor)
+
+
+async def iter_tool_pages(session, list_tools=None):
+    """
+    Yield every page of tools/list, following nextCursor until the server stops returning one.
+    """
+    async for page in _follow_cursors(
+        lambda cursor: list_tools_page(session, cursor, list_tools)
+    ):
+        yield page
+
+
+async def _timed_list_tools_page(session, cursor, list_tools, metrics):
+    start = time.perf_counter()
+    page = await list_tools_page(session, cursor, list_tools)
+    metrics.record_list_tools(time.perf_counter() - start)
+    return page
+
+
+def _filter_page(page, rail_client, source, decisions=None, metrics=None):
+    start = time.perf_counter()
+    # Filter and record with one policy object, even if the config is swapped
+    policy = rail_client.policy
+    tools = rail_client.filter_tools(page.tools, policy=policy)
+    if decisions is not None:
+        decisions.record(policy, page.tools, tools)
+    if is_debug_enabled():
+        debug_print(f"[{source}] Filtered tools: {[tool.name for tool in tools]}")
+    for tool in tools:
+        if not getattr(tool, "description", None):
+            debug_log(
+                "[%s] Injecting default description for tool: %s", source, tool.name
+            )
+            tool.description = "No description provided (client override)"
+    # Tools may be any object with name/description, so skip model validation
+    result = types.ListToolsResult.model_construct(
+        tools=tools,
+        nextCursor=getattr(page, "nextCursor", None),
+        meta=getattr(page, "meta", None),
+    )
+    if metrics is not None:
+        metrics.record_filter(
+            time.perf_counter() - start, len(tools), len(page.tools) - len(tools)
+        )
+    return result
+
+
+async def iter_filtered_tool_pages(session, rail_client, list_tools=None):
+    """
+    Yield each page of tools/list with RailLock filtering applied as it arrives.
+    Only one page is held at a time, so memory stays bounded by the page size
+    rather than by the size of the server's catalog.
+    Args:
+        session: An MCP ClientSession instance (not monkeypatched).
+        rail_client: A RailLockClient instance.
+    """
+    async for page in iter_tool_pages(session, list_tools):
+        yield _filter_page(page, rail_client, "Pages")
+
+
+class ToolListCache:
+    """
+    Filtered tool pages kept locally between list_tools calls.
+
+    Entries are dropped when the server sends notifications/tools/list_changed,
+    when the optional TTL (in seconds) expires, or when the RailLock policy they
+    were filtered with is replaced.
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        if ttl is not None and ttl <= 0:
+            raise ValueError("Tool cache TTL must be positive")
+        self.ttl = ttl
+        self._pages = {}
+
+    def __len__(self):
+        return len(self._pages)
+
+    def get(self, cursor, policy):
+        entry = self._pages.get(cursor)
+        if entry is None:
+            return None
+        page, cached_policy, stored_at = entry
+        if cached_policy is not policy or (
+            self.ttl is not None and time.monotonic() - stored_at >= self.ttl
+        ):
+            del self._pages[cursor]
+            return None
+        return page
+
+    def put(self, cursor, policy, page):
+        self._pages[cursor] = (page, policy, time.monotonic())
+
+    def invalidate(self):
+        """Forget every cached page."""
+        self._pages.clear()
+
+    def watch(self, session):
+        """
+        Invalidate this cache whenever session receives a tools/list_changed notification.
+        Returns False if the session does not expose a notification hook.
+        """
+        return _on_tools_list_changed(session, self.invalidate)
+
+
+class ToolDecisionTable:
+    """
+    Allow/deny decision per tool name, recorded when tool lists are filtered.
+
+    call_tool is checked with a single dict lookup, so enforcement never hashes
+    descriptions on the call path. Only allowed tools are kept, with their
+    checksums rather than their descriptions, so memory grows with the allowed
+    set and not with the server's catalog; any other name is denied. If the
+    client's policy is replaced, an allowed name is re-decided once against the
+    new policy from its checksums.
+    """
+
+    __slots__ = ("_entries",)
+
+    def __init__(self):
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, tool_name):
+        return tool_name in self._entries
+
+    def record(self, policy, listed_tools, allowed_tools):
+        """Record the decisions of a filtered page, made by policy."""
+        entries = self._entries
+        for tool in listed_tools:
+            entries.pop(tool.name, None)
+        for tool in allowed_tools:
+            name = tool.name
+            description = getattr(tool, "description", "")
+            server = policy.allowed_entry(name)[1]
+            entries[name] = (
+                policy,
+                True,
+                server,
+                cached_tool_checksum(name, description, server),
+                cached_tool_checksum(name, description) if server else None,
+            )
+
+    def is_allowed(self, tool_name, policy) -> bool:
+        entry = self._entries.get(tool_name)
+        if entry is None:
+            return False
+        if entry[0] is policy:
+            return entry[1]
+        allowed = policy.allows_checksum(tool_name, *entry[2:])
+        self._entries[tool_name] = (policy, allowed) + entry[2:]
+        return allowed
+
+    def clear(self):
+        """Forget every decision, e.g. because the server's tools changed."""
+        self._entries.clear()
+
+
+def _on_tools_list_changed(session, callback):
+    original = getattr(session, "_received_notification", None)
+    if original is None:
+        return False
+
+    async def received_notification(notification):
+        if isinstance(
+            getattr(notification, "root", notification),
+            types.ToolListChangedNotification,
+        ):
+            debug_log("[RailLock] Server tool list changed")
+            callback()
+        await original(notification)
+
+    session._received_notification = received_notification
+    return True
+
+
+async def _checked_call_tool(
+    call_tool, decisions, rail_client, metrics, source, name, args, kwargs
+):
+    allowed = decisions.is_allowed(name, rail_client.policy)
+    metrics.record_call_decision(allowed)
+    if not allowed:
+        debug_log("[%s] Blocked call to tool: %s", source, name)
+        raise ToolBlockedError(name)
+    start = time.perf_counter()
+    try:
+        return await call_tool(name, *args, **kwargs)
+    finally:
+        metrics.record_call_tool(name, time.perf_counter() - start)
+
+
+async def _cached_page(cache, cursor, rail_client, fetch_filtered_page):
+    if cache is None:
+        return await fetch_filtered_page(cursor)
+    policy = rail_client.policy
+    page = cache.get(cursor, policy)
+    if page is None:
+        page = await fetch_filtered_page(cursor)
+        cache.put(cursor, policy, page)
+    return page
+
+
+def monkeypatch_raillock_tools(
+    session,
+    rail_client,
+    cache_tools: bool = False,
+    cache_ttl: Optional[float] = None,
+    metrics: Optional[SessionMetrics] = None,
+):
     """
     Monkeypatch the session's list_tools method to always apply RailLock filtering and inject default descriptions.
-    After calling this, any call to session.list_tools() will use RailLock logic.
+    After calling this, any call to session.list_tools() will use RailLock logic,
+    and session.call_tool() raises ToolBlockedError for tools that were not
+    allowed when they were listed (tools must be listed before they are called).
+    The patched method accepts an optional cursor and returns a ListToolsResult
+    whose nextCursor is preserved, so callers can keep paging through the server.
     Args:
         session: An MCP ClientSession instance.
         rail_client: A RailLockClient instance.
+        cache_tools: Serve repeated calls from a ToolListCache that is refreshed on
+            notifications/tools/list_changed or when cache_ttl expires.
+        cache_ttl: Optional cache lifetime in seconds (default: until list_changed).
+        metrics: SessionMetrics to record timings into; a new one is created if
+            omitted and is available as session.raillock_metrics.
+    Returns:
+        The ToolListCache in use, or None if caching is disabled.
     """
     original_list_tools = session.list_tools
+    original_call_tool = getattr(session, "call_tool", None)
+    decisions = ToolDecisionTable()
+    _on_tools_list_changed(session, decisions.clear)
+    if metrics is None:
+        metrics = SessionMetrics()
+    cache = None
+    if cache_tools:
+        cache = ToolListCache(cache_ttl)
+        cache.watch(session)
 
-    async def patched_list_tools(*args, **kwargs):
-        response = await original_list_tools(*args, **kwargs)
-        tools = rail_client.filter_tools(response.tools)
-        debug_print(f"[Monkeypatch] Filtered tools: {[tool.name for tool in tools]}")
-        for tool in tools:
-            if not getattr(tool, "description", None):
-                debug_print(
-                    f"[Monkeypatch] Injecting default description for tool: {tool.name}"
-                )
-                tool.description = "No description provided (client override)"
+    async def fetch_filtered_page(cursor):
+        response = await _timed_list_tools_page(
+            session, cursor, original_list_tools, metrics
+        )
+        return _filter_page(response, rail_client, "Monkeypatch", decisions, metrics)
 
-        # Return a response-like object with .tools attribute for compatibility
-        class _FakeResponse:
-            def __init__(self, tools):
-                self.tools = tools
+    async def patched_list_tools(*args, cursor=None, **kwargs):
+        if args or kwargs:
+            response = await original_list_tools(*args, **kwargs)
+            return _filter_page(
+                response, rail_client, "Monkeypatch", decisions, metrics
+            )
+        return await _cached_page(cache, cursor, rail_client, fetch_filtered_page)
 
-        return _FakeResponse(tools)
+    async def patched_call_tool(name, *args, **kwargs):
+        return await _checked_call_tool(
+            original_call_tool,
+            decisions,
+            rail_client,
+            metrics,
+            "Monkeypatch",
+            name,
+            args,
+            kwargs,
+        )
 
+    session.raillock_metrics = metrics
     session.list_tools = patched_list_tools
+    if original_call_tool is not None:
+        session.call_tool = patched_call_tool
+    return cache
 
 
 def get_server_name_from_session(session):
@@ -60,11 +351,17 @@ def get_server_name_from_session(session):
     )
 
 
-async def get_tools_via_sse(server_url):
+async def list_all_tools(session):
+    """Return the unfiltered tools from every page of tools/list."""
+    return [tool async for page in iter_tool_pages(session) for tool in page.tools]
+
+
+async def get_tools_via_sse(server_url, session_pool=None):
     """
     Connect to an MCP SSE server, perform the handshake, and return the list of tools and server name.
     Args:
         server_url (str): The SSE endpoint URL (e.g., http://localhost:8000/sse)
+        session_pool (SessionPool, optional): Reuse a pooled session instead of opening a new one
     Returns:
         tuple: (list of tool objects, server name or None)
     """
@@ -72,12 +369,25 @@ async def get_tools_via_sse(server_url):
         parsed = urlparse(server_url)
         if parsed.scheme not in ("http", "https"):
             raise RailLockError(f"Invalid server URL scheme: {parsed.scheme}")
+        if session_pool is not None:
+            session = await session_pool.get(server_url, sse=True)
+            try:
+                with phase("list_tools"):
+                    tools = await list_all_tools(session)
+            except Exception:
+                await session_pool.discard(server_url, sse=True)
+                raise
+            return tools, get_server_name_from_session(session)
+        started = time.perf_counter()
         async with sse_client(server_url) as streams:
+            record_phase("connect", started)
             async with ClientSession(streams[0], streams[1]) as session:
-                await session.initialize()
-                response = await session.list_tools()
+                with phase("initialize"):
+                    await session.initialize()
+                with phase("list_tools"):
+                    tools = await list_all_tools(session)
                 server_name = get_server_name_from_session(session)
-                return response.tools, server_name
+                return tools, server_name
     except RailLockError:
         raise
     except (OSError, ConnectionRefusedError) as e:
@@ -95,21 +405,68 @@ class RailLockSessionWrapper:
     """
     Wrapper for MCP ClientSession that always applies RailLock filtering and custom logic to tool lists.
     Use as a drop-in replacement for session in your client code.
+
+    Pass cache_tools=True to serve repeated list_tools calls locally until the
+    server sends notifications/tools/list_changed or cache_ttl seconds pass.
+
+    call_tool only forwards calls to tools that were allowed when listed; any
+    other name raises ToolBlockedError.
+
+    Upstream latency, filter time and decision counts are recorded in
+    self.metrics; call self.metrics.snapshot() to read them.
     """
 
-    def __init__(self, session, rail_client):
+    def __init__(
+        self,
+        session,
+        rail_client,
+        cache_tools: bool = False,
+        cache_ttl: Optional[float] = None,
+        metrics: Optional[SessionMetrics] = None,
+    ):
         self.session = session
         self.rail_client = rail_client
+        self.metrics = metrics if metrics is not None else SessionMetrics()
+        self.decisions = ToolDecisionTable()
+        _on_tools_list_changed(session, self.decisions.clear)
+        self.tool_cache = None
+        if cache_tools:
+            self.tool_cache = ToolListCache(cache_ttl)
+            self.tool_cache.watch(session)
 
     async def list_tools(self):
-        response = await self.session.list_tools()
-        tools = self.rail_client.filter_tools(response.tools)
-        debug_print(f"[SessionWrapper] Filtered tools: {[tool.name for tool in tools]}")
-        # Inject a default description if missing
-        for tool in tools:
-            if not getattr(tool, "description", None):
-                debug_print(
-                    f"[SessionWrapper] Injecting default description for tool: {tool.name}"
-                )
-                tool.description = "No description provided (client override)"
-        return tools
+        """Return the filtered tools of the first page."""
+        page = await self.list_tools_page()
+        return page.tools
+
+    async def list_tools_page(self, cursor=None):
+        """Return one filtered page of tools as a ListToolsResult, keeping nextCursor."""
+        return await _cached_page(
+            self.tool_cache, cursor, self.rail_client, self._fetch_filtered_page
+        )
+
+    async def _fetch_filtered_page(self, cursor):
+        response = await _timed_list_tools_page(
+            self.session, cursor, None, self.metrics
+        )
+        return _filter_page(
+            response, self.rail_client, "SessionWrapper", self.decisions, self.metrics
+        )
+
+    async def call_tool(self, name, *args, **kwargs):
+        """Call a tool through the session if RailLock allowed it when listed."""
+        return await _checked_call_tool(
+            self.session.call_tool,
+            self.decisions,
+            self.rail_client,
+            self.metrics,
+            "SessionWrapper",
+            name,
+            args,
+            kwargs,
+        )
+
+    async def iter_tool_pages(self):
+        """Yield filtered pages of tools, following the server's pagination."""
+        async for page in _follow_cursors(self.list_tools_page):
+            yield page
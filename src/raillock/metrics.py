@@ -0,0 +1,157 @@
+"""
+In-process latency histograms and decision counters for RailLock sessions.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Dict, Optional, Sequence
+
+# Upper bounds in seconds, from 50 microseconds to 10 seconds
+DEFAULT_LATENCY_BUCKETS = (
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations in seconds.
+
+    Observing a value is a bisect plus a few additions, so it is cheap enough to
+    sit on every list_tools and call_tool. Quantiles in snapshots are estimated
+    as the upper bound of the bucket that contains them.
+    """
+
+    __slots__ = ("bounds", "_counts", "count", "total", "min", "max", "_lock")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.bounds = tuple(sorted(bounds))
+        self._counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        index = bisect_left(self.bounds, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.total += seconds
+            if self.min is None or seconds < self.min:
+                self.min = seconds
+            if self.max is None or seconds > self.max:
+                self.max = seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Return the bucket upper bound at quantile q (0-1), or None if empty."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self._counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                if index < len(self.bounds):
+                    return min(self.bounds[index], self.max)
+                return self.max
+        return self.max
+
+    def snapshot(self) -> dict:
+        """Return a copy of the histogram as plain data."""
+        with self._lock:
+            counts = list(self._counts)
+            cumulative = 0
+            buckets = {}
+            for bound, bucket_count in zip(self.bounds + (float("inf"),), counts):
+                cumulative += bucket_count
+                buckets[bound] = cumulative
+            return {
+                "count": self.count,
+                "sum": self.total,
+                "min": self.min,
+                "max": self.max,
+                "mean": self.total / self.count if self.count else None,
+                "p50": self.quantile(0.5),
+                "p90": self.quantile(0.9),
+                "p99": self.quantile(0.99),
+                "buckets": buckets,
+            }
+
+
+class SessionMetrics:
+    """Timings and decision counts collected by the RailLock session wrappers.
+
+    Records upstream list_tools latency, the time RailLock spends filtering,
+    call_tool latency per tool, and how many tools were allowed or blocked at
+    list time and at call time. One instance can be shared by several sessions.
+    """
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self._bounds = tuple(bounds)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard everything recorded so far."""
+        self.list_tools_latency = LatencyHistogram(self._bounds)
+        self.filter_latency = LatencyHistogram(self._bounds)
+        self.call_tool_latency: Dict[str, LatencyHistogram] = {}
+        self.counts = {
+            "tools_allowed": 0,
+            "tools_blocked": 0,
+            "calls_allowed": 0,
+            "calls_blocked": 0,
+        }
+
+    def record_list_tools(self, seconds: float) -> None:
+        self.list_tools_latency.observe(seconds)
+
+    def record_filter(self, seconds: float, allowed: int, blocked: int) -> None:
+        self.filter_latency.observe(seconds)
+        with self._lock:
+            self.counts["tools_allowed"] += allowed
+            self.counts["tools_blocked"] += blocked
+
+    def record_call_decision(self, allowed: bool) -> None:
+        with self._lock:
+            self.counts["calls_allowed" if allowed else "calls_blocked"] += 1
+
+    def record_call_tool(self, tool_name: str, seconds: float) -> None:
+        histogram = self.call_tool_latency.get(tool_name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.call_tool_latency.setdefault(
+                    tool_name, LatencyHistogram(self._bounds)
+                )
+        histogram.observe(seconds)
+
+    def snapshot(self) -> dict:
+        """Return all histograms and counters as plain data."""
+        with self._lock:
+            counts = dict(self.counts)
+            call_histograms = dict(self.call_tool_latency)
+        return {
+            "list_tools": self.list_tools_latency.snapshot(),
+            "filter": self.filter_latency.snapshot(),
+            "call_tool": {
+                name: histogram.snapshot()
+                for name, histogram in sorted(call_histograms.items())
+            },
+            "counts": counts,
+        }
@@ -0,0 +1,232 @@
+"""
+MultiServerConfig - Per-server policies from one document or a directory.
+
+A multi-server document holds one ordinary config per server under
+``servers``, keyed by the server name the client connects with:
+
+    config_version: 1
+    servers:
+      http://localhost:8000/sse:
+        allowed_tools: {...}
+        malicious_tools: {...}
+        denied_tools: {...}
+
+A directory holds one ordinary config file per server, such as the files
+written by ``raillock review``; each is indexed by its ``server.name``.
+
+Either way a server's rules are validated and built only when a client first
+asks for that server, and a RailLockClient given a MultiServerConfig compiles
+and consults just the policy of the server it is filtering for.
+"""
+
+import os
+import threading
+from typing import Callable, Dict, Iterable, Optional
+
+from .compact import CompactConfig
+from .config import RailLockConfig, validate_config_dict
+from .config_cache import yaml_safe_load
+from .utils import debug_log
+
+CONFIG_SUFFIXES = (".yaml", ".yml")
+
+
+def read_server_name(path: str) -> Optional[str]:
+    """Return a config file's server.name without loading the whole file.
+
+    YAML events are streamed and the scan stops at server.name, which
+    `raillock review` writes before the tool sections.
+    """
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    # One frame per open collection: [is_mapping, expecting_key, current_key]
+    stack = []
+    with open(path, "rb") as f:
+        for event in yaml.parse(f, Loader=loader):
+            if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+                stack.append([isinstance(event, yaml.MappingStartEvent), True, None])
+            elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                stack.pop()
+                if not stack:
+                    return None
+                stack[-1][1] = True
+            elif isinstance(event, (yaml.ScalarEvent, yaml.AliasEvent)) and stack:
+                frame = stack[-1]
+                if not frame[0]:
+                    continue
+                if frame[1]:
+                    frame[2] = getattr(event, "value", None)
+                    frame[1] = False
+                    continue
+                if (
+                    len(stack) == 2
+                    and stack[0][2] == "server"
+                    and frame[2] == "name"
+                    and isinstance(event, yaml.ScalarEvent)
+                ):
+                    return event.value
+                frame[1] = True
+    return None
+
+
+class MultiServerConfig:
+    """Configs for many servers, loaded the first time each server is used.
+
+    config_for(server_name) returns the config of one server, or an empty
+    config (which allows nothing) for a server that has no rules. With
+    compact=True each server's config is built as a CompactConfig; loaded from
+    a directory, its descriptions are then read from the server's file on demand.
+    """
+
+    def __init__(
+        self,
+        loaders: Dict[str, Callable[[], RailLockConfig]],
+        compact: bool = False,
+    ):
+        self._loaders = dict(loaders)
+        self._configs: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        self.compact = compact
+
+    @classmethod
+    def from_file(cls, config_path: str, compact: bool = False) -> "MultiServerConfig":
+        """Read a multi-server document; each server is validated on first use."""
+        debug_log("Loading multi-server config from: %s", config_path)
+        if not os.path.exists(config_path):
+            raise FileNotFoundError(f"Configuration file not found: {config_path}")
+        import yaml
+
+        try:
+            with open(config_path, "rb") as f:
+                document = yaml_safe_load(f.read())
+        except yaml.YAMLError:
+            raise ValueError(f"Invalid YAML in configuration file: {config_path}")
+        servers = document.get("servers") if isinstance(document, dict) else None
+        if not isinstance(servers, dict):
+            raise ValueError(
+                f"Multi-server configuration must have a 'servers' mapping: {config_path}"
+            )
+
+        def loader(server_name, section):
+            def load():
+                try:
+                    validate_config_dict(section)
+                except ValueError as e:
+                    raise ValueError(f"Server '{server_name}': {e}")
+                return RailLockConfig(
+                    section["allowed_tools"],
+                    section["malicious_tools"],
+                    section["denied_tools"],
+                )
+
+            return load
+
+        return cls(
+            {name: loader(name, section) for name, section in servers.items()},
+            compact=compact,
+        )
+
+    @classmethod
+    def from_directory(
+        cls,
+        directory: str,
+        cache_dir: Optional[str] = None,
+        compact: bool = False,
+    ) -> "MultiServerConfig":
+        """Index the per-server config files in directory by their server.name.
+
+        Only the header of each file is read here; files without a server name
+        are skipped, and two files naming the same server are an error.
+        """
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"Configuration directory not found: {directory}")
+        paths = {}
+        for entry in sorted(os.listdir(directory)):
+            path = os.path.join(directory, entry)
+            if not entry.endswith(CONFIG_SUFFIXES) or not os.path.isfile(path):
+                continue
+            try:
+                server_name = read_server_name(path)
+            except Exception as e:
+                raise ValueError(f"Invalid YAML in configuration file: {path}: {e}")
+            if not isinstance(server_name, str) or not server_name:
+                debug_log("Skipping %s: no server.name", path)
+                continue
+            if server_name in paths:
+                raise ValueError(
+                    f"Server '{server_name}' is configured in both "
+                    f"{paths[server_name]} and {path}"
+                )
+            paths[server_name] = path
+
+        def loader(path):
+            return lambda: RailLockConfig.from_file(path, cache_dir=cache_dir)
+
+        return cls(
+            {name: loader(path) for name, path in paths.items()}, compact=compact
+        )
+
+    @classmethod
+    def load(
+        cls, path: str, cache_dir: Optional[str] = None, compact: bool = False
+    ) -> "MultiServerConfig":
+        """Load a directory of per-server files or a multi-server document."""
+        if os.path.isdir(path):
+            return cls.from_directory(path, cache_dir=cache_dir, compact=compact)
+        return cls.from_file(path, compact=compact)
+
+    @property
+    def servers(self) -> Iterable[str]:
+        return list(self._loaders)
+
+    @property
+    def loaded_servers(self) -> Iterable[str]:
+        """Servers whose configs have been built so far."""
+        return list(self._configs)
+
+    def __contains__(self, server_name) -> bool:
+        return server_name in self._loaders
+
+    def __len__(self) -> int:
+        return len(self._loaders)
+
+    def config_for(self, server_name: Optional[str]):
+        """Return the config of server_name, building it on first use."""
+        config = self._configs.get(server_name)
+        if config is not None:
+            return config
+        loader = self._loaders.get(server_name)
+        if loader is None:
+            return CompactConfig() if self.compact else RailLockConfig()
+        with self._lock:
+            config = self._configs.get(server_name)
+            if config is None:
+                config = loader()
+                if self.compact:
+                    config = CompactConfig.from_config(config, loader=loader)
+                self._configs[server_name] = config
+        return config
+
+
+def load_server_config(
+    config_path: str, server_name: str, cache_dir: Optional[str] = None
+) -> RailLockConfig:
+    """Return the config for server_name from a config file, directory or document.
+
+    A single-server file applies to any server, as it always has.
+    """
+    if os.path.isdir(config_path):
+        return MultiServerConfig.from_directory(
+            config_path, cache_dir=cache_dir
+        ).config_for(server_name)
+    try:
+        return RailLockConfig.from_file(config_path, cache_dir=cache_dir)
+    except ValueError as error:
+        # Only re-read the file as a multi-server document once it has failed as
+        # a single-server config, so the common case costs nothing extra.
+        try:
+            document = MultiServerConfig.from_file(config_path)
+        except ValueError:
+            raise error from None
+        return document.config_for(server_name)
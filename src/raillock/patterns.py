@@ -0,0 +1,105 @@
+"""
+Glob-style tool name rules (e.g. ``github_*`` or ``*_delete``) compiled into an index.
+"""
+
+import fnmatch
+import re
+from typing import Iterable, Optional
+
+ANY_CHECKSUM = "*"
+_GLOB_CHARS = "*?["
+
+
+def is_pattern(tool_name) -> bool:
+    """Return True if a tool name in the config is a glob pattern."""
+    return isinstance(tool_name, str) and any(c in tool_name for c in _GLOB_CHARS)
+
+
+def _literal_head(pattern: str) -> str:
+    for i, c in enumerate(pattern):
+        if c in _GLOB_CHARS:
+            return pattern[:i]
+    return pattern
+
+
+def _literal_tail(pattern: str) -> str:
+    for i in range(len(pattern) - 1, -1, -1):
+        if pattern[i] in "*?]":
+            return pattern[i + 1 :]
+    return pattern
+
+
+class PatternMatcher:
+    """Index of glob patterns that finds the first matching rule for a name.
+
+    Patterns are bucketed by their longest literal prefix or suffix, so a lookup
+    costs one dict probe per distinct literal length instead of one regex per
+    rule. Only patterns without any literal part are tried one by one.
+    """
+
+    __slots__ = (
+        "_prefixes",
+        "_prefix_lengths",
+        "_suffixes",
+        "_suffix_lengths",
+        "_general",
+    )
+
+    def __init__(self, patterns: Iterable[str]):
+        prefixes = {}
+        suffixes = {}
+        general = []
+        for index, pattern in enumerate(patterns):
+            head = _literal_head(pattern)
+            tail = _literal_tail(pattern)
+            if head and len(head) >= len(tail):
+                regex = None
+                if pattern != head + "*":
+                    regex = re.compile(fnmatch.translate(pattern))
+                prefixes.setdefault(head, []).append((index, regex))
+            elif tail:
+                regex = None
+                if pattern != "*" + tail:
+                    regex = re.compile(fnmatch.translate(pattern))
+                suffixes.setdefault(tail, []).append((index, regex))
+            else:
+                general.append((index, re.compile(fnmatch.translate(pattern))))
+
+        self._prefixes = prefixes
+        self._prefix_lengths = tuple(sorted({len(p) for p in prefixes}))
+        self._suffixes = suffixes
+        self._suffix_lengths = tuple(sorted({len(s) for s in suffixes}))
+        self._general = tuple(general)
+
+    def __bool__(self) -> bool:
+        return bool(self._prefixes or self._suffixes or self._general)
+
+    def match(self, name: str) -> Optional[int]:
+        """Return the index of the first pattern matching name, or None."""
+        best = None
+        size = len(name)
+        for length in self._prefix_lengths:
+            if length > size:
+                break
+            for index, regex in self._prefixes.get(name[:length], ()):
+                if best is not None and index > best:
+                    break
+                if regex is None or regex.match(name):
+                    best = index
+                    break
+        for length in self._suffix_lengths:
+            if length > size:
+                break
+            for index, regex in self._suffixes.get(name[size - length :], ()):
+                if best is not None and index > best:
+                    break
+                if regex is None or regex.match(name):
+                    best = index
+                    break
+        for index, regex in self._general:
+            if best is not None and index > best:
+                break
+            if regex.match(name):
+                best = index
+                break
+        return best
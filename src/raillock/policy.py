@@ -0,0 +1,281 @@
+"""
+CompiledPolicy - Immutable lookup index compiled from a RailLockConfig or CompactConfig.
+"""
+
+import hashlib
+import json
+from types import MappingProxyType
+from typing import Optional
+
+from .compact import ToolRule, checksum_matches
+from .patterns import ANY_CHECKSUM, PatternMatcher, is_pattern
+from .utils import cached_tool_checksum
+
+
+def _allowed_entry(allowed_val, server_name: Optional[str]) -> tuple:
+    if isinstance(allowed_val, dict):
+        return (allowed_val["checksum"], allowed_val.get("server", server_name))
+    if isinstance(allowed_val, ToolRule):
+        server = allowed_val.server
+        return (allowed_val.checksum, server_name if server is None else server)
+    return (allowed_val, server_name)
+
+
+class CompiledPolicy:
+    """Read-only index of a RailLockConfig used for tool filtering.
+
+    Allowed tools are stored as name -> (expected checksum, server name) with the
+    server name already resolved, and denied and malicious tool names are merged
+    into a single blocked set. Blocked names are never present in the allowed index,
+    so deciding on a tool is a single dict lookup plus a checksum comparison.
+
+    Names containing glob characters (``github_*``, ``*_delete``) are compiled into
+    PatternMatcher indexes. Exact names take precedence over patterns, blocked
+    rules take precedence over allowed ones, and an expected checksum of ``"*"``
+    accepts any description. Checksums from a CompactConfig stay raw digest bytes.
+
+    With a ChecksumBlocklist, a tool that would be allowed is still refused if its
+    checksum, with or without the server name, is on the blocklist.
+    """
+
+    __slots__ = (
+        "server_name",
+        "_allowed",
+        "_blocked",
+        "_allowed_patterns",
+        "_allowed_pattern_entries",
+        "_blocked_patterns",
+        "_blocklist",
+        "_pattern_names",
+        "_digest",
+    )
+
+    def __init__(self, config, server_name: Optional[str] = None, blocklist=None):
+        blocked_names = list(config.malicious_tools) + list(config.denied_tools)
+        blocked = frozenset(name for name in blocked_names if not is_pattern(name))
+        blocked_patterns = PatternMatcher(
+            name for name in blocked_names if is_pattern(name)
+        )
+
+        allowed = {}
+        allowed_patterns = []
+        allowed_pattern_entries = []
+        for tool_name, allowed_val in config.allowed_tools.items():
+            if is_pattern(tool_name):
+                allowed_patterns.append(tool_name)
+                allowed_pattern_entries.append(_allowed_entry(allowed_val, server_name))
+                continue
+            if tool_name in blocked:
+                continue
+            if blocked_patterns and blocked_patterns.match(tool_name) is not None:
+                continue
+            allowed[tool_name] = _allowed_entry(allowed_val, server_name)
+
+        object.__setattr__(self, "server_name", server_name)
+        object.__setattr__(self, "_allowed", MappingProxyType(allowed))
+        object.__setattr__(self, "_blocked", blocked)
+        object.__setattr__(self, "_allowed_patterns", PatternMatcher(allowed_patterns))
+        object.__setattr__(
+            self, "_allowed_pattern_entries", tuple(allowed_pattern_entries)
+        )
+        object.__setattr__(self, "_blocked_patterns", blocked_patterns)
+        object.__setattr__(self, "_blocklist", blocklist)
+        object.__setattr__(
+            self,
+            "_pattern_names",
+            (
+                tuple(allowed_patterns),
+                tuple(name for name in blocked_names if is_pattern(name)),
+            ),
+        )
+        object.__setattr__(self, "_digest", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CompiledPolicy is immutable")
+
+    def __len__(self) -> int:
+        return len(self._allowed) + len(self._allowed_pattern_entries)
+
+    @property
+    def digest(self) -> Optional[bytes]:
+        """SHA-256 of every rule that decides a tool, stable across processes.
+
+        Two policies with the same digest make the same decisions, so decisions
+        can be cached on disk under it. None if the blocklist cannot be identified.
+        """
+        digest = self._digest
+        if digest is not None:
+            return digest
+        blocklist = self._blocklist
+        identity = None
+        if blocklist is not None:
+            identity = getattr(blocklist, "identity", None)
+            if identity is None:
+                return None
+
+        def rule(name, entry) -> tuple:
+            checksum, server = entry
+            if checksum.__class__ is bytes:
+                checksum = checksum.hex()
+            return (name, checksum, server)
+
+        allowed_patterns, blocked_patterns = self._pattern_names
+        rules = [
+            sorted(rule(name, entry) for name, entry in self._allowed.items()),
+            sorted(self._blocked),
+            # Patterns are matched in order, so their order is part of the policy
+            [
+                rule(name, entry)
+                for name, entry in zip(allowed_patterns, self._allowed_pattern_entries)
+            ],
+            list(blocked_patterns),
+            identity,
+        ]
+        h = hashlib.sha256(json.dumps(rules).encode("utf-8"))
+        digest = h.digest()
+        object.__setattr__(self, "_digest", digest)
+        return digest
+
+    def is_blocked(self, tool_name: str) -> bool:
+        """Return True if the tool is listed as denied or malicious."""
+        if tool_name in self._blocked:
+            return True
+        return bool(self._blocked_patterns) and (
+            self._blocked_patterns.match(tool_name) is not None
+        )
+
+    def _lookup(self, tool_name) -> Optional[tuple]:
+        entry = self._allowed.get(tool_name)
+        if entry is not None or not self._allowed_patterns:
+            return entry
+        if not isinstance(tool_name, str) or self.is_blocked(tool_name):
+            return None
+        index = self._allowed_patterns.match(tool_name)
+        if index is None:
+            return None
+        return self._allowed_pattern_entries[index]
+
+    def allowed_entry(self, tool_name) -> Optional[tuple]:
+        """Return (expected checksum, server name) for an allowed tool, or None."""
+        return self._lookup(tool_name)
+
+    def allowed_rule(self, tool_name) -> Optional[str]:
+        """Return the allowed rule (exact name or pattern) that applies to a tool."""
+        if tool_name in self._allowed:
+            return tool_name
+        if not self._allowed_patterns or not isinstance(tool_name, str):
+            return None
+        if self.is_blocked(tool_name):
+            return None
+        index = self._allowed_patterns.match(tool_name)
+        return None if index is None else self._pattern_names[0][index]
+
+    def blocked_rule(self, tool_name) -> Optional[str]:
+        """Return the denied or malicious rule (exact name or pattern) for a tool."""
+        if tool_name in self._blocked:
+            return tool_name
+        if not self._blocked_patterns or not isinstance(tool_name, str):
+            return None
+        index = self._blocked_patterns.match(tool_name)
+        return None if index is None else self._pattern_names[1][index]
+
+    def is_allowed(self, tool_name: str, description) -> bool:
+        """Return True if the tool is allowed and its checksum matches."""
+        entry = self._lookup(tool_name)
+        if entry is None:
+            return False
+        expected_checksum, server_name = entry
+        if expected_checksum != ANY_CHECKSUM:
+            actual_checksum = cached_tool_checksum(tool_name, description, server_name)
+            if not checksum_matches(expected_checksum, actual_checksum):
+                return False
+        return not self.on_blocklist(tool_name, description, server_name)
+
+    def allows_checksum(
+        self,
+        tool_name: str,
+        server_name: Optional[str],
+        checksum: str,
+        bare_checksum: Optional[str] = None,
+    ) -> bool:
+        """Decide a tool known only by its checksums, without its description.
+
+        checksum was computed with server_name, and bare_checksum without a
+        server name (it may be omitted when server_name is None). A tool whose
+        rule now expects a checksum for a different server is refused.
+        """
+        entry = self._lookup(tool_name)
+        if entry is None:
+            return False
+        expected_checksum, entry_server = entry
+        if entry_server != server_name:
+            return False
+        if expected_checksum != ANY_CHECKSUM and not checksum_matches(
+            expected_checksum, checksum
+        ):
+            return False
+        blocklist = self._blocklist
+        if blocklist is None:
+            return True
+        if server_name and bare_checksum is None:
+            return False
+        return checksum not in blocklist and (
+            not server_name or bare_checksum not in blocklist
+        )
+
+    def on_blocklist(
+        self, tool_name: str, description, server_name: Optional[str] = None
+    ) -> bool:
+        """Return True if the tool's checksum is on this policy's blocklist."""
+        blocklist = self._blocklist
+        if blocklist is None:
+            return False
+        if cached_tool_checksum(tool_name, description, server_name) in blocklist:
+            return True
+        # Feeds shared across servers hold checksums without a server name
+        return bool(server_name) and (
+            cached_tool_checksum(tool_name, description) in blocklist
+        )
+
+    def allowed_indices(self, tools) -> tuple:
+        """Return the positions of the tools allowed by this policy."""
+        lookup = self._lookup
+        check_blocklist = self._blocklist is not None
+        indices = []
+        for index, tool in enumerate(tools):
+            entry = lookup(getattr(tool, "name", None))
+            if entry is None:
+                continue
+            expected_checksum, server_name = entry
+            if expected_checksum != ANY_CHECKSUM:
+                actual_checksum = cached_tool_checksum(
+                    tool.name, getattr(tool, "description", ""), server_name
+                )
+                # Inlined checksum_matches(): this loop runs once per listed tool
+                if actual_checksum != expected_checksum and (
+                    expected_checksum.__class__ is not bytes
+                    or bytes.fromhex(actual_checksum) != expected_checksum
+                ):
+                    continue
+            if check_blocklist and self.on_blocklist(
+                tool.name, getattr(tool, "description", ""), server_name
+            ):
+                continue
+            indices.append(index)
+        return tuple(indices)
+
+    def filter_tools(self, tools) -> list:
+        """Return the tools that are allowed by this policy, in order."""
+        tools = list(tools)
+        return [tools[index] for index in self.allowed_indices(tools)]
+
+
+def tools_fingerprint(tools) -> tuple:
+    """Return a hashable key identifying a tool list by names and descriptions.
+
+    The key is compared exactly on lookup, so unlike a digest it cannot collide.
+    """
+    return tuple(
+        (getattr(tool, "name", None), getattr(tool, "description", ""))
+        for tool in tools
+    )
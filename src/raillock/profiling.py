@@ -0,0 +1,121 @@
+"""
+Profiling support for the RailLock CLI: cProfile output plus a per-phase
+wall-clock breakdown.
+
+Library code marks its phases with phase(); while no profiling run is active
+it returns a shared no-op context manager without creating anything, so the
+marks stay in place permanently.
+"""
+
+import cProfile
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Optional
+
+PROFILE_ENV_VAR = "RAILLOCK_PROFILE"
+
+# Phases in the order they normally happen, used to order the report
+PHASES = (
+    "config_load",
+    "test_server",
+    "spawn",
+    "connect",
+    "initialize",
+    "list_tools",
+    "hashing",
+    "comparison",
+    "output",
+)
+
+
+class PhaseTimer:
+    """Accumulated wall-clock time and call count per named phase."""
+
+    def __init__(self):
+        self.totals = {}
+        self.counts = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.totals[name] = self.totals.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def format_report(self, total: float) -> str:
+        """Return a table of phases with their share of total wall-clock time."""
+        known = [name for name in PHASES if name in self.totals]
+        extra = sorted(name for name in self.totals if name not in PHASES)
+        lines = ["=== RailLock phase timings (wall clock) ==="]
+        for name in known + extra:
+            seconds = self.totals[name]
+            share = seconds / total * 100 if total else 0.0
+            lines.append(
+                f"  {name:<12} {seconds * 1000:10.1f} ms  {share:5.1f}%"
+                f"  ({self.counts[name]}x)"
+            )
+        accounted = sum(self.totals.values())
+        lines.append(f"  {'other':<12} {max(total - accounted, 0) * 1000:10.1f} ms")
+        lines.append(f"  {'total':<12} {total * 1000:10.1f} ms")
+        return "\n".join(lines)
+
+
+_active: Optional[PhaseTimer] = None
+
+
+# Shared by every phase() call made while no profiling run is active
+_NO_PHASE = nullcontext()
+
+
+def phase(name: str):
+    """Time the enclosed block as phase name if a profiling run is active."""
+    timer = _active
+    if timer is None:
+        return _NO_PHASE
+    return _timed_phase(timer, name)
+
+
+@contextmanager
+def _timed_phase(timer: PhaseTimer, name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(name, time.perf_counter() - start)
+
+
+def record_phase(name: str, started: float) -> None:
+    """Record phase name as running from started (a perf_counter value) to now."""
+    timer = _active
+    if timer is not None:
+        timer.add(name, time.perf_counter() - started)
+
+
+def profile_path_from_env(command: str) -> Optional[str]:
+    """Return the pstats path requested through RAILLOCK_PROFILE, if any."""
+    value = os.environ.get(PROFILE_ENV_VAR, "").strip()
+    if value.lower() in ("", "0", "false", "no", "off"):
+        return None
+    if value.lower() in ("1", "true", "yes", "on"):
+        return default_profile_path(command)
+    return value
+
+
+def default_profile_path(command: str) -> str:
+    return f"raillock-{command}.pstats"
+
+
+def run_profiled(func, args, output_path: str):
+    """Run func(args) under cProfile, write pstats to output_path and print phase timings."""
+    global _active
+    timer = PhaseTimer()
+    profiler = cProfile.Profile()
+    _active = timer
+    start = time.perf_counter()
+    try:
+        return profiler.runcall(func, args)
+    finally:
+        total = time.perf_counter() - start
+        _active = None
+        profiler.dump_stats(output_path)
+        print(timer.format_report(total), file=sys.stderr)
+        print(f"Profile written to {output_path}", file=sys.stderr)
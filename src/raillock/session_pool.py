@@ -0,0 +1,219 @@
+"""
+SessionPool - Keeps initialized MCP ClientSessions alive for reuse.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Dict, Tuple
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.sse import sse_client
+from mcp.client.stdio import stdio_client
+
+from .profiling import phase, record_phase
+from .utils import debug_log
+
+
+def stdio_server_parameters(server_url: str) -> StdioServerParameters:
+    """Build StdioServerParameters from a ``stdio:<command> [args...]`` URL."""
+    cmd = server_url[6:].split()
+    # Pass the current environment to the subprocess
+    return StdioServerParameters(command=cmd[0], args=cmd[1:], env=os.environ.copy())
+
+
+class _PooledSession:
+    __slots__ = ("session", "task", "stop")
+
+    def __init__(self, session, task, stop):
+        self.session = session
+        self.task = task
+        self.stop = stop
+
+
+class _Opening:
+    """A session being opened, shared by every get() waiting for it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task):
+        self.task = task
+        self.waiters = 0
+
+
+class BackgroundLoop:
+    """An event loop running in a daemon thread.
+
+    A pool's sessions are held open by tasks on one event loop, and
+    asyncio.run() cancels those tasks when it returns. The synchronous
+    RailLockClient API therefore runs pooled work here instead, so that the
+    sessions outlive each call.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name="raillock-session-pool", daemon=True
+        )
+        self._thread.start()
+
+    def run(self, coro):
+        """Run coro on the loop and return its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def close(self) -> None:
+        if self.loop.is_closed():
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+class SessionPool:
+    """Pool of initialized stdio and SSE ClientSessions keyed by server URL.
+
+    Spawning a stdio server and running ``initialize`` is expensive, so sessions
+    are kept open and handed out again on later calls. Each session is owned by a
+    background task that holds the transport open until the pool closes it, so
+    sessions can be used from any task on the pool's event loop. A pool belongs
+    to the first event loop that uses it; the synchronous RailLockClient methods
+    drive it from a BackgroundLoop of their own, so do not share such a pool with
+    async code.
+
+    Sessions for different servers are opened concurrently; a get() for a server
+    that is already being opened waits for that open instead of starting another.
+
+    Use as an async context manager, or call aclose() when done.
+    """
+
+    def __init__(self):
+        self._sessions: Dict[Tuple[str, bool], _PooledSession] = {}
+        self._opening: Dict[Tuple[str, bool], _Opening] = {}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, server_url) -> bool:
+        return any(key[0] == server_url for key in self._sessions)
+
+    async def __aenter__(self) -> "SessionPool":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def get(self, server_url: str, sse: bool = False) -> ClientSession:
+        """Return an initialized session for server_url, opening one if needed."""
+        key = (server_url, sse)
+        # No await between the lookups and the inserts, so no lock is needed
+        pooled = self._sessions.get(key)
+        if pooled is not None and not pooled.task.done():
+            return pooled.session
+        opening = self._opening.get(key)
+        if opening is None:
+            debug_log("[SessionPool] Opening session for %s (sse=%s)", server_url, sse)
+            opening = _Opening(asyncio.ensure_future(self._open(server_url, sse)))
+            self._opening[key] = opening
+            opening.task.add_done_callback(
+                lambda task: self._opened(key, opening, task)
+            )
+        opening.waiters += 1
+        try:
+            pooled = await asyncio.shield(opening.task)
+        except asyncio.CancelledError:
+            # The open is abandoned once nobody is waiting for it any more
+            if opening.waiters == 1:
+                opening.task.cancel()
+            raise
+        finally:
+            opening.waiters -= 1
+        return pooled.session
+
+    def _opened(self, key, opening: _Opening, task: asyncio.Future) -> None:
+        current = self._opening.get(key) is opening
+        if current:
+            del self._opening[key]
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            if not opening.waiters:
+                debug_log("[SessionPool] Failed to open %s: %s", key[0], error)
+            return
+        pooled = task.result()
+        if current:
+            self._sessions[key] = pooled
+        else:
+            # The pool was closed while the session was opening
+            pooled.stop.set()
+
+    async def discard(self, server_url: str, sse: bool = False) -> None:
+        """Close and forget the session for server_url, e.g. after an error."""
+        pooled = self._sessions.pop((server_url, sse), None)
+        if pooled is not None:
+            await self._shutdown(pooled)
+
+    async def aclose(self) -> None:
+        """Close every pooled session."""
+        self._cancel_opening()
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        for pooled in sessions:
+            await self._shutdown(pooled)
+
+    def close_nowait(self) -> None:
+        """Ask every pooled session to close without waiting for it."""
+        self._cancel_opening()
+        for pooled in self._sessions.values():
+            pooled.stop.set()
+        self._sessions.clear()
+
+    def _cancel_opening(self) -> None:
+        for opening in self._opening.values():
+            opening.task.cancel()
+        self._opening.clear()
+
+    async def _open(self, server_url: str, sse: bool) -> _PooledSession:
+        ready = asyncio.get_running_loop().create_future()
+        stop = asyncio.Event()
+        task = asyncio.create_task(self._hold(server_url, sse, ready, stop))
+        try:
+            session = await ready
+        except BaseException:
+            stop.set()
+            task.cancel()
+            raise
+        return _PooledSession(session, task, stop)
+
+    @staticmethod
+    async def _hold(server_url, sse, ready, stop) -> None:
+        if sse:
+            transport = sse_client(server_url)
+        else:
+            transport = stdio_client(stdio_server_parameters(server_url))
+        started = time.perf_counter()
+        try:
+            async with transport as (read_stream, write_stream):
+                record_phase("connect" if sse else "spawn", started)
+                async with ClientSession(read_stream, write_stream) as session:
+                    with phase("initialize"):
+                        await session.initialize()
+                    ready.set_result(session)
+                    await stop.wait()
+        except asyncio.CancelledError:
+            if not ready.done():
+                ready.cancel()
+            raise
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                debug_log("[SessionPool] Session for %s ended: %s", server_url, e)
+
+    @staticmethod
+    async def _shutdown(pooled: _PooledSession) -> None:
+        pooled.stop.set()
+        (result,) = await asyncio.gather(pooled.task, return_exceptions=True)
+        if isinstance(result, BaseException):
+            debug_log("[SessionPool] Error while closing session: %r", result)
@@ -1,6 +1,27 @@
+import functools
 import hashlib
 import os
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+
+from raillock.profiling import phase
+
+DEFAULT_CHECKSUM_CACHE_SIZE = 4096
+# Total description size (in characters) above which calculate_tool_checksums
+# spreads hashing over a thread pool. hashlib releases the GIL on large buffers.
+PARALLEL_CHECKSUM_THRESHOLD = 256 * 1024
+
+# Resolved once at import; use set_debug() to toggle at runtime.
+_debug_enabled = os.environ.get("RAILLOCK_DEBUG", "false").lower() == "true"
+
+
+def debug_log(message: str, *args) -> None:
+    """
+    Print a debug message, formatting it with message % args only when debug is enabled.
+    Use this instead of an f-string so disabled debug output costs a single flag check.
+    """
+    if _debug_enabled:
+        print("[DEBUG][RailLock]", message % args if args else message)
 
 
 def calculate_tool_checksum(
@@ -14,13 +35,126 @@ def calculate_tool_checksum(
         data = f"{server_name}:{tool_name}:{description}".encode("utf-8")
     else:
         data = f"{tool_name}:{description}".encode("utf-8")
-    if os.environ.get("RAILLOCK_DEBUG", "false").lower() == "true":
+    if _debug_enabled:
         print(
             f"[DEBUG][checksum] tool_name={tool_name!r} description={description!r} server_name={server_name!r} data={data!r}"
         )
     return hashlib.sha256(data).hexdigest()
 
 
+def calculate_tool_checksums(
+    tools: Iterable[Tuple[str, str]],
+    server_name: Optional[str] = None,
+    cache: bool = False,
+    max_workers: Optional[int] = None,
+) -> List[str]:
+    """
+    Calculate checksums for a whole manifest in one call.
+
+    Args:
+        tools: Iterable of (tool_name, description) pairs
+        server_name: Server name included in every checksum
+        cache: Use the shared checksum cache (see cached_tool_checksum)
+        max_workers: Thread pool size for large manifests
+
+    Returns:
+        List of checksums in the same order as tools
+    """
+    pairs = list(tools)
+    with phase("hashing"):
+        return _hash_pairs(pairs, server_name, cache, max_workers)
+
+
+def _hash_pairs(pairs, server_name, cache, max_workers) -> List[str]:
+    checksum = cached_tool_checksum if cache else calculate_tool_checksum
+    total_size = sum(len(description or "") for _, description in pairs)
+    if len(pairs) < 2 or total_size < PARALLEL_CHECKSUM_THRESHOLD:
+        return [checksum(name, description, server_name) for name, description in pairs]
+
+    def hash_chunk(chunk):
+        return [checksum(name, description, server_name) for name, description in chunk]
+
+    workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+    chunk_size = -(-len(pairs) // workers)
+    chunks = [pairs[i : i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return [c for result in executor.map(hash_chunk, chunks) for c in result]
+
+
+def _build_checksum_cache(maxsize: int):
+    return functools.lru_cache(maxsize=maxsize)(calculate_tool_checksum)
+
+
+def _checksum_cache_size_from_env() -> int:
+    value = os.environ.get("RAILLOCK_CHECKSUM_CACHE_SIZE")
+    if value is None:
+        return DEFAULT_CHECKSUM_CACHE_SIZE
+    try:
+        size = int(value)
+    except ValueError:
+        size = -1
+    if size < 0:
+        # A bad value must not make `import raillock` fail
+        debug_log(
+            "Ignoring RAILLOCK_CHECKSUM_CACHE_SIZE=%r; using %d",
+            value,
+            DEFAULT_CHECKSUM_CACHE_SIZE,
+        )
+        return DEFAULT_CHECKSUM_CACHE_SIZE
+    return size
+
+
+_checksum_cache = _build_checksum_cache(_checksum_cache_size_from_env())
+
+
+def cached_tool_checksum(
+    tool_name: str, description: str, server_name: Optional[str] = None
+) -> str:
+    """
+    Memoized calculate_tool_checksum keyed on (tool_name, description, server_name).
+    The cache is bounded and evicts the least recently used entry when full.
+    """
+    return _checksum_cache(tool_name, description, server_name)
+
+
+def configure_checksum_cache(maxsize: int) -> None:
+    """
+    Replace the checksum cache with an empty one holding at most maxsize entries.
+    A maxsize of 0 disables caching.
+    """
+    global _checksum_cache
+    if maxsize < 0:
+        raise ValueError("Checksum cache size must be >= 0")
+    _checksum_cache = _build_checksum_cache(maxsize)
+
+
+def checksum_cache_info() -> dict:
+    """Return hit/miss counters and the current size of the checksum cache."""
+    info = _checksum_cache.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+    }
+
+
+def clear_checksum_cache() -> None:
+    """Drop all cached checksums and reset the counters."""
+    _checksum_cache.cache_clear()
+
+
+def is_debug_enabled() -> bool:
+    """Return True if RailLock debug output is enabled."""
+    return _debug_enabled
+
+
+def set_debug(enabled: bool) -> None:
+    """Enable or disable RailLock debug output at runtime."""
+    global _debug_enabled
+    _debug_enabled = bool(enabled)
+
+
 def debug_print(*args, **kwargs):
-    if os.environ.get("RAILLOCK_DEBUG", "false").lower() == "true":
+    if _debug_enabled:
         print("[DEBUG][RailLock]", *args, **kwargs)
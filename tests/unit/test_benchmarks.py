@@ -0,0 +1,58 @@
+import sys
+import os
+import json
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src"))
+)
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../benchmarks"))
+)
+import bench
+
+
+def test_bench_runs_every_case_and_writes_json(tmp_path, capsys):
+    output = tmp_path / "results.json"
+    code = bench.main(
+        [
+            "--sizes",
+            "10",
+            "--yaml-sizes",
+            "5",
+            "--min-time",
+            "0",
+            "--output",
+            str(output),
+        ]
+    )
+    assert code == 0
+    results = json.loads(output.read_text())["results"]
+    for name in (
+        "filter_tools/10/short",
+        "filter_tools_cached/10/long",
+        "calculate_tool_checksum/10/short",
+        "compare_config_with_server/10/long",
+        "from_file/5",
+        "from_file_cached/5",
+        "config_dict_to_yaml_string/5",
+    ):
+        assert results[name]["repeats"] == 1
+        assert results[name]["median"] > 0
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    baseline = {"results": {"a": {"median": 1.0}, "b": {"median": 1.0}}}
+    current = {
+        "results": {"a": {"median": 1.2}, "b": {"median": 1.5}, "new": {"median": 9}}
+    }
+    regressions = bench.compare(current, baseline, threshold=0.25)
+    assert [r[0] for r in regressions] == ["b"]
+    assert regressions[0][3] == 1.5
+
+
+def test_baseline_regression_sets_exit_code(tmp_path, monkeypatch):
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"results": {"x": {"median": 1.0}}}))
+    monkeypatch.setattr(bench, "run", lambda *args: {"results": {"x": {"median": 2.0}}})
+    assert bench.main(["--baseline", str(baseline)]) == 1
+    assert bench.main(["--baseline", str(tmp_path / "missing.json")]) == 2
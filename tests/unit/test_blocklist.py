@@ -0,0 +1,172 @@
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src"))
+)
+import argparse
+import hashlib
+import io
+from unittest.mock import patch
+
+import pytest
+
+from raillock.blocklist import (
+    ChecksumBlocklist,
+    build_blocklist,
+    read_checksum_feed,
+)
+from raillock.cli.commands.blocklist import run_build_blocklist
+from raillock.client import RailLockClient
+from raillock.config import RailLockConfig
+from raillock.policy import CompiledPolicy
+from raillock.utils import calculate_tool_checksum
+
+
+class DummyTool:
+    def __init__(self, name, description="desc"):
+        self.name = name
+        self.description = description
+
+
+def checksums(count):
+    return [hashlib.sha256(str(i).encode()).hexdigest() for i in range(count)]
+
+
+@pytest.mark.parametrize("bloom_bits", [10, 0])
+def test_build_and_look_up(tmp_path, bloom_bits):
+    listed = checksums(500)
+    path = str(tmp_path / "blocklist.bin")
+    assert build_blocklist(listed + listed[:10], path, bloom_bits) == 500
+
+    with ChecksumBlocklist.open(path) as blocklist:
+        assert len(blocklist) == 500
+        assert blocklist.has_bloom_filter == bool(bloom_bits)
+        assert all(checksum in blocklist for checksum in listed)
+        assert bytes.fromhex(listed[0]) in blocklist
+        unlisted = [hashlib.sha256(b"x%d" % i).hexdigest() for i in range(500)]
+        assert not any(checksum in blocklist for checksum in unlisted)
+        assert "not-hex" not in blocklist
+        assert None not in blocklist
+
+
+def test_empty_blocklist(tmp_path):
+    path = str(tmp_path / "empty.bin")
+    assert build_blocklist([], path) == 0
+    with ChecksumBlocklist(path) as blocklist:
+        assert len(blocklist) == 0
+        assert checksums(1)[0] not in blocklist
+
+
+def test_build_rejects_bad_checksums(tmp_path):
+    path = tmp_path / "blocklist.bin"
+    with pytest.raises(ValueError, match="Not a hex SHA-256"):
+        build_blocklist(["xyz"], str(path))
+    with pytest.raises(ValueError, match="Not a SHA-256"):
+        build_blocklist(["abcd"], str(path))
+    assert not path.exists()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_open_rejects_other_files(tmp_path):
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"\x00" * 64)
+    with pytest.raises(ValueError, match="Not a RailLock checksum blocklist"):
+        ChecksumBlocklist(str(other))
+
+    path = tmp_path / "blocklist.bin"
+    build_blocklist(checksums(3), str(path))
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError, match="Truncated or corrupt"):
+        ChecksumBlocklist(str(path))
+
+
+def test_read_checksum_feed_skips_comments():
+    feed = io.StringIO("# header\n\n  abc  # trailing\ndef\n")
+    assert list(read_checksum_feed(feed)) == ["abc", "def"]
+
+
+def test_policy_refuses_allowed_tools_on_the_blocklist(tmp_path):
+    server = "http://server"
+    config = RailLockConfig(
+        allowed_tools={
+            "echo": calculate_tool_checksum("echo", "desc", server),
+            "add": "*",
+            "ok": "*",
+        }
+    )
+    path = str(tmp_path / "blocklist.bin")
+    build_blocklist(
+        [
+            calculate_tool_checksum("echo", "desc", server),
+            # A feed shared by all servers lists checksums without the server
+            calculate_tool_checksum("add", "desc"),
+        ],
+        path,
+    )
+    tools = [DummyTool("echo"), DummyTool("add"), DummyTool("ok")]
+    with ChecksumBlocklist(path) as blocklist:
+        policy = CompiledPolicy(config, server, blocklist)
+        assert not policy.is_allowed("echo", "desc")
+        assert not policy.is_allowed("add", "desc")
+        assert policy.is_allowed("ok", "desc")
+        assert policy.allowed_indices(tools) == (2,)
+        assert CompiledPolicy(config, server).allowed_indices(tools) == (0, 1, 2)
+
+
+def test_client_blocklist_setter_recompiles_policies(tmp_path):
+    config = RailLockConfig(allowed_tools={"echo": "*", "ok": "*"})
+    client = RailLockClient(config)
+    tools = [DummyTool("echo"), DummyTool("ok")]
+    assert [t.name for t in client.filter_tools(tools)] == ["echo", "ok"]
+
+    path = str(tmp_path / "blocklist.bin")
+    build_blocklist([calculate_tool_checksum("echo", "desc")], path)
+    with ChecksumBlocklist(path) as blocklist:
+        client.blocklist = blocklist
+        assert client.blocklist is blocklist
+        assert [t.name for t in client.filter_tools(tools)] == ["ok"]
+        assert [
+            t.name
+            for t in RailLockClient(config, blocklist=blocklist).filter_tools(tools)
+        ] == ["ok"]
+    client.blocklist = None
+    assert [t.name for t in client.filter_tools(tools)] == ["echo", "ok"]
+
+
+def test_build_blocklist_command(tmp_path, capsys):
+    listed = checksums(3)
+    feed = tmp_path / "feed.txt"
+    feed.write_text("# known bad\n" + "\n".join(listed) + "\n")
+    output = tmp_path / "blocklist.bin"
+    run_build_blocklist(
+        argparse.Namespace(input=str(feed), output=str(output), bloom_bits=10)
+    )
+    assert f"Wrote 3 checksums to {output}" in capsys.readouterr().out
+    with ChecksumBlocklist(str(output)) as blocklist:
+        assert listed[1] in blocklist
+
+    feed.write_text("nothex\n")
+    with pytest.raises(SystemExit):
+        run_build_blocklist(
+            argparse.Namespace(input=str(feed), output=str(output), bloom_bits=10)
+        )
+    assert "Error: Not a hex SHA-256" in capsys.readouterr().err
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+def test_built_blocklist_is_readable_by_other_users(tmp_path):
+    path = tmp_path / "blocklist.bin"
+    umask = os.umask(0o022)
+    try:
+        # The umask is process-wide, so building must not change it even briefly
+        with patch("os.umask", side_effect=AssertionError("umask changed")):
+            build_blocklist(checksums(3), str(path))
+    finally:
+        os.umask(umask)
+    assert path.stat().st_mode & 0o777 == 0o644
+
+    # A rebuild keeps the mode the administrator chose
+    path.chmod(0o640)
+    build_blocklist(checksums(4), str(path))
+    assert path.stat().st_mode & 0o777 == 0o640
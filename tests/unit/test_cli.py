@@ -734,8 +734,10 @@ def test_compare_malicious_tools_checksum(tmp_path, monkeypatch, capsys):
     )()
     compare_mod.run_compare(args)
     out = capsys.readouterr().out
-    # Should show the tool as unknown (checksum mismatch) when checksum does not match
-    assert "unknown (checksum mismatch)" in out
+    # The tool is still blocked by name, and the checksum column shows the mismatch
+    assert "malicious" in out
+    assert "unknown" not in out
+    assert "✘" in out
 
     # Now patch to match checksum
     class DummyClient2:
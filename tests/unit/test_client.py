@@ -7,7 +7,7 @@ sys.path.insert(
 import pytest
 import requests
 from unittest.mock import patch, MagicMock, AsyncMock
-from raillock.client import RailLockClient
+from raillock.client import PREFETCH_MAX_AGE, RailLockClient
 from raillock.config import RailLockConfig
 from raillock.exceptions import RailLockError
 from raillock.config_utils import compare_config_with_server
@@ -15,7 +15,6 @@ import json
 import shutil
 from raillock.utils import calculate_tool_checksum
 
-
 try:
     from mcp.client.stdio import StdioServerParameters, stdio_client
     from mcp.types import JSONRPCMessage, JSONRPCRequest, JSONRPCResponse
@@ -78,7 +77,7 @@ def test_parse_tools_invalid_format():
     assert client._parse_tools({"bad": "notadict"}) == {}
 
 
-@patch("requests.get")
+@patch("requests.Session.get")
 def test_connect_http_success(mock_get):
     mock_response = MagicMock()
     mock_response.json.return_value = {"echo": {"description": "desc"}}
@@ -91,7 +90,7 @@ def test_connect_http_success(mock_get):
     assert "echo" in client._available_tools
 
 
-@patch("requests.get")
+@patch("requests.Session.get")
 def test_connect_http_request_error(mock_get):
     mock_get.side_effect = requests.exceptions.RequestException("Network error")
     client = RailLockClient(RailLockConfig())
@@ -99,7 +98,7 @@ def test_connect_http_request_error(mock_get):
         client.connect("http://testserver")
 
 
-@patch("requests.get")
+@patch("requests.Session.get")
 def test_connect_http_bad_json(mock_get):
     mock_response = MagicMock()
     mock_response.json.side_effect = json.JSONDecodeError("bad json", "", 0)
@@ -225,3 +224,141 @@ def test_server_test_stdio_executable_check():
         mock_which.return_value = None
         with pytest.raises(RailLockError, match="STDIO server executable not found"):
             client.test_server("stdio:/nonexistent/command")
+
+
+def _mock_http_client(handler):
+    import httpx
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.anyio(backend="asyncio")
+async def test_connect_async_http_uses_shared_client():
+    import httpx
+
+    def handler(request):
+        return httpx.Response(200, json={"echo": {"description": "desc"}})
+
+    client = RailLockClient(RailLockConfig())
+    with patch(
+        "raillock.client.get_async_http_client",
+        return_value=_mock_http_client(handler),
+    ):
+        await client.connect_async("http://testserver")
+    assert "echo" in client._available_tools
+
+
+@pytest.mark.anyio(backend="asyncio")
+async def test_connect_async_http_error():
+    import httpx
+
+    def handler(request):
+        raise httpx.ConnectError("Network error")
+
+    client = RailLockClient(RailLockConfig())
+    with patch(
+        "raillock.client.get_async_http_client",
+        return_value=_mock_http_client(handler),
+    ):
+        with pytest.raises(RailLockError, match="Failed to connect"):
+            await client.connect_async("http://testserver")
+
+
+def test_test_server_prefetch_reuses_response_for_connect():
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"echo": {"description": "desc"}}
+    mock_response.raise_for_status.return_value = None
+
+    client = RailLockClient(RailLockConfig())
+    with patch("requests.Session.get", return_value=mock_response) as mock_get:
+        assert client.test_server("http://testserver", prefetch=True) is True
+        client.connect("http://testserver")
+    mock_get.assert_called_once_with("http://testserver", timeout=5)
+    assert "echo" in client._available_tools
+
+
+def test_stale_or_unused_prefetch_is_not_reused():
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"echo": {"description": "desc"}}
+    mock_response.raise_for_status.return_value = None
+
+    client = RailLockClient(RailLockConfig())
+    with patch("requests.Session.get", return_value=mock_response) as mock_get:
+        client.test_server("http://testserver", prefetch=True)
+        url, response, fetched_at = client._prefetched
+        client._prefetched = (url, response, fetched_at - PREFETCH_MAX_AGE - 1)
+        client.connect("http://testserver")
+    assert mock_get.call_count == 2
+
+    # A connect to another server drops the prefetch
+    with patch("requests.Session.get", return_value=mock_response) as mock_get:
+        client.test_server("http://testserver", prefetch=True)
+        client.connect("http://other")
+        client.connect("http://testserver")
+    assert mock_get.call_count == 3
+    assert client._prefetched is None
+
+
+def test_http_calls_share_one_pooled_session():
+    head_response = MagicMock(status_code=200)
+    client = RailLockClient(RailLockConfig())
+    session = client.http_session
+    with patch.object(session, "head", return_value=head_response) as mock_head:
+        client.test_server("http://testserver")
+        client.test_server("http://testserver")
+    assert mock_head.call_count == 2
+    assert client.http_session is session
+    client.close()
+    assert client._http_session is None
+
+
+def test_connect_many_returns_partial_results():
+    import asyncio
+
+    active = []
+    peak = []
+
+    async def fake_fetch(server_url, sse=False):
+        active.append(server_url)
+        peak.append(len(active))
+        try:
+            if server_url == "stdio:slow":
+                await asyncio.sleep(10)
+            if server_url == "http://broken":
+                raise RailLockError("Failed to connect to server: refused")
+            await asyncio.sleep(0.01)
+            return {
+                "echo": {
+                    "description": "desc",
+                    "checksum": calculate_tool_checksum("echo", "desc", server_url),
+                }
+            }
+        finally:
+            active.remove(server_url)
+
+    config = RailLockConfig({"echo": {"checksum": "unused", "server": "x"}})
+    client = RailLockClient(config)
+    client._fetch_tools_async = fake_fetch
+    urls = ["http://a", "http://b", "stdio:slow", "http://broken", "http://c"]
+    result = client.connect_many(urls, concurrency=2, timeout=0.5)
+
+    assert set(result.tools) == {"http://a", "http://b", "http://c"}
+    assert set(result.errors) == {"stdio:slow", "http://broken"}
+    assert "Timed out" in str(result.errors["stdio:slow"])
+    assert not result.complete
+    assert max(peak) <= 2
+    tool = result.tools["http://a"][0]
+    assert (tool.name, tool.description) == ("echo", "desc")
+
+
+def test_filter_tools_uses_per_server_policy():
+    config = RailLockConfig(
+        {"echo": calculate_tool_checksum("echo", "desc", "http://a")}
+    )
+    client = RailLockClient(config)
+    tools = [DummyTool("echo", "desc")]
+    assert client.filter_tools(tools, server_name="http://a") == tools
+    assert client.filter_tools(tools, server_name="http://b") == []
+    assert client.policy_for("http://a") is client.policy_for("http://a")
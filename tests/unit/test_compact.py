@@ -0,0 +1,159 @@
+import sys
+import os
+import gc
+import tracemalloc
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src"))
+)
+import pytest
+import yaml
+
+from raillock.client import RailLockClient
+from raillock.compact import (
+    CompactConfig,
+    ToolRule,
+    checksum_matches,
+    decode_checksum,
+    encode_checksum,
+)
+from raillock.config import RailLockConfig
+from raillock.policy import CompiledPolicy
+from raillock.utils import calculate_tool_checksum
+
+
+class DummyTool:
+    def __init__(self, name, description="desc"):
+        self.name = name
+        self.description = description
+
+
+def make_config_data(count=3, description="desc"):
+    return {
+        "allowed_tools": {
+            f"tool_{i}": {
+                "description": f"{description} {i}",
+                "checksum": calculate_tool_checksum(
+                    f"tool_{i}", f"{description} {i}", "http://srv"
+                ),
+                "server": "http://srv",
+            }
+            for i in range(count)
+        },
+        "malicious_tools": {
+            "evil": {"description": "bad", "checksum": "deadbeef"},
+        },
+        "denied_tools": {"nope": {"description": "no"}},
+    }
+
+
+def write_config(path, data):
+    with open(path, "w") as f:
+        yaml.safe_dump(data, f)
+    return str(path)
+
+
+def test_encode_checksum_stores_sha256_hex_as_digest_bytes():
+    checksum = calculate_tool_checksum("echo", "desc")
+    encoded = encode_checksum(checksum)
+    assert isinstance(encoded, bytes) and len(encoded) == 32
+    assert decode_checksum(encoded) == checksum
+    assert checksum_matches(encoded, checksum)
+    assert not checksum_matches(encoded, calculate_tool_checksum("echo", "other"))
+    for value in ("*", "abc123", checksum.upper(), "z" * 64):
+        assert encode_checksum(value) == value
+        assert decode_checksum(encode_checksum(value)) == value
+    assert encode_checksum(None) is None
+
+
+def test_tool_rule_from_entry():
+    rule = ToolRule.from_entry({"checksum": "a" * 64, "server": "http://srv"})
+    assert rule.checksum == bytes.fromhex("a" * 64)
+    assert rule.server == "http://srv"
+    assert ToolRule.from_entry("*") == ToolRule("*")
+    assert not hasattr(rule, "__dict__")
+
+
+def test_from_file_interns_names_and_servers(tmp_path):
+    path = write_config(tmp_path / "config.yaml", make_config_data())
+    config = CompactConfig.from_file(path)
+    assert len(config) == 5
+    assert set(config.allowed_tools) == {"tool_0", "tool_1", "tool_2"}
+    servers = {id(rule.server) for rule in config.allowed_tools.values()}
+    assert len(servers) == 1
+    for name in config.allowed_tools:
+        assert name is sys.intern(name)
+    assert config.malicious_tools["evil"].checksum == "deadbeef"
+    assert config.denied_tools["nope"].checksum is None
+
+
+def test_compact_config_enforces_like_full_config(tmp_path):
+    data = make_config_data()
+    data["allowed_tools"]["github_*"] = {"checksum": "*"}
+    data["denied_tools"]["github_delete"] = {}
+    path = write_config(tmp_path / "config.yaml", data)
+    tools = [
+        DummyTool("tool_0", "desc 0"),
+        DummyTool("tool_1", "changed"),
+        DummyTool("tool_2", "desc 2"),
+        DummyTool("github_issues"),
+        DummyTool("github_delete"),
+        DummyTool("evil", "bad"),
+        DummyTool("unknown"),
+    ]
+    full = RailLockClient(RailLockConfig.from_file(path))
+    compact = RailLockClient(CompactConfig.from_file(path))
+    expected = ["tool_0", "tool_2", "github_issues"]
+    assert [t.name for t in full.filter_tools(tools)] == expected
+    assert [t.name for t in compact.filter_tools(tools)] == expected
+    policy = CompiledPolicy(compact.config)
+    assert policy.is_allowed("tool_2", "desc 2")
+    assert not policy.is_allowed("tool_2", "desc 3")
+
+
+def test_descriptions_are_loaded_on_demand(tmp_path):
+    data = make_config_data()
+    path = write_config(tmp_path / "config.yaml", data)
+    config = CompactConfig.from_file(path)
+    assert config.has_descriptions
+    assert config.descriptions()["tool_1"] == "desc 1"
+    assert config.descriptions("malicious_tools") == {"evil": "bad"}
+    assert config.to_config().allowed_tools == data["allowed_tools"]
+    with pytest.raises(ValueError, match="Unknown config section"):
+        config.descriptions("other")
+
+
+def test_to_config_without_source_rebuilds_entries():
+    data = make_config_data(1)
+    config = CompactConfig.from_config(RailLockConfig(**data))
+    assert not config.has_descriptions
+    assert config.descriptions() == {}
+    rebuilt = config.to_config()
+    entry = data["allowed_tools"]["tool_0"]
+    assert rebuilt.allowed_tools["tool_0"] == {
+        "checksum": entry["checksum"],
+        "server": "http://srv",
+    }
+    assert rebuilt.denied_tools == {"nope": {}}
+
+
+def _traced_size(build):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        value = build()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return value, size
+
+
+def test_compact_config_uses_a_fraction_of_the_memory(tmp_path):
+    path = write_config(
+        tmp_path / "config.yaml", make_config_data(2000, "description " * 20)
+    )
+    _, full_size = _traced_size(lambda: RailLockConfig.from_file(path))
+    _, compact_size = _traced_size(lambda: CompactConfig.from_file(path))
+    assert compact_size < full_size / 3
@@ -0,0 +1,142 @@
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src"))
+)
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from raillock.config import RailLockConfig
+from raillock.config_cache import (
+    CACHE_ENV_VAR,
+    ConfigCache,
+    cache_dir_from_env,
+    default_cache_dir,
+    yaml_safe_load,
+)
+
+CONFIG = {
+    "config_version": 1,
+    "allowed_tools": {"echo": {"description": "desc", "checksum": "abc123"}},
+    "malicious_tools": {"evil": {"description": "desc", "checksum": "deadbeef"}},
+    "denied_tools": {"bad": {"description": "desc"}},
+}
+
+
+def write_config(path, data=CONFIG):
+    with open(path, "w") as f:
+        yaml.safe_dump(data, f)
+    return str(path)
+
+
+def no_yaml(*args, **kwargs):
+    raise AssertionError("YAML was parsed")
+
+
+def test_yaml_safe_load_uses_libyaml_when_available():
+    assert yaml_safe_load(b"a: [1, 2]\n") == {"a": [1, 2]}
+    if yaml.__with_libyaml__:
+        with patch("yaml.load", wraps=yaml.load) as load:
+            yaml_safe_load("a: 1")
+        assert load.call_args.kwargs["Loader"] is yaml.CSafeLoader
+
+
+def test_cached_load_skips_parsing_and_validation(tmp_path):
+    config_path = write_config(tmp_path / "config.yaml")
+    cache_dir = str(tmp_path / "cache")
+    first = RailLockConfig.from_file(config_path, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+
+    with (
+        patch("raillock.config.yaml_safe_load", side_effect=no_yaml),
+        patch("raillock.config.validate_config_dict", side_effect=no_yaml),
+    ):
+        second = RailLockConfig.from_file(config_path, cache_dir=cache_dir)
+    assert second.allowed_tools == first.allowed_tools == CONFIG["allowed_tools"]
+    assert second.malicious_tools == CONFIG["malicious_tools"]
+    assert second.denied_tools == CONFIG["denied_tools"]
+
+
+def test_changed_file_is_parsed_again(tmp_path):
+    config_path = write_config(tmp_path / "config.yaml")
+    cache_dir = str(tmp_path / "cache")
+    RailLockConfig.from_file(config_path, cache_dir=cache_dir)
+
+    changed = dict(CONFIG, allowed_tools={})
+    write_config(config_path, changed)
+    stat = os.stat(config_path)
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    config = RailLockConfig.from_file(config_path, cache_dir=cache_dir)
+    assert config.allowed_tools == {}
+
+
+def test_same_mtime_different_content_misses(tmp_path):
+    config_path = write_config(tmp_path / "config.yaml")
+    cache = ConfigCache(str(tmp_path / "cache"))
+    stat = os.stat(config_path)
+    assert cache.put(config_path, stat, "a" * 64, CONFIG)
+    assert cache.get(config_path, stat, "a" * 64) is not None
+    assert cache.get(config_path, stat, "b" * 64) is None
+
+
+def test_invalid_config_is_not_cached(tmp_path):
+    config_path = write_config(tmp_path / "config.yaml", {"allowed_tools": {}})
+    cache_dir = tmp_path / "cache"
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Missing required section"):
+            RailLockConfig.from_file(config_path, cache_dir=str(cache_dir))
+    assert not cache_dir.exists()
+
+
+def test_values_json_cannot_represent_are_not_cached(tmp_path):
+    import datetime
+
+    data = dict(
+        CONFIG,
+        allowed_tools={
+            "echo": {
+                "description": "desc",
+                "checksum": "abc123",
+                "reviewed": datetime.date(2024, 1, 1),
+            }
+        },
+    )
+    config_path = write_config(tmp_path / "config.yaml", data)
+    cache_dir = tmp_path / "cache"
+    config = RailLockConfig.from_file(config_path, cache_dir=str(cache_dir))
+    assert config.allowed_tools["echo"]["reviewed"] == datetime.date(2024, 1, 1)
+    assert not cache_dir.exists() or not os.listdir(cache_dir)
+
+
+def test_corrupt_cache_entry_is_ignored(tmp_path):
+    config_path = write_config(tmp_path / "config.yaml")
+    cache_dir = tmp_path / "cache"
+    RailLockConfig.from_file(config_path, cache_dir=str(cache_dir))
+    (entry,) = cache_dir.iterdir()
+    entry.write_text("{not json")
+    config = RailLockConfig.from_file(config_path, cache_dir=str(cache_dir))
+    assert config.allowed_tools == CONFIG["allowed_tools"]
+
+
+def test_unwritable_cache_dir_still_loads(tmp_path):
+    config_path = write_config(tmp_path / "config.yaml")
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    config = RailLockConfig.from_file(config_path, cache_dir=str(blocker / "cache"))
+    assert config.allowed_tools == CONFIG["allowed_tools"]
+
+
+def test_cache_dir_from_env(tmp_path, monkeypatch):
+    monkeypatch.delenv(CACHE_ENV_VAR, raising=False)
+    assert cache_dir_from_env() is None
+    monkeypatch.setenv(CACHE_ENV_VAR, "off")
+    assert cache_dir_from_env() is None
+    monkeypatch.setenv(CACHE_ENV_VAR, "1")
+    assert cache_dir_from_env() == default_cache_dir()
+    monkeypatch.setenv(CACHE_ENV_VAR, str(tmp_path / "cache"))
+    config_path = write_config(tmp_path / "config.yaml")
+    RailLockConfig.from_file(config_path)
+    assert len(os.listdir(tmp_path / "cache")) == 1
@@ -0,0 +1,214 @@
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src"))
+)
+import pytest
+import yaml
+
+from raillock.client import RailLockClient
+from raillock.compact import CompactConfig
+from raillock.config import RailLockConfig
+from raillock.config_watcher import ConfigWatcher, _open_inotify
+from raillock.multi_config import MultiServerConfig
+from raillock.utils import calculate_tool_checksum
+
+
+class DummyTool:
+    def __init__(self, name, description="desc"):
+        self.name = name
+        self.description = description
+
+
+def allow(*names, server=None):
+    return {
+        "allowed_tools": {
+            name: {
+                "description": "desc",
+                "checksum": calculate_tool_checksum(name, "desc", server),
+            }
+            for name in names
+        },
+        "malicious_tools": {},
+        "denied_tools": {},
+    }
+
+
+def write_config(path, data):
+    # Write then rename, the way most editors save
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        yaml.safe_dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_check_reloads_only_changed_valid_files(tmp_path):
+    path = tmp_path / "raillock_config.yaml"
+    write_config(path, allow("echo"))
+    configs, errors = [], []
+    watcher = ConfigWatcher(str(path), configs.append, on_error=errors.append)
+
+    assert watcher.check() is False
+    write_config(path, allow("echo", "add"))
+    assert watcher.check() is True
+    assert set(configs[-1].allowed_tools) == {"echo", "add"}
+    assert watcher.check() is False
+
+    path.write_text("allowed_tools: {}\n")
+    assert watcher.check() is False
+    assert len(configs) == 1 and watcher.reloads == 1
+    assert "Missing required section" in str(errors[-1])
+    assert watcher.last_error is errors[-1]
+
+
+def test_invalid_reload_is_reported_to_stderr(tmp_path, capsys):
+    path = tmp_path / "raillock_config.yaml"
+    write_config(path, allow("echo"))
+    watcher = ConfigWatcher(str(path), lambda config: None)
+    path.write_text(": not yaml")
+    assert watcher.check() is False
+    assert "Keeping the current policy" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("use_inotify", [False, True])
+def test_watcher_thread_picks_up_edits(tmp_path, use_inotify):
+    if use_inotify:
+        inotify = _open_inotify(str(tmp_path))
+        if inotify is None:
+            pytest.skip("inotify not available")
+        inotify.close()
+    path = tmp_path / "raillock_config.yaml"
+    write_config(path, allow("echo"))
+    configs = []
+    interval = 5.0 if use_inotify else 0.02
+    with ConfigWatcher(
+        str(path), configs.append, interval=interval, use_inotify=use_inotify
+    ) as watcher:
+        assert watcher.using_inotify is use_inotify
+        write_config(path, allow("echo", "add"))
+        assert wait_for(lambda: configs)
+    assert set(configs[-1].allowed_tools) == {"echo", "add"}
+
+
+def test_swap_config_precompiles_policies_in_use():
+    client = RailLockClient(RailLockConfig(**allow("echo")))
+    tools = [DummyTool("echo"), DummyTool("add")]
+    assert [t.name for t in client.filter_tools(tools)] == ["echo"]
+    old_policy = client.policy
+
+    client.swap_config(RailLockConfig(**allow("echo", "add")))
+    new_policy = client._state[1][None]
+    assert new_policy is not old_policy
+    assert client.policy is new_policy
+    assert [t.name for t in client.filter_tools(tools)] == ["echo", "add"]
+
+
+def test_filter_tools_sees_a_consistent_policy_during_swaps():
+    configs = [RailLockConfig(**allow("echo")), RailLockConfig(**allow("add"))]
+    tools = [DummyTool("echo"), DummyTool("add")] * 50
+    expected = ({"echo"}, {"add"})
+    client = RailLockClient(configs[0], filter_cache_size=0)
+    stop = threading.Event()
+    seen = []
+
+    def reader():
+        while not stop.is_set():
+            seen.append({t.name for t in client.filter_tools(tools)})
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for i in range(200):
+        client.swap_config(configs[i % 2])
+    stop.set()
+    for thread in threads:
+        thread.join()
+    assert seen and all(names in expected for names in seen)
+
+
+def test_client_watch_config_swaps_policy_and_stops_on_close(tmp_path):
+    path = tmp_path / "raillock_config.yaml"
+    write_config(path, allow("echo"))
+    client = RailLockClient(RailLockConfig.from_file(str(path)))
+    tools = [DummyTool("echo"), DummyTool("add")]
+    watcher = client.watch_config(str(path), interval=0.02, use_inotify=False)
+
+    write_config(path, allow("add"))
+    assert wait_for(lambda: watcher.reloads == 1)
+    assert [t.name for t in client.filter_tools(tools)] == ["add"]
+
+    client.close()
+    assert not watcher._thread.is_alive()
+
+
+def test_client_reloads_a_multi_server_document(tmp_path):
+    path = tmp_path / "servers.yaml"
+    write_config(
+        path,
+        {
+            "config_version": 1,
+            "servers": {"http://a": allow("echo", server="http://a")},
+        },
+    )
+    client = RailLockClient(MultiServerConfig.load(str(path)))
+    tools = [DummyTool("echo"), DummyTool("add")]
+    watcher = client.watch_config(str(path), interval=0.02, use_inotify=False)
+
+    write_config(
+        path,
+        {"config_version": 1, "servers": {"http://a": allow("add", server="http://a")}},
+    )
+    assert wait_for(lambda: watcher.reloads == 1)
+    assert watcher.last_error is None
+    assert isinstance(client.config, MultiServerConfig)
+    assert [t.name for t in client.filter_tools(tools, server_name="http://a")] == [
+        "add"
+    ]
+    client.close()
+
+
+def test_client_reloads_a_directory_of_server_configs(tmp_path):
+    def server_config(server, *names):
+        return dict(
+            allow(*names, server=server), server={"name": server, "type": "sse"}
+        )
+
+    write_config(tmp_path / "a.yaml", server_config("http://a", "echo"))
+    client = RailLockClient(MultiServerConfig.load(str(tmp_path)))
+    tools = [DummyTool("echo"), DummyTool("add")]
+    watcher = client.watch_config(str(tmp_path), interval=0.02, use_inotify=False)
+    assert watcher.is_directory
+
+    # A new file in the directory is a change too
+    write_config(tmp_path / "b.yaml", server_config("http://b", "add"))
+    assert wait_for(lambda: watcher.reloads == 1)
+    assert watcher.last_error is None
+    assert [t.name for t in client.filter_tools(tools, server_name="http://b")] == [
+        "add"
+    ]
+    client.close()
+
+
+def test_client_keeps_a_compact_config_compact(tmp_path):
+    path = tmp_path / "raillock_config.yaml"
+    write_config(path, allow("echo"))
+    client = RailLockClient(CompactConfig.from_file(str(path)))
+    watcher = client.watch_config(str(path), interval=0.02, use_inotify=False)
+
+    write_config(path, allow("echo", "add"))
+    assert wait_for(lambda: watcher.reloads == 1)
+    assert isinstance(client.config, CompactConfig)
+    assert set(client.config.allowed_tools) == {"echo", "add"}
+    client.close()
@@ -0,0 +1,186 @@
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src"))
+)
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from raillock.blocklist import ChecksumBlocklist, build_blocklist
+from raillock.client import RailLockClient
+from raillock.compact import CompactConfig
+from raillock.config import RailLockConfig
+from raillock.decision_cache import DecisionCache, manifest_digest
+from raillock.policy import CompiledPolicy
+from raillock.utils import calculate_tool_checksum
+
+SERVER = "http://server"
+
+
+class DummyTool:
+    def __init__(self, name, description="desc"):
+        self.name = name
+        self.description = description
+
+
+def make_config():
+    return RailLockConfig(
+        allowed_tools={
+            "echo": calculate_tool_checksum("echo", "desc", SERVER),
+            "github_*": "*",
+        },
+        denied_tools={"rm": {}},
+    )
+
+
+TOOLS = [
+    DummyTool("echo"),
+    DummyTool("echo_changed", "other"),
+    DummyTool("rm"),
+    DummyTool("github_issues"),
+]
+
+
+def test_policy_digest_is_stable_and_covers_every_rule():
+    digest = CompiledPolicy(make_config(), SERVER).digest
+    assert digest == CompiledPolicy(make_config(), SERVER).digest
+    assert (
+        digest
+        == CompiledPolicy(CompactConfig.from_config(make_config()), SERVER).digest
+    )
+
+    config = make_config()
+    config.denied_tools["github_delete"] = {}
+    assert CompiledPolicy(config, SERVER).digest != digest
+    config = make_config()
+    config.allowed_tools["echo"] = "*"
+    assert CompiledPolicy(config, SERVER).digest != digest
+    assert CompiledPolicy(make_config(), "http://other").digest != digest
+    # A blocklist that cannot be identified makes the policy uncacheable
+    assert CompiledPolicy(make_config(), SERVER, blocklist=set()).digest is None
+
+
+def test_decisions_are_reused_by_a_new_process(tmp_path):
+    path = str(tmp_path / "decisions.sqlite")
+    with DecisionCache(path) as cache:
+        client = RailLockClient(make_config(), decision_cache=cache)
+        assert [t.name for t in client.filter_tools(TOOLS, server_name=SERVER)] == [
+            "echo",
+            "github_issues",
+        ]
+        assert (cache.hits, cache.misses) == (0, 1)
+        assert len(cache) == 1
+
+    # A fresh client and connection, as in a newly started worker
+    with DecisionCache(path) as cache:
+        client = RailLockClient(make_config(), decision_cache=cache)
+        with patch.object(
+            CompiledPolicy, "allowed_indices", side_effect=AssertionError
+        ) as allowed_indices:
+            assert [t.name for t in client.filter_tools(TOOLS, server_name=SERVER)] == [
+                "echo",
+                "github_issues",
+            ]
+        allowed_indices.assert_not_called()
+        assert (cache.hits, cache.misses) == (1, 0)
+
+        # A changed description is a different tool list
+        tools = TOOLS[:-1] + [DummyTool("github_issues", "poisoned")]
+        assert [t.name for t in client.filter_tools(tools, server_name=SERVER)] == [
+            "echo",
+            "github_issues",
+        ]
+        assert cache.misses == 1
+        tools = [DummyTool("echo", "poisoned")] + TOOLS[1:]
+        assert [t.name for t in client.filter_tools(tools, server_name=SERVER)] == [
+            "github_issues"
+        ]
+        assert (cache.misses, len(cache)) == (2, 3)
+
+
+def test_changed_policy_does_not_reuse_decisions(tmp_path):
+    with DecisionCache(str(tmp_path / "decisions.sqlite")) as cache:
+        RailLockClient(make_config(), decision_cache=cache).filter_tools(
+            TOOLS, server_name=SERVER
+        )
+        config = make_config()
+        config.denied_tools["echo"] = {}
+        client = RailLockClient(config, decision_cache=cache)
+        assert [t.name for t in client.filter_tools(TOOLS, server_name=SERVER)] == [
+            "github_issues"
+        ]
+        assert cache.misses == 2
+
+
+def test_replaced_blocklist_does_not_reuse_decisions(tmp_path):
+    path = str(tmp_path / "blocklist.bin")
+    build_blocklist([], path)
+    with DecisionCache(str(tmp_path / "decisions.sqlite")) as cache:
+        with ChecksumBlocklist(path) as blocklist:
+            client = RailLockClient(
+                make_config(), blocklist=blocklist, decision_cache=cache
+            )
+            assert len(client.filter_tools(TOOLS, server_name=SERVER)) == 2
+
+        build_blocklist([calculate_tool_checksum("github_issues", "desc")], path)
+        with ChecksumBlocklist(path) as blocklist:
+            client.blocklist = blocklist
+            assert [t.name for t in client.filter_tools(TOOLS, server_name=SERVER)] == [
+                "echo"
+            ]
+
+
+def test_manifest_digest_covers_names_descriptions_and_order():
+    digest = manifest_digest(TOOLS)
+    assert digest == manifest_digest(list(TOOLS))
+    assert manifest_digest(TOOLS[::-1]) != digest
+    assert manifest_digest([DummyTool("ab", "c")]) != manifest_digest(
+        [DummyTool("a", "bc")]
+    )
+    assert manifest_digest([DummyTool("echo", None)]) is None
+
+
+def test_oldest_decisions_are_evicted(tmp_path):
+    manifests = [manifest_digest([DummyTool(f"tool{i}")]) for i in range(25)]
+    with DecisionCache(str(tmp_path / "decisions.sqlite"), max_entries=10) as cache:
+        for index, manifest in enumerate(manifests):
+            cache.store(b"policy", SERVER, manifest, (index,))
+        assert len(cache) <= 10
+        assert cache.lookup(b"policy", SERVER, manifests[0]) is None
+        assert cache.lookup(b"policy", SERVER, manifests[-1]) == (24,)
+
+
+def test_database_errors_fall_back_to_the_policy(tmp_path):
+    with DecisionCache(str(tmp_path / "decisions.sqlite")) as cache:
+        client = RailLockClient(make_config(), decision_cache=cache)
+        with (
+            patch.object(
+                DecisionCache, "lookup", side_effect=sqlite3.OperationalError("locked")
+            ),
+            patch.object(
+                DecisionCache, "store", side_effect=sqlite3.OperationalError("locked")
+            ),
+        ):
+            assert len(client.filter_tools(TOOLS, server_name=SERVER)) == 2
+
+
+def test_two_connections_share_the_database(tmp_path):
+    path = str(tmp_path / "decisions.sqlite")
+    with DecisionCache(path) as writer, DecisionCache(path) as reader:
+        manifest = manifest_digest(TOOLS)
+        writer.store(b"policy", "", manifest, (0, 3))
+        assert reader.lookup(b"policy", "", manifest) == (0, 3)
+        assert reader.lookup(b"other", "", manifest) is None
+        assert (
+            sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        )
+
+
+def test_unusable_path_raises(tmp_path):
+    directory = tmp_path / "directory"
+    directory.mkdir()
+    with pytest.raises(sqlite3.Error):
+        DecisionCache(str(directory))
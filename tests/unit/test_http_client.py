@@ -0,0 +1,49 @@
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src"))
+)
+import asyncio
+import pytest
+from raillock.http_client import (
+    aclose_async_http_client,
+    create_http_session,
+    get_async_http_client,
+)
+
+
+@pytest.mark.anyio(backend="asyncio")
+async def test_async_http_client_is_shared_within_a_loop():
+    client = get_async_http_client()
+    assert get_async_http_client() is client
+    await aclose_async_http_client()
+    assert client.is_closed
+    assert get_async_http_client() is not client
+    await aclose_async_http_client()
+
+
+def test_async_http_client_is_per_event_loop():
+    async def get_client():
+        return get_async_http_client()
+
+    first = asyncio.run(get_client())
+    second = asyncio.run(get_client())
+    assert first is not second
+
+
+def test_create_http_session_configures_pool_and_retries():
+    session = create_http_session(pool_size=4, retries=3, keep_alive=False)
+    adapter = session.get_adapter("https://example.com")
+    assert adapter._pool_maxsize == 4
+    assert adapter.max_retries.total == 3
+    assert adapter.max_retries.connect == 3
+    # A stalled read is not retried unless asked for, so timeouts stay bounded
+    assert adapter.max_retries.read == 0
+    assert session.headers["Connection"] == "close"
+    session.close()
+
+    session = create_http_session(retries=1, read_retries=2)
+    retry = session.get_adapter("http://example.com").max_retries
+    assert (retry.total, retry.connect, retry.read) == (3, 1, 2)
+    session.close()
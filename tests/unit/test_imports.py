@@ -0,0 +1,81 @@
+import sys
+import os
+import json
+import subprocess
+
+import pytest
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src"))
+sys.path.insert(0, SRC)
+
+# Dependencies that must only load once the code path that needs them runs
+HEAVY_MODULES = ("mcp", "httpx", "requests", "starlette", "uvicorn", "tabulate")
+# Generous wall-clock budget; eager imports of the above took over 0.6s
+IMPORT_BUDGET_SECONDS = 0.5
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+def _probe(code, runs=3):
+    """Run code in fresh interpreters; return the fastest time and loaded modules."""
+    env = dict(os.environ, PYTHONPATH=SRC)
+    env.pop("RAILLOCK_DEBUG", None)
+    results = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE.format(code=code)],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=True,
+        ).stdout
+        results.append(json.loads(out.splitlines()[-1]))
+    fastest = min(result["elapsed"] for result in results)
+    return fastest, set(results[0]["modules"])
+
+
+def _heavy(modules):
+    return sorted(name for name in HEAVY_MODULES if name in modules)
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import raillock",
+        "from raillock import RailLockClient, RailLockConfig",
+        "import raillock.cli.__main__",
+    ],
+)
+def test_import_skips_heavy_dependencies(code):
+    elapsed, modules = _probe(code)
+    assert _heavy(modules) == []
+    assert elapsed < IMPORT_BUDGET_SECONDS, f"{code!r} took {elapsed:.3f}s"
+
+
+def test_cli_help_skips_heavy_dependencies():
+    code = (
+        "sys.argv = ['raillock', '--help']\n"
+        "from raillock.cli.__main__ import main\n"
+        "try:\n"
+        "    main()\n"
+        "except SystemExit:\n"
+        "    pass"
+    )
+    elapsed, modules = _probe(code)
+    assert _heavy(modules) == []
+    assert elapsed < IMPORT_BUDGET_SECONDS, f"--help took {elapsed:.3f}s"
+
+
+def test_load_command_imports_subcommand_on_demand():
+    from raillock.cli.__main__ import COMMANDS, load_command
+    from raillock.cli.commands.compare import run_compare
+
+    assert load_command("compare") is run_compare
+    assert load_command("nope") is None
+    assert set(COMMANDS) == {"review", "compare", "webserver", "build-blocklist"}
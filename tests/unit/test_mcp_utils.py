@@ -4,14 +4,22 @@ import os
 sys.path.insert(
     0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src"))
 )
+import asyncio
 import pytest
+from mcp import types
+from raillock.exceptions import RailLockError, ToolBlockedError
 from raillock.mcp_utils import (
     RailLockSessionWrapper,
     monkeypatch_raillock_tools,
     get_server_name_from_session,
     get_tools_via_sse,
+    iter_filtered_tool_pages,
+    list_all_tools,
+    ToolListCache,
+    ToolDecisionTable,
 )
 from raillock.config import RailLockConfig
+from raillock.metrics import SessionMetrics
 from raillock.client import RailLockClient
 from unittest.mock import patch, MagicMock, AsyncMock
 from raillock.utils import calculate_tool_checksum
@@ -150,6 +158,297 @@ async def test_get_tools_via_sse(mock_client_session, mock_sse_client):
     assert tools[0].name == "sse_tool"
 
 
+class PagedSession:
+    """Session serving tools in pages of two, with cursors like a real server."""
+
+    def __init__(self, names):
+        self.names = names
+        self.requests = []
+
+    def _page(self, cursor):
+        start = int(cursor or 0)
+        tools = [
+            types.Tool(name=n, description="desc", inputSchema={})
+            for n in self.names[start : start + 2]
+        ]
+        end = start + 2
+        next_cursor = str(end) if end < len(self.names) else None
+        return types.ListToolsResult(tools=tools, nextCursor=next_cursor)
+
+    async def list_tools(self):
+        self.requests.append(None)
+        return self._page(None)
+
+    async def send_request(self, request, result_type):
+        dumped = request.model_dump(by_alias=True, exclude_none=True)
+        assert dumped["method"] == "tools/list"
+        self.requests.append(dumped["params"]["cursor"])
+        return self._page(dumped["params"]["cursor"])
+
+
+def _allow_config(*names):
+    return RailLockConfig({n: calculate_tool_checksum(n, "desc") for n in names})
+
+
+def test_iter_filtered_tool_pages_filters_each_page():
+    session = PagedSession(["a", "b", "c", "d", "e"])
+    rail_client = RailLockClient(_allow_config("a", "d", "e"))
+
+    async def collect():
+        return [page async for page in iter_filtered_tool_pages(session, rail_client)]
+
+    pages = asyncio.run(collect())
+    assert [[t.name for t in p.tools] for p in pages] == [["a"], ["d"], ["e"]]
+    assert [p.nextCursor for p in pages] == ["2", "4", None]
+    assert session.requests == [None, "2", "4"]
+
+
+def test_list_all_tools_follows_cursors():
+    session = PagedSession(["a", "b", "c"])
+    tools = asyncio.run(list_all_tools(session))
+    assert [t.name for t in tools] == ["a", "b", "c"]
+
+
+def test_list_all_tools_rejects_repeated_cursor():
+    class LoopingSession(PagedSession):
+        def _page(self, cursor):
+            return types.ListToolsResult(tools=[], nextCursor="same")
+
+    with pytest.raises(RailLockError):
+        asyncio.run(list_all_tools(LoopingSession([])))
+
+
+def test_monkeypatch_preserves_next_cursor():
+    session = PagedSession(["a", "b", "c"])
+    monkeypatch_raillock_tools(session, RailLockClient(_allow_config("a", "c")))
+
+    first = asyncio.run(session.list_tools())
+    assert isinstance(first, types.ListToolsResult)
+    assert [t.name for t in first.tools] == ["a"]
+    assert first.nextCursor == "2"
+
+    second = asyncio.run(session.list_tools(cursor=first.nextCursor))
+    assert [t.name for t in second.tools] == ["c"]
+    assert second.nextCursor is None
+
+
+def test_session_wrapper_iter_tool_pages():
+    wrapper = RailLockSessionWrapper(
+        PagedSession(["a", "b", "c"]), RailLockClient(_allow_config("b", "c"))
+    )
+
+    async def collect():
+        return [t.name async for page in wrapper.iter_tool_pages() for t in page.tools]
+
+    assert asyncio.run(collect()) == ["b", "c"]
+    page = asyncio.run(wrapper.list_tools_page("2"))
+    assert [t.name for t in page.tools] == ["c"]
+
+
+class NotifyingSession(PagedSession):
+    """PagedSession with the notification hook of a real ClientSession."""
+
+    def __init__(self, names):
+        super().__init__(names)
+        self.notifications = []
+
+    async def _received_notification(self, notification):
+        self.notifications.append(notification)
+
+
+def _list_changed():
+    return types.ServerNotification(
+        types.ToolListChangedNotification(method="notifications/tools/list_changed")
+    )
+
+
+def test_session_wrapper_cache_refreshes_on_list_changed():
+    session = NotifyingSession(["a", "b"])
+    wrapper = RailLockSessionWrapper(
+        session, RailLockClient(_allow_config("a", "b")), cache_tools=True
+    )
+
+    assert [t.name for t in asyncio.run(wrapper.list_tools())] == ["a", "b"]
+    assert [t.name for t in asyncio.run(wrapper.list_tools())] == ["a", "b"]
+    assert session.requests == [None]
+
+    session.names = ["a"]
+    asyncio.run(session._received_notification(_list_changed()))
+    assert len(session.notifications) == 1
+    assert [t.name for t in asyncio.run(wrapper.list_tools())] == ["a"]
+    assert session.requests == [None, None]
+
+
+def test_session_wrapper_without_cache_always_fetches():
+    session = NotifyingSession(["a"])
+    wrapper = RailLockSessionWrapper(session, RailLockClient(_allow_config("a")))
+    asyncio.run(wrapper.list_tools())
+    asyncio.run(wrapper.list_tools())
+    assert session.requests == [None, None]
+    assert wrapper.tool_cache is None
+
+
+def test_monkeypatch_cache_expires_after_ttl():
+    session = NotifyingSession(["a", "b", "c"])
+    cache = monkeypatch_raillock_tools(
+        session, RailLockClient(_allow_config("a", "c")), cache_tools=True, cache_ttl=10
+    )
+    with patch("raillock.mcp_utils.time.monotonic", return_value=100.0):
+        asyncio.run(session.list_tools())
+        asyncio.run(session.list_tools(cursor="2"))
+        asyncio.run(session.list_tools(cursor="2"))
+    assert session.requests == [None, "2"]
+    assert len(cache) == 2
+    with patch("raillock.mcp_utils.time.monotonic", return_value=110.0):
+        page = asyncio.run(session.list_tools())
+    assert [t.name for t in page.tools] == ["a"]
+    assert session.requests == [None, "2", None]
+
+
+def test_tool_cache_ignores_entries_from_replaced_policy():
+    session = NotifyingSession(["a", "b"])
+    rail_client = RailLockClient(_allow_config("a", "b"))
+    wrapper = RailLockSessionWrapper(session, rail_client, cache_tools=True)
+    asyncio.run(wrapper.list_tools())
+    rail_client.config = _allow_config("b")
+    assert [t.name for t in asyncio.run(wrapper.list_tools())] == ["b"]
+    assert session.requests == [None, None]
+
+
+def test_tool_cache_rejects_non_positive_ttl():
+    with pytest.raises(ValueError):
+        ToolListCache(0)
+
+
+class CallingSession(NotifyingSession):
+    """NotifyingSession that records forwarded tool calls."""
+
+    def __init__(self, names):
+        super().__init__(names)
+        self.calls = []
+
+    async def call_tool(self, name, arguments=None):
+        self.calls.append((name, arguments))
+        return f"called {name}"
+
+
+def test_session_wrapper_blocks_calls_to_filtered_tools():
+    session = CallingSession(["a", "b"])
+    wrapper = RailLockSessionWrapper(session, RailLockClient(_allow_config("a")))
+
+    with pytest.raises(ToolBlockedError):
+        asyncio.run(wrapper.call_tool("a", {}))
+
+    asyncio.run(wrapper.list_tools())
+    assert asyncio.run(wrapper.call_tool("a", {"x": 1})) == "called a"
+    with pytest.raises(ToolBlockedError) as exc:
+        asyncio.run(wrapper.call_tool("b"))
+    assert exc.value.tool_name == "b"
+    with pytest.raises(ToolBlockedError):
+        asyncio.run(wrapper.call_tool("never_listed"))
+    assert session.calls == [("a", {"x": 1})]
+
+
+def test_monkeypatch_blocks_calls_and_clears_on_list_changed():
+    session = CallingSession(["a", "b"])
+    monkeypatch_raillock_tools(session, RailLockClient(_allow_config("a", "b")))
+    asyncio.run(session.list_tools())
+    assert asyncio.run(session.call_tool("b")) == "called b"
+
+    asyncio.run(session._received_notification(_list_changed()))
+    with pytest.raises(ToolBlockedError):
+        asyncio.run(session.call_tool("b"))
+
+
+def test_call_check_does_not_hash():
+    session = CallingSession(["a"])
+    wrapper = RailLockSessionWrapper(session, RailLockClient(_allow_config("a")))
+    asyncio.run(wrapper.list_tools())
+    with patch("raillock.policy.cached_tool_checksum") as checksum:
+        asyncio.run(wrapper.call_tool("a"))
+    checksum.assert_not_called()
+
+
+def test_decision_table_redecides_after_policy_change():
+    session = CallingSession(["a", "b"])
+    rail_client = RailLockClient(_allow_config("a", "b"))
+    wrapper = RailLockSessionWrapper(session, rail_client)
+    asyncio.run(wrapper.list_tools())
+    rail_client.config = _allow_config("b")
+    with pytest.raises(ToolBlockedError):
+        asyncio.run(wrapper.call_tool("a"))
+    assert asyncio.run(wrapper.call_tool("b")) == "called b"
+    assert isinstance(wrapper.decisions, ToolDecisionTable)
+    assert "a" in wrapper.decisions and len(wrapper.decisions) == 2
+
+
+def test_decisions_are_recorded_under_the_policy_that_made_them():
+    session = CallingSession(["a", "b"])
+    rail_client = RailLockClient(_allow_config("a", "b"))
+    wrapper = RailLockSessionWrapper(session, rail_client)
+    filter_tools = rail_client.filter_tools
+
+    def filter_then_swap(tools, **kwargs):
+        allowed = filter_tools(tools, **kwargs)
+        # A config watcher swapping the policy between filtering and recording
+        rail_client.swap_config(_allow_config("b"))
+        return allowed
+
+    with patch.object(rail_client, "filter_tools", filter_then_swap):
+        asyncio.run(wrapper.list_tools())
+    with pytest.raises(ToolBlockedError):
+        asyncio.run(wrapper.call_tool("a"))
+    assert asyncio.run(wrapper.call_tool("b")) == "called b"
+
+
+def test_decision_table_keeps_only_allowed_tools():
+    names = ["a"] + [f"denied{i}" for i in range(50)]
+    session = CallingSession(names)
+    wrapper = RailLockSessionWrapper(session, RailLockClient(_allow_config("a")))
+    asyncio.run(wrapper.list_tools())
+    assert len(wrapper.decisions) == 1
+    assert all(len(entry) == 5 for entry in wrapper.decisions._entries.values())
+    assert "desc" not in wrapper.decisions._entries["a"]
+    with pytest.raises(ToolBlockedError):
+        asyncio.run(wrapper.call_tool("denied0"))
+
+
+def test_session_wrapper_records_metrics():
+    session = CallingSession(["a", "b"])
+    wrapper = RailLockSessionWrapper(session, RailLockClient(_allow_config("a")))
+    asyncio.run(wrapper.list_tools())
+    asyncio.run(wrapper.call_tool("a"))
+    with pytest.raises(ToolBlockedError):
+        asyncio.run(wrapper.call_tool("b"))
+
+    snap = wrapper.metrics.snapshot()
+    assert snap["list_tools"]["count"] == 1
+    assert snap["filter"]["count"] == 1
+    assert list(snap["call_tool"]) == ["a"]
+    assert snap["counts"] == {
+        "tools_allowed": 1,
+        "tools_blocked": 1,
+        "calls_allowed": 1,
+        "calls_blocked": 1,
+    }
+
+
+def test_monkeypatch_shares_given_metrics():
+    metrics = SessionMetrics()
+    sessions = [CallingSession(["a"]), CallingSession(["a"])]
+    for session in sessions:
+        monkeypatch_raillock_tools(
+            session, RailLockClient(_allow_config("a")), metrics=metrics
+        )
+        asyncio.run(session.list_tools())
+        asyncio.run(session.call_tool("a"))
+        assert session.raillock_metrics is metrics
+
+    snap = metrics.snapshot()
+    assert snap["list_tools"]["count"] == 2
+    assert snap["call_tool"]["a"]["count"] == 2
+
+
 def test_checksum_on_malicious_description():
     """Test checksum calculation for a tool description with multiline and hidden instructions."""
     malicious_description = """Get company data based on the specified type.
@@ -0,0 +1,56 @@
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src"))
+)
+from raillock.metrics import LatencyHistogram, SessionMetrics
+
+
+def test_histogram_counts_and_bounds():
+    histogram = LatencyHistogram([0.001, 0.01, 0.1])
+    for value in (0.0005, 0.002, 0.003, 0.05, 2.0):
+        histogram.observe(value)
+    snap = histogram.snapshot()
+    assert snap["count"] == 5
+    assert snap["min"] == 0.0005
+    assert snap["max"] == 2.0
+    assert abs(snap["sum"] - 2.0555) < 1e-9
+    assert snap["buckets"] == {0.001: 1, 0.01: 3, 0.1: 4, float("inf"): 5}
+
+
+def test_histogram_quantiles():
+    histogram = LatencyHistogram([0.001, 0.01, 0.1])
+    assert histogram.quantile(0.5) is None
+    for _ in range(98):
+        histogram.observe(0.0005)
+    histogram.observe(0.05)
+    histogram.observe(0.07)
+    assert histogram.quantile(0.5) == 0.001
+    assert histogram.quantile(0.99) == 0.07
+    assert histogram.quantile(1.0) == 0.07
+
+
+def test_session_metrics_snapshot_and_reset():
+    metrics = SessionMetrics()
+    metrics.record_list_tools(0.02)
+    metrics.record_filter(0.0001, allowed=3, blocked=1)
+    metrics.record_call_decision(True)
+    metrics.record_call_decision(False)
+    metrics.record_call_tool("echo", 0.01)
+    metrics.record_call_tool("echo", 0.03)
+
+    snap = metrics.snapshot()
+    assert snap["list_tools"]["count"] == 1
+    assert snap["filter"]["count"] == 1
+    assert snap["call_tool"]["echo"]["count"] == 2
+    assert snap["counts"] == {
+        "tools_allowed": 3,
+        "tools_blocked": 1,
+        "calls_allowed": 1,
+        "calls_blocked": 1,
+    }
+
+    metrics.reset()
+    assert metrics.snapshot()["list_tools"]["count"] == 0
+    assert metrics.snapshot()["call_tool"] == {}
@@ -0,0 +1,176 @@
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src"))
+)
+import pytest
+import yaml
+
+from raillock.client import RailLockClient
+from raillock.compact import CompactConfig
+from raillock.config_utils import build_config_dict, save_config_to_file
+from raillock.multi_config import (
+    MultiServerConfig,
+    load_server_config,
+    read_server_name,
+)
+
+SERVER_A = "http://a.example/sse"
+SERVER_B = "stdio:python server_b.py"
+
+
+class DummyTool:
+    def __init__(self, name, description="desc"):
+        self.name = name
+        self.description = description
+
+
+def server_config(server_name, *allowed):
+    tools = [{"name": name, "description": "desc"} for name in allowed]
+    return build_config_dict(
+        tools, {name: "allow" for name in allowed}, server_name, "sse"
+    )
+
+
+def write_yaml(path, data):
+    with open(path, "w") as f:
+        yaml.safe_dump(data, f, sort_keys=False)
+    return str(path)
+
+
+def make_directory(tmp_path):
+    directory = tmp_path / "policies"
+    directory.mkdir()
+    save_config_to_file(server_config(SERVER_A, "echo"), str(directory / "a.yaml"))
+    save_config_to_file(server_config(SERVER_B, "add"), str(directory / "b.yml"))
+    (directory / "notes.txt").write_text("not a config")
+    write_yaml(
+        directory / "unnamed.yaml",
+        {"allowed_tools": {}, "malicious_tools": {}, "denied_tools": {}},
+    )
+    return str(directory)
+
+
+def make_document(tmp_path):
+    sections = {}
+    for server_name, tool in ((SERVER_A, "echo"), (SERVER_B, "add")):
+        config = server_config(server_name, tool)
+        sections[server_name] = {
+            key: config[key]
+            for key in ("allowed_tools", "malicious_tools", "denied_tools")
+        }
+    return write_yaml(
+        tmp_path / "servers.yaml", {"config_version": 1, "servers": sections}
+    )
+
+
+def test_read_server_name_stops_after_the_header(tmp_path):
+    path = tmp_path / "config.yaml"
+    save_config_to_file(server_config(SERVER_A, "echo"), str(path))
+    assert read_server_name(str(path)) == SERVER_A
+
+    # Content after the server block is never parsed
+    truncated = tmp_path / "truncated.yaml"
+    truncated.write_text(
+        f"config_version: 1\nserver:\n  name: {SERVER_B}\nallowed_tools: [unclosed\n"
+    )
+    assert read_server_name(str(truncated)) == SERVER_B
+
+    nameless = tmp_path / "nameless.yaml"
+    nameless.write_text("allowed_tools:\n  name: x\nserver: [1, 2]\n")
+    assert read_server_name(str(nameless)) is None
+
+
+def test_directory_is_indexed_and_loaded_lazily(tmp_path):
+    config = MultiServerConfig.from_directory(make_directory(tmp_path))
+    assert sorted(config.servers) == sorted([SERVER_A, SERVER_B])
+    assert SERVER_A in config and len(config) == 2
+    assert config.loaded_servers == []
+
+    server_a = config.config_for(SERVER_A)
+    assert set(server_a.allowed_tools) == {"echo"}
+    assert config.config_for(SERVER_A) is server_a
+    assert config.loaded_servers == [SERVER_A]
+
+
+def test_directory_rejects_duplicate_servers(tmp_path):
+    directory = make_directory(tmp_path)
+    save_config_to_file(
+        server_config(SERVER_A, "other"), os.path.join(directory, "c.yaml")
+    )
+    with pytest.raises(ValueError, match="configured in both"):
+        MultiServerConfig.from_directory(directory)
+
+
+def test_document_validates_each_server_on_first_use(tmp_path):
+    path = make_document(tmp_path)
+    with open(path) as f:
+        document = yaml.safe_load(f)
+    document["servers"]["http://broken"] = {"allowed_tools": {}}
+    write_yaml(path, document)
+
+    config = MultiServerConfig.from_file(path)
+    assert set(config.config_for(SERVER_B).allowed_tools) == {"add"}
+    with pytest.raises(ValueError, match="Server 'http://broken': Missing required"):
+        config.config_for("http://broken")
+
+
+def test_document_requires_servers_mapping(tmp_path):
+    path = write_yaml(tmp_path / "single.yaml", server_config(SERVER_A, "echo"))
+    with pytest.raises(ValueError, match="'servers' mapping"):
+        MultiServerConfig.from_file(path)
+
+
+def test_unknown_server_allows_nothing(tmp_path):
+    config = MultiServerConfig.from_file(make_document(tmp_path))
+    assert config.config_for("http://unknown").allowed_tools == {}
+    assert isinstance(
+        MultiServerConfig.from_file(make_document(tmp_path), compact=True).config_for(
+            "http://unknown"
+        ),
+        CompactConfig,
+    )
+
+
+@pytest.mark.parametrize("layout", ["directory", "document"])
+def test_client_compiles_only_the_filtered_server(tmp_path, layout):
+    if layout == "directory":
+        config = MultiServerConfig.from_directory(make_directory(tmp_path))
+    else:
+        config = MultiServerConfig.from_file(make_document(tmp_path))
+    client = RailLockClient(config)
+    tools = [DummyTool("echo"), DummyTool("add")]
+
+    assert [t.name for t in client.filter_tools(tools, server_name=SERVER_A)] == [
+        "echo"
+    ]
+    assert config.loaded_servers == [SERVER_A]
+    assert [t.name for t in client.filter_tools(tools, server_name=SERVER_B)] == ["add"]
+    assert client.filter_tools(tools, server_name="http://unknown") == []
+
+    client.swap_config(MultiServerConfig.from_file(make_document(tmp_path)))
+    assert [t.name for t in client.filter_tools(tools, server_name=SERVER_B)] == ["add"]
+
+
+def test_compact_servers_load_descriptions_from_their_file(tmp_path):
+    config = MultiServerConfig.from_directory(make_directory(tmp_path), compact=True)
+    server_a = config.config_for(SERVER_A)
+    assert isinstance(server_a, CompactConfig)
+    assert server_a.descriptions() == {"echo": "desc"}
+
+
+def test_load_server_config_accepts_every_layout(tmp_path):
+    single = write_yaml(tmp_path / "single.yaml", server_config(SERVER_A, "echo"))
+    assert set(load_server_config(single, "anything").allowed_tools) == {"echo"}
+
+    directory = make_directory(tmp_path)
+    assert set(load_server_config(directory, SERVER_B).allowed_tools) == {"add"}
+
+    document = make_document(tmp_path)
+    assert set(load_server_config(document, SERVER_B).allowed_tools) == {"add"}
+    assert isinstance(MultiServerConfig.load(directory), MultiServerConfig)
+
+    invalid = write_yaml(tmp_path / "invalid.yaml", {"allowed_tools": {}})
+    with pytest.raises(ValueError, match="Missing required section"):
+        load_server_config(invalid, SERVER_A)
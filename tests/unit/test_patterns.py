@@ -0,0 +1,169 @@
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src"))
+)
+import pytest
+import yaml
+from raillock.client import RailLockClient
+from raillock.config import RailLockConfig
+from raillock.patterns import PatternMatcher, is_pattern
+from raillock.utils import calculate_tool_checksum
+
+
+class DummyTool:
+    def __init__(self, name, description="desc"):
+        self.name = name
+        self.description = description
+
+
+def test_is_pattern():
+    assert is_pattern("github_*")
+    assert is_pattern("tool?")
+    assert is_pattern("[ab]_tool")
+    assert not is_pattern("echo")
+    assert not is_pattern(None)
+
+
+@pytest.mark.parametrize(
+    "name,expected",
+    [
+        ("github_list", 0),
+        ("repo_delete", 1),
+        ("github_delete", 0),
+        ("fs_read_v2", 2),
+        ("x", 3),
+        ("xy", None),
+        ("echo", None),
+    ],
+)
+def test_pattern_matcher_returns_first_matching_rule(name, expected):
+    matcher = PatternMatcher(["github_*", "*_delete", "fs_*_v?", "[xz]"])
+    assert matcher.match(name) == expected
+
+
+def test_pattern_matcher_scales_to_many_rules():
+    matcher = PatternMatcher([f"team{i}_*" for i in range(5000)] + ["*_admin"])
+    assert matcher.match("team4999_tool") == 4999
+    assert matcher.match("db_admin") == 5000
+    assert matcher.match("other") is None
+    assert not PatternMatcher([])
+
+
+def test_policy_applies_patterns_with_deny_precedence():
+    config = RailLockConfig(
+        allowed_tools={
+            "github_*": {"checksum": "*"},
+            "echo": "*",
+            "pinned": calculate_tool_checksum("pinned", "desc"),
+            "github_admin_delete": "*",
+        },
+        malicious_tools={"*_delete": {}},
+        denied_tools={"github_secret?": {}},
+    )
+    client = RailLockClient(config)
+    tools = [
+        DummyTool("github_list", "anything"),
+        DummyTool("github_delete"),
+        DummyTool("github_admin_delete"),
+        DummyTool("github_secret1"),
+        DummyTool("echo", "any description"),
+        DummyTool("pinned"),
+        DummyTool("pinned_other"),
+    ]
+    names = [t.name for t in client.filter_tools(tools)]
+    assert names == ["github_list", "echo", "pinned"]
+    assert client.policy.is_blocked("repo_delete")
+
+
+def test_config_validation_accepts_patterns(tmp_path):
+    config_data = {
+        "allowed_tools": {"github_*": {"checksum": "*"}},
+        "malicious_tools": {"*_exfiltrate": {}},
+        "denied_tools": {},
+    }
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(yaml.safe_dump(config_data))
+    config = RailLockConfig.from_file(str(config_file))
+    assert "github_*" in config.allowed_tools
+
+    config_data["allowed_tools"] = {"github_*": {}}
+    config_file.write_text(yaml.safe_dump(config_data))
+    with pytest.raises(ValueError, match="must have 'checksum'"):
+        RailLockConfig.from_file(str(config_file))
+
+
+def test_compare_report_agrees_with_enforcement():
+    from raillock.config_utils import compare_config_with_server
+
+    server = "http://server"
+    config_data = {
+        "allowed_tools": {
+            "github_*": {"checksum": "*"},
+            "echo": {"checksum": "*"},
+            "add": {"checksum": calculate_tool_checksum("add", "desc", server)},
+        },
+        "malicious_tools": {"*_exfiltrate": {}},
+        "denied_tools": {"github_delete": {}},
+    }
+    server_tools = {
+        name: {
+            "description": "desc",
+            "checksum": calculate_tool_checksum(name, "desc", server),
+        }
+        for name in ("github_issues", "github_delete", "data_exfiltrate", "echo", "add")
+    }
+    rows = {
+        row["tool"]: row
+        for row in compare_config_with_server(config_data, server_tools)[0]
+    }
+    assert "github_*" not in rows
+
+    issues = rows["github_issues"]
+    assert issues["allowed"] and issues["checksum_match"]
+    assert (issues["type"], issues["pattern"]) == ("allowed", "github_*")
+    assert rows["echo"]["type"] == "allowed" and rows["echo"]["pattern"] is None
+    assert rows["add"]["type"] == "allowed"
+    assert not rows["github_delete"]["allowed"]
+    exfiltrate = rows["data_exfiltrate"]
+    assert (exfiltrate["type"], exfiltrate["pattern"]) == ("malicious", "*_exfiltrate")
+
+    policy = RailLockClient(RailLockConfig(**config_data)).policy_for(server)
+    for name, row in rows.items():
+        assert (row["type"] == "allowed") == policy.is_allowed(name, "desc")
+        assert row["allowed"] == (policy.allowed_rule(name) is not None)
+
+
+def test_compare_reports_absent_wildcard_tools_as_unknown():
+    from raillock.config_utils import compare_config_with_server
+
+    config_data = {
+        "allowed_tools": {"echo": {"checksum": "*"}},
+        "malicious_tools": {},
+        "denied_tools": {},
+    }
+    (row,), summary = compare_config_with_server(config_data, {})
+    assert not row["on_server"] and not row["checksum_match"]
+    assert row["type"] == "unknown"
+
+
+def test_compare_labels_exact_blocked_names_without_checksums():
+    from raillock.config_utils import compare_config_with_server
+
+    config_data = {
+        "allowed_tools": {},
+        "malicious_tools": {"steal": {"description": "old"}},
+        "denied_tools": {"rm": {}},
+    }
+    server_tools = {
+        name: {"description": "desc", "checksum": calculate_tool_checksum(name, "desc")}
+        for name in ("steal", "rm")
+    }
+    rows = {
+        row["tool"]: row
+        for row in compare_config_with_server(config_data, server_tools)[0]
+    }
+    assert rows["steal"]["type"] == "malicious"
+    assert rows["rm"]["type"] == "denied"
+    assert not rows["rm"]["checksum_match"] and rows["rm"]["pattern"] is None
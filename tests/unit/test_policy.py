@@ -0,0 +1,128 @@
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src"))
+)
+import threading
+
+import pytest
+from unittest.mock import patch
+from raillock.client import RailLockClient
+from raillock.config import RailLockConfig
+from raillock.policy import CompiledPolicy, tools_fingerprint
+from raillock.utils import calculate_tool_checksum
+
+
+class DummyTool:
+    def __init__(self, name, description="desc"):
+        self.name = name
+        self.description = description
+
+
+def test_compiled_policy_resolves_server_defaults():
+    config = RailLockConfig(
+        {
+            "echo": calculate_tool_checksum("echo", "desc", "http://srv"),
+            "add": {
+                "description": "desc",
+                "checksum": calculate_tool_checksum("add", "desc", "other"),
+                "server": "other",
+            },
+        }
+    )
+    policy = CompiledPolicy(config, "http://srv")
+    assert len(policy) == 2
+    assert policy.is_allowed("echo", "desc")
+    assert policy.is_allowed("add", "desc")
+    assert not policy.is_allowed("echo", "changed")
+    assert not policy.is_allowed("missing", "desc")
+
+
+def test_compiled_policy_blocks_denied_and_malicious():
+    config = RailLockConfig(
+        allowed_tools={
+            "echo": calculate_tool_checksum("echo", "desc"),
+            "add": calculate_tool_checksum("add", "desc"),
+            "sub": calculate_tool_checksum("sub", "desc"),
+        },
+        malicious_tools={"add": {"description": "desc", "checksum": "x"}},
+        denied_tools={"sub": {}},
+    )
+    policy = CompiledPolicy(config)
+    assert policy.is_blocked("add")
+    assert policy.is_blocked("sub")
+    assert not policy.is_blocked("echo")
+    tools = [DummyTool("echo"), DummyTool("add"), DummyTool("sub")]
+    assert [t.name for t in policy.filter_tools(tools)] == ["echo"]
+
+
+def test_compiled_policy_is_immutable():
+    policy = CompiledPolicy(RailLockConfig())
+    with pytest.raises(AttributeError):
+        policy.server_name = "other"
+
+
+def test_client_recompiles_policy_on_config_and_server_change():
+    client = RailLockClient(RailLockConfig({"echo": "abc"}))
+    first = client.policy
+    assert client.policy is first
+    client._server_name = "http://srv"
+    assert client.policy is not first
+    assert client.policy.server_name == "http://srv"
+    second = client.policy
+    client.config = RailLockConfig()
+    assert client.policy is not second
+    assert len(client.policy) == 0
+
+
+def test_filter_tools_reuses_decisions_for_identical_manifest():
+    config = RailLockConfig({"echo": calculate_tool_checksum("echo", "desc")})
+    client = RailLockClient(config)
+    first = [DummyTool("echo"), DummyTool("add")]
+    assert [t.name for t in client.filter_tools(first)] == ["echo"]
+
+    second = [DummyTool("echo"), DummyTool("add")]
+    with patch.object(CompiledPolicy, "allowed_indices", side_effect=AssertionError):
+        filtered = client.filter_tools(second)
+    # The cached decision is applied to the new response's objects
+    assert filtered == [second[0]]
+
+
+def test_filter_tools_cache_revalidates_changed_manifest_and_config():
+    config = RailLockConfig({"echo": calculate_tool_checksum("echo", "desc")})
+    client = RailLockClient(config)
+    assert len(client.filter_tools([DummyTool("echo")])) == 1
+    assert client.filter_tools([DummyTool("echo", "tampered")]) == []
+
+    client.config = RailLockConfig()
+    assert client.filter_tools([DummyTool("echo")]) == []
+
+
+def test_filter_tools_cache_is_bounded():
+    client = RailLockClient(RailLockConfig(), filter_cache_size=2)
+    for name in ("a", "b", "c"):
+        client.filter_tools([DummyTool(name)])
+    assert len(client._filter_cache) == 2
+    assert (None, tools_fingerprint([DummyTool("a")])) not in client._filter_cache
+
+
+def test_filter_tools_cache_eviction_is_thread_safe():
+    client = RailLockClient(RailLockConfig({"t0": "*"}), filter_cache_size=2)
+    errors = []
+
+    def worker(offset):
+        try:
+            for i in range(300):
+                name = f"t{(offset + i) % 50}"
+                assert len(client.filter_tools([DummyTool(name)])) == (name == "t0")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert len(client._filter_cache) <= 2
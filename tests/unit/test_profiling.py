@@ -0,0 +1,109 @@
+import sys
+import os
+import pstats
+import time
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src"))
+)
+from unittest.mock import patch
+
+from raillock import profiling
+from raillock.profiling import (
+    PhaseTimer,
+    phase,
+    profile_path_from_env,
+    record_phase,
+    run_profiled,
+)
+
+
+def test_phase_is_noop_without_active_run():
+    with phase("hashing"):
+        pass
+    record_phase("spawn", time.perf_counter())
+    assert profiling._active is None
+    # Nothing is created per call while profiling is off
+    assert phase("hashing") is phase("spawn")
+
+
+def test_run_profiled_writes_pstats_and_phase_report(tmp_path, capsys):
+    output = tmp_path / "out.pstats"
+
+    def command(args):
+        with phase("comparison"):
+            time.sleep(0.01)
+        with phase("comparison"):
+            pass
+        record_phase("spawn", time.perf_counter())
+        return args
+
+    assert run_profiled(command, "args", str(output)) == "args"
+    assert profiling._active is None
+    stats = pstats.Stats(str(output))
+    assert stats.total_calls > 0
+    report = capsys.readouterr().err
+    assert "comparison" in report and "(2x)" in report
+    assert "spawn" in report
+    assert "total" in report
+
+
+def test_run_profiled_reports_even_when_command_exits(tmp_path, capsys):
+    output = tmp_path / "exit.pstats"
+
+    def command(args):
+        sys.exit(3)
+
+    try:
+        run_profiled(command, None, str(output))
+    except SystemExit as e:
+        assert e.code == 3
+    assert output.exists()
+    assert "Profile written to" in capsys.readouterr().err
+
+
+def test_phase_report_orders_known_phases_first():
+    timer = PhaseTimer()
+    timer.add("custom", 0.1)
+    timer.add("output", 0.2)
+    timer.add("spawn", 0.3)
+    lines = timer.format_report(1.0).splitlines()
+    names = [line.split()[0] for line in lines[1:]]
+    assert names == ["spawn", "output", "custom", "other", "total"]
+
+
+def test_profile_path_from_env(monkeypatch):
+    monkeypatch.delenv("RAILLOCK_PROFILE", raising=False)
+    assert profile_path_from_env("compare") is None
+    monkeypatch.setenv("RAILLOCK_PROFILE", "0")
+    assert profile_path_from_env("compare") is None
+    monkeypatch.setenv("RAILLOCK_PROFILE", "1")
+    assert profile_path_from_env("compare") == "raillock-compare.pstats"
+    monkeypatch.setenv("RAILLOCK_PROFILE", "/tmp/x.pstats")
+    assert profile_path_from_env("compare") == "/tmp/x.pstats"
+
+
+def test_cli_profile_flag_wraps_command(tmp_path, monkeypatch):
+    from raillock.cli import __main__ as cli_main
+
+    calls = []
+    output = tmp_path / "cli.pstats"
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "raillock",
+            "--profile",
+            "--profile-output",
+            str(output),
+            "compare",
+            "--server",
+            "http://localhost:1",
+            "--config",
+            "x.yaml",
+        ],
+    )
+    with patch("raillock.cli.commands.compare.run_compare", side_effect=calls.append):
+        cli_main.main()
+    assert calls and calls[0].command == "compare"
+    assert output.exists()
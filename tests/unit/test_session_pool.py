@@ -0,0 +1,209 @@
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src"))
+)
+import asyncio
+import contextlib
+import time
+
+import pytest
+from unittest.mock import patch
+from raillock.client import RailLockClient
+from raillock.config import RailLockConfig
+from raillock.session_pool import SessionPool, stdio_server_parameters
+
+
+class FakeTool:
+    def __init__(self, name, description="desc"):
+        self.name = name
+        self.description = description
+
+
+class FakeSession:
+    instances = []
+
+    def __init__(self, read_stream, write_stream):
+        self.initialized = 0
+        self.list_calls = 0
+        self.closed = False
+        FakeSession.instances.append(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.closed = True
+
+    async def initialize(self):
+        self.initialized += 1
+
+    async def list_tools(self):
+        self.list_calls += 1
+        return type("Resp", (), {"tools": [FakeTool("echo")]})()
+
+
+@pytest.fixture
+def fake_transport():
+    spawned = []
+
+    @contextlib.asynccontextmanager
+    async def fake_stdio_client(params):
+        spawned.append(params)
+        yield ("read", "write")
+
+    FakeSession.instances = []
+    with (
+        patch("raillock.session_pool.stdio_client", fake_stdio_client),
+        patch("raillock.session_pool.ClientSession", FakeSession),
+    ):
+        yield spawned
+
+
+def test_stdio_server_parameters_splits_command():
+    params = stdio_server_parameters("stdio:python server.py --flag")
+    assert params.command == "python"
+    assert params.args == ["server.py", "--flag"]
+    assert params.env == dict(os.environ)
+
+
+@pytest.mark.anyio(backend="asyncio")
+async def test_session_pool_reuses_sessions(fake_transport):
+    async with SessionPool() as pool:
+        first = await pool.get("stdio:python server.py")
+        second = await pool.get("stdio:python server.py")
+        assert first is second
+        assert first.initialized == 1
+        assert len(fake_transport) == 1
+        assert "stdio:python server.py" in pool
+    assert first.closed
+    assert len(pool) == 0
+
+
+@pytest.mark.anyio(backend="asyncio")
+async def test_session_pool_discard_reopens(fake_transport):
+    async with SessionPool() as pool:
+        first = await pool.get("stdio:python server.py")
+        await pool.discard("stdio:python server.py")
+        assert first.closed
+        second = await pool.get("stdio:python server.py")
+        assert second is not first
+        assert len(fake_transport) == 2
+
+
+@pytest.fixture
+def slow_transport():
+    spawned = []
+
+    @contextlib.asynccontextmanager
+    async def slow_stdio_client(params):
+        spawned.append(params)
+        await asyncio.sleep(0.3)
+        yield ("read", "write")
+
+    FakeSession.instances = []
+    with (
+        patch("raillock.session_pool.stdio_client", slow_stdio_client),
+        patch("raillock.session_pool.ClientSession", FakeSession),
+    ):
+        yield spawned
+
+
+@pytest.mark.anyio(backend="asyncio")
+async def test_session_pool_opens_servers_concurrently(slow_transport):
+    urls = [f"stdio:python server{i}.py" for i in range(6)]
+    async with SessionPool() as pool:
+        started = time.perf_counter()
+        sessions = await asyncio.gather(*(pool.get(url) for url in urls))
+        elapsed = time.perf_counter() - started
+        assert len(set(map(id, sessions))) == 6
+        # Six 0.3s opens take about as long as one, not 1.8s
+        assert elapsed < 0.9
+        assert len(pool) == 6
+
+
+@pytest.mark.anyio(backend="asyncio")
+async def test_session_pool_shares_an_open_in_progress(slow_transport):
+    async with SessionPool() as pool:
+        first, second = await asyncio.gather(
+            pool.get("stdio:python server.py"), pool.get("stdio:python server.py")
+        )
+        assert first is second
+        assert len(slow_transport) == 1
+
+
+@pytest.mark.anyio(backend="asyncio")
+async def test_session_pool_abandons_an_open_nobody_waits_for(slow_transport):
+    async with SessionPool() as pool:
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(pool.get("stdio:python server.py"), 0.05)
+        await asyncio.sleep(0.4)
+        assert len(pool) == 0 and not FakeSession.instances
+
+
+@pytest.mark.anyio(backend="asyncio")
+async def test_session_pool_propagates_open_errors():
+    @contextlib.asynccontextmanager
+    async def failing_stdio_client(params):
+        raise OSError("spawn failed")
+        yield
+
+    with patch("raillock.session_pool.stdio_client", failing_stdio_client):
+        async with SessionPool() as pool:
+            with pytest.raises(OSError, match="spawn failed"):
+                await pool.get("stdio:missing")
+            assert len(pool) == 0
+
+
+@pytest.mark.anyio(backend="asyncio")
+async def test_client_context_manager_pools_stdio_sessions(fake_transport):
+    async with RailLockClient(RailLockConfig()) as client:
+        await client.connect_async("stdio:python server.py")
+        await client.refresh_async()
+        assert "echo" in client._available_tools
+        assert len(fake_transport) == 1
+        session = FakeSession.instances[0]
+        assert session.list_calls == 2
+    assert session.closed
+
+
+def test_sync_connect_reuses_pooled_sessions(fake_transport):
+    client = RailLockClient(RailLockConfig(), session_pool=SessionPool())
+    client.connect("stdio:python server.py")
+    client.refresh()
+    client.connect("stdio:python server.py")
+    assert "echo" in client._available_tools
+    assert len(fake_transport) == 1
+    session = FakeSession.instances[0]
+    assert session.list_calls == 3
+    assert not session.closed
+
+    result = client.connect_many(["stdio:python server.py"])
+    assert not result.errors and len(fake_transport) == 1
+
+    loop_thread = client._pool_loop
+    client.close()
+    assert session.closed
+    assert loop_thread.loop.is_closed()
+    assert client._pool_loop is None
+
+
+def test_connect_many_through_a_pool_overlaps_connects(slow_transport):
+    urls = [f"stdio:python server{i}.py" for i in range(6)]
+    client = RailLockClient(RailLockConfig(), session_pool=SessionPool())
+    try:
+        started = time.perf_counter()
+        result = client.connect_many(urls, concurrency=6, timeout=5)
+        elapsed = time.perf_counter() - started
+        assert not result.errors and set(result.tools) == set(urls)
+        assert elapsed < 0.9
+        assert len(client._session_pool) == 6
+
+        # The deadline covers the opens, which are cancelled when it passes
+        more = [f"stdio:python other{i}.py" for i in range(3)]
+        result = client.connect_many(more, concurrency=3, timeout=0.1)
+        assert set(result.errors) == set(more)
+        assert len(client._session_pool) == 6
+    finally:
+        client.close()
@@ -0,0 +1,61 @@
+import sys
+import os
+import asyncio
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src"))
+)
+sys.path.insert(
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "../../examples/load-generator")
+    ),
+)
+import pytest
+from mcp import types
+import synthetic_server
+
+
+def test_make_tools_is_deterministic_and_sized():
+    tools = synthetic_server.make_tools(5, 300, True, seed=1)
+    assert tools == synthetic_server.make_tools(5, 300, True, seed=1)
+    assert [name for name, _ in tools][:2] == ["synthetic_tool_0", "synthetic_tool_1"]
+    assert all(len(desc) == 300 for _, desc in tools)
+    assert any(not desc.isascii() for _, desc in tools)
+
+
+def test_page_tools():
+    tools = list(range(5))
+    assert synthetic_server.page_tools(tools, None, 0) == (tools, None)
+    assert synthetic_server.page_tools(tools, None, 2) == ([0, 1], "2")
+    assert synthetic_server.page_tools(tools, "4", 2) == ([4], None)
+    with pytest.raises(ValueError):
+        synthetic_server.page_tools(tools, "bogus", 2)
+
+
+def test_server_handlers_paginate_and_call():
+    server = synthetic_server.build_server(tools=5, page_size=2)
+    handlers = server._mcp_server.request_handlers
+
+    first = asyncio.run(
+        handlers[types.ListToolsRequest](types.ListToolsRequest(method="tools/list"))
+    ).root
+    assert [t.name for t in first.tools] == ["synthetic_tool_0", "synthetic_tool_1"]
+    assert first.nextCursor == "2"
+    last = asyncio.run(
+        handlers[types.ListToolsRequest](
+            types.ListToolsRequest(method="tools/list", cursor="4")
+        )
+    ).root
+    assert [t.name for t in last.tools] == ["synthetic_tool_4"]
+    assert last.nextCursor is None
+
+    call = types.CallToolRequest(
+        method="tools/call",
+        params=types.CallToolRequestParams(
+            name="synthetic_tool_3", arguments={"text": "hi"}
+        ),
+    )
+    result = asyncio.run(handlers[types.CallToolRequest](call)).root
+    assert result.content[0].text == "hi"
+    assert not result.isError
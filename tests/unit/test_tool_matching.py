@@ -57,8 +57,9 @@ def test_compare_malicious_tools_checksum(tmp_path, monkeypatch, capsys):
     out = capsys.readouterr().out
     print("DEBUG OUTPUT FOR CHECKSUM MISMATCH CASE:")
     print(out)
-    # Should show the tool as unknown (checksum mismatch) and Checksum Match as ✘
-    assert "unknown (checksum mismatch)" in out
+    # The tool is still blocked by name, and the checksum column shows the mismatch
+    assert "malicious" in out
+    assert "unknown" not in out
     assert "✘" in out  # Checksum Match column shows ✘
 
     # Now patch to match checksum
@@ -0,0 +1,135 @@
+import sys
+import os
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src"))
+)
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+from raillock.utils import (
+    DEFAULT_CHECKSUM_CACHE_SIZE,
+    PARALLEL_CHECKSUM_THRESHOLD,
+    cached_tool_checksum,
+    calculate_tool_checksum,
+    calculate_tool_checksums,
+    checksum_cache_info,
+    clear_checksum_cache,
+    configure_checksum_cache,
+    debug_log,
+    debug_print,
+    is_debug_enabled,
+    set_debug,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_checksum_cache():
+    configure_checksum_cache(DEFAULT_CHECKSUM_CACHE_SIZE)
+    yield
+    configure_checksum_cache(DEFAULT_CHECKSUM_CACHE_SIZE)
+
+
+def test_cached_checksum_matches_uncached():
+    assert cached_tool_checksum("echo", "desc") == calculate_tool_checksum(
+        "echo", "desc"
+    )
+    assert cached_tool_checksum("echo", "desc", "srv") == calculate_tool_checksum(
+        "echo", "desc", "srv"
+    )
+
+
+def test_checksum_cache_counts_hits_and_misses():
+    cached_tool_checksum("echo", "desc", "srv")
+    cached_tool_checksum("echo", "desc", "srv")
+    cached_tool_checksum("echo", "desc", "other")
+    info = checksum_cache_info()
+    assert info["hits"] == 1
+    assert info["misses"] == 2
+    assert info["size"] == 2
+    clear_checksum_cache()
+    assert checksum_cache_info()["size"] == 0
+
+
+def test_checksum_cache_evicts_least_recently_used():
+    configure_checksum_cache(2)
+    cached_tool_checksum("a", "desc")
+    cached_tool_checksum("b", "desc")
+    cached_tool_checksum("a", "desc")
+    cached_tool_checksum("c", "desc")
+    assert checksum_cache_info()["size"] == 2
+    cached_tool_checksum("a", "desc")
+    assert checksum_cache_info()["hits"] == 2
+    cached_tool_checksum("b", "desc")
+    assert checksum_cache_info()["misses"] == 4
+
+
+def test_configure_checksum_cache_rejects_negative_size():
+    with pytest.raises(ValueError):
+        configure_checksum_cache(-1)
+    assert checksum_cache_info()["maxsize"] == DEFAULT_CHECKSUM_CACHE_SIZE
+
+
+@pytest.mark.parametrize("value", ["lots", "-5", ""])
+def test_bad_checksum_cache_size_env_falls_back_to_default(monkeypatch, capsys, value):
+    from raillock import utils
+
+    monkeypatch.setenv("RAILLOCK_CHECKSUM_CACHE_SIZE", value)
+    set_debug(True)
+    try:
+        assert utils._checksum_cache_size_from_env() == DEFAULT_CHECKSUM_CACHE_SIZE
+    finally:
+        set_debug(False)
+    assert "Ignoring RAILLOCK_CHECKSUM_CACHE_SIZE" in capsys.readouterr().out
+
+    monkeypatch.setenv("RAILLOCK_CHECKSUM_CACHE_SIZE", "12")
+    assert utils._checksum_cache_size_from_env() == 12
+
+
+def test_calculate_tool_checksums_preserves_order():
+    tools = [("echo", "desc"), ("add", "other"), ("echo", "desc")]
+    assert calculate_tool_checksums(tools, "srv") == [
+        calculate_tool_checksum(name, desc, "srv") for name, desc in tools
+    ]
+    assert calculate_tool_checksums([], "srv") == []
+
+
+def test_calculate_tool_checksums_uses_thread_pool_for_large_manifests():
+    tools = [(f"tool{i}", f"{i}" * 4096) for i in range(100)]
+    assert sum(len(desc) for _, desc in tools) >= PARALLEL_CHECKSUM_THRESHOLD
+    expected = [calculate_tool_checksum(name, desc, "srv") for name, desc in tools]
+    with patch("raillock.utils.ThreadPoolExecutor", wraps=ThreadPoolExecutor) as pool:
+        assert calculate_tool_checksums(tools, "srv", max_workers=4) == expected
+        assert calculate_tool_checksums(tools, "srv", cache=True) == expected
+    assert pool.call_count == 2
+    assert pool.call_args_list[0].kwargs["max_workers"] == 4
+    assert checksum_cache_info()["misses"] == len(tools)
+
+
+def test_calculate_tool_checksums_hashes_small_manifests_inline():
+    tools = [(f"tool{i}", "desc") for i in range(100)]
+    expected = [calculate_tool_checksum(name, desc, "srv") for name, desc in tools]
+    with patch("raillock.utils.ThreadPoolExecutor", wraps=ThreadPoolExecutor) as pool:
+        assert calculate_tool_checksums(tools, "srv", max_workers=4) == expected
+    pool.assert_not_called()
+
+
+class ExplodingRepr:
+    def __repr__(self):
+        raise AssertionError("formatted while debug is disabled")
+
+
+def test_debug_log_is_lazy_and_toggleable(capsys):
+    set_debug(False)
+    try:
+        debug_log("value: %r", ExplodingRepr())
+        debug_print("never shown")
+        assert capsys.readouterr().out == ""
+
+        set_debug(True)
+        assert is_debug_enabled()
+        debug_log("value: %s", 42)
+        assert "[DEBUG][RailLock] value: 42" in capsys.readouterr().out
+    finally:
+        set_debug(False)
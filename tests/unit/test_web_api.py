@@ -246,11 +246,11 @@ allowed_tools:
         with (
             patch("raillock.cli.commands.web.api.get_tools_via_sse") as mock_get_tools,
             patch(
-                "raillock.cli.commands.web.api.calculate_tool_checksum"
+                "raillock.cli.commands.web.api.calculate_tool_checksums"
             ) as mock_checksum,
         ):
             mock_get_tools.return_value = (mock_tools, "test_server")
-            mock_checksum.return_value = "abc123"
+            mock_checksum.return_value = ["abc123"]
 
             response = await compare_config_api(mock_request)
 
@@ -0,0 +1,80 @@
+"""Tests for the web server /metrics endpoint."""
+
+import os
+import sys
+
+import pytest
+from starlette.testclient import TestClient
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src"))
+)
+
+from raillock.cli.commands.web.app import create_app
+from raillock.cli.commands.web.metrics import WebMetrics, track_upstream
+
+
+def test_metrics_endpoint_reports_request_latency_and_errors():
+    app = create_app()
+    app.state.server_url = "stdio:/nonexistent-raillock-server"
+    with TestClient(app) as client:
+        assert client.get("/").status_code == 200
+        assert client.get("/api/tools").status_code == 500
+        client.get("/no-such-page")
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert (
+        'raillock_http_request_duration_seconds_count{route="/",method="GET"} 1' in body
+    )
+    assert (
+        'raillock_http_request_errors_total{route="/api/tools",method="GET"} 1' in body
+    )
+    assert 'route="unmatched"' in body
+    assert 'raillock_upstream_fetch_errors_total{transport="stdio"} 1' in body
+    assert 'raillock_upstream_fetch_duration_seconds_count{transport="stdio"} 1' in body
+    assert "raillock_checksum_cache_hit_ratio" in body
+    assert "raillock_tools 0" in body
+    assert "raillock_pooled_sessions 0" in body
+
+
+def test_histogram_exposition_format():
+    metrics = WebMetrics()
+    metrics.observe_request("/api/tools", "GET", 200, 0.003)
+    text = metrics.render()
+    assert "# TYPE raillock_http_request_duration_seconds histogram" in text
+    assert (
+        'raillock_http_request_duration_seconds_bucket{route="/api/tools",method="GET",le="0.0025"} 0'
+        in text
+    )
+    assert (
+        'raillock_http_request_duration_seconds_bucket{route="/api/tools",method="GET",le="0.005"} 1'
+        in text
+    )
+    assert (
+        'raillock_http_request_duration_seconds_bucket{route="/api/tools",method="GET",le="+Inf"} 1'
+        in text
+    )
+
+
+def test_track_upstream_without_metrics_is_noop():
+    class State:
+        pass
+
+    with track_upstream(State(), "sse"):
+        pass
+
+    metrics = WebMetrics()
+
+    class MetricState:
+        pass
+
+    state = MetricState()
+    state.metrics = metrics
+    with pytest.raises(ValueError):
+        with track_upstream(state, "sse"):
+            raise ValueError("boom")
+    assert metrics.upstream_errors == {"sse": 1}
+    assert metrics.upstream_latency["sse"].count == 1